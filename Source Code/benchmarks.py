@@ -0,0 +1,323 @@
+"""Micro-benchmarks for the core modules.
+
+Run from this directory:
+	python benchmarks.py              # run every benchmark
+	python benchmarks.py courses      # run a single benchmark by name
+"""
+
+from __future__ import annotations
+
+import datetime
+import io
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from core.storage import JSONStorage
+from core.gpa import GPACalculator, Course, CourseTable, GRADE_POINTS
+from core import homework
+from core.homework import HomeworkPlanner, STATUSES, PRIORITIES, today_ordinal
+from core.sync import HomeworkSync
+from core.pomodoro import PomodoroEngine
+
+
+def _measure_memory(build):
+	"""Return (result, bytes allocated) for a zero-argument builder"""
+	tracemalloc.start()
+	try:
+		before = tracemalloc.get_traced_memory()[0]
+		result = build()
+		after = tracemalloc.get_traced_memory()[0]
+	finally:
+		tracemalloc.stop()
+	return result, after - before
+
+
+def _throughput(func, min_seconds: float = 0.5) -> float:
+	"""Return calls per second of func over at least min_seconds"""
+	calls = 0
+	start = time.perf_counter()
+	while True:
+		func()
+		calls += 1
+		elapsed = time.perf_counter() - start
+		if elapsed >= min_seconds:
+			return calls / elapsed
+
+
+def bench_courses(n: int = 1_000_000):
+	"""Memory per 1M courses and calculate() throughput: Course objects vs CourseTable"""
+	rng = random.Random(42)
+	grades = list(GRADE_POINTS)
+	names = [f"AMCS{1000 + i} - COURSE {i}" for i in range(500)]
+	rows = [(names[i % len(names)], rng.choice((2.0, 3.0, 4.0)), rng.choice(grades), rng.randint(1, 8)) for i in range(n)]
+	
+	objects, object_bytes = _measure_memory(lambda: [Course(*row) for row in rows])
+	
+	def build_table():
+		table = CourseTable()
+		table.extend(rows)
+		return table
+	
+	table, table_bytes = _measure_memory(build_table)
+	scale = 1_000_000 / n
+	print(f"courses: {n:,} rows")
+	print(f"  Course objects : {object_bytes * scale / 2**20:8.1f} MiB per 1M courses")
+	print(f"  CourseTable    : {table_bytes * scale / 2**20:8.1f} MiB per 1M courses")
+	
+	def scan_objects():
+		total_credits = sum(course.credits for course in objects)
+		weighted_points = sum(course.get_weighted_points() for course in objects)
+		return weighted_points / total_credits
+	
+	calc = GPACalculator(JSONStorage(tempfile.mkdtemp()))
+	calc_rows = rows[:100_000]
+	start = time.perf_counter()
+	for row in calc_rows:
+		calc.add_course(*row)
+	load_seconds = time.perf_counter() - start
+	print(f"  add_course     : {len(calc_rows) / load_seconds:12,.0f} courses/s")
+	print(f"  object scan    : {_throughput(scan_objects, 1.0):12,.2f} calculations/s over {n:,} courses")
+	print(f"  calculate()    : {_throughput(calc.calculate):12,.0f} calculations/s over {len(calc_rows):,} courses")
+
+
+def _homework_storage(n: int, seed: int = 7) -> JSONStorage:
+	"""Write a homework.json with n random items (due dates within +-1 year) and return its storage"""
+	rng = random.Random(seed)
+	today = datetime.date.today()
+	storage = JSONStorage(tempfile.mkdtemp())
+	storage.save("homework.json", [
+		{
+			"id": f"{i:012x}",
+			"subject": f"SUBJ{i % 40:04d} - SUBJECT {i % 40}",
+			"title": f"Assignment {i}",
+			"due": (today + datetime.timedelta(days=rng.randint(-365, 365))).isoformat(),
+			"status": rng.choice(STATUSES),
+			"details": "",
+			"priority": rng.choice(PRIORITIES),
+		}
+		for i in range(n)
+	])
+	return storage
+
+
+def bench_overdue(n: int = 100_000):
+	"""Overdue filtering at 100k items: per-call strptime scan vs parse-once ordinals"""
+	planner = HomeworkPlanner(_homework_storage(n))
+	items = planner.items
+	
+	def strptime_scan():
+		# What is_overdue() used to do for every item on every call
+		today = datetime.datetime.now().date()
+		return [item for item in items
+			if item.status != "Completed" and datetime.datetime.strptime(item.due, "%Y-%m-%d").date() < today]
+	
+	def ordinal_scan():
+		today = today_ordinal()
+		return [item for item in items if item.is_overdue(today)]
+	
+	assert len(strptime_scan()) == len(ordinal_scan()) == len(planner.get_overdue_items())
+	print(f"overdue: {n:,} items, {len(ordinal_scan()):,} overdue")
+	print(f"  strptime scan        : {1000 / _throughput(strptime_scan, 2.0):8.2f} ms/query")
+	print(f"  ordinal scan         : {1000 / _throughput(ordinal_scan):8.2f} ms/query")
+	print(f"  get_overdue_items()  : {1000 / _throughput(planner.get_overdue_items):8.2f} ms/query")
+
+
+def bench_search(n: int = 100_000):
+	"""Search-as-you-type latency at 100k items: linear substring scan vs the inverted index"""
+	planner = HomeworkPlanner(_homework_storage(n))
+	items = planner.items
+	queries = ("a", "assign", "assignment 9", "subject 1", "subj0003 assignment 12")
+	print(f"search: {n:,} items")
+	for query in queries:
+		words = query.lower().split()
+		
+		def scan():
+			return [item for item in items if all(word in f"{item.title} {item.subject} {item.details}".lower() for word in words)]
+		
+		print(f"  {query!r:26} scan {1000 / _throughput(scan, 1.0):8.2f} ms"
+			f" | index {1000 / _throughput(lambda: planner.search(query)):8.2f} ms ({len(planner.search(query, None)):,} matches)")
+
+
+def bench_load(n: int = 100_000):
+	"""HomeworkPlanner startup at 100k items: validating every item vs the trusted path for our own saves"""
+	storage = _homework_storage(n)
+	planner = HomeworkPlanner(storage)
+	planner.add("SUBJ0000 - SUBJECT 0", "Marker", datetime.date.today().isoformat())  # Saves with a digest
+	
+	def load(trust_saved: bool) -> float:
+		start = time.perf_counter()
+		loaded = HomeworkPlanner(storage, trust_saved=trust_saved)
+		seconds = time.perf_counter() - start
+		assert len(loaded) == n + 1 and not loaded.load_errors
+		return seconds
+	
+	validated = min(load(False) for _ in range(3))
+	trusted = min(load(True) for _ in range(3))
+	homework.PAUSE_GC_ON_LOAD = False
+	try:
+		collected = min(load(True) for _ in range(3))
+	finally:
+		homework.PAUSE_GC_ON_LOAD = True
+	print(f"load: {n + 1:,} items")
+	print(f"  validated      : {validated:8.2f} s")
+	print(f"  trusted        : {trusted:8.2f} s ({validated / trusted:.1f}x)")
+	print(f"  trusted, gc on : {collected:8.2f} s (PAUSE_GC_ON_LOAD off)")
+	start = time.perf_counter()
+	planner.search("assignment")  # The search index is built by the first query, not at startup
+	print(f"  first search   : {time.perf_counter() - start:8.2f} s")
+
+
+def bench_sync(n: int = 10_000):
+	"""Two devices syncing n items through a shared folder: first sync, no-op sync, one edit"""
+	remote = JSONStorage(tempfile.mkdtemp())
+	laptop_storage = _homework_storage(n)
+	laptop = HomeworkPlanner(laptop_storage)
+	lab_storage = JSONStorage(tempfile.mkdtemp())
+	lab = HomeworkPlanner(lab_storage)
+	laptop_sync = HomeworkSync(laptop, laptop_storage, remote)
+	lab_sync = HomeworkSync(lab, lab_storage, remote)
+	
+	def timed(label, sync):
+		start = time.perf_counter()
+		counts = sync()
+		print(f"  {label:22}: {(time.perf_counter() - start) * 1000:9.1f} ms  pushed {counts['pushed']:,}, pulled {counts['pulled']:,}")
+	
+	print(f"sync: {n:,} items, two devices")
+	timed("first push (laptop)", laptop_sync.sync)
+	timed("first pull (lab)", lab_sync.sync)
+	timed("no changes (laptop)", laptop_sync.sync)
+	timed("no changes (lab)", lab_sync.sync)
+	laptop.update_by_id(laptop.items[n // 2].id, status="Completed")
+	timed("one edit push", laptop_sync.sync)
+	timed("one edit pull", lab_sync.sync)  # Includes rewriting the lab's homework.json
+	assert lab.get(laptop.items[n // 2].id).status == "Completed"
+
+
+def bench_plan(n: int = 100_000):
+	"""EDF study plan at 100k items: scheduling from scratch vs re-planning after one edit"""
+	planner = HomeworkPlanner(_homework_storage(n))
+	rng = random.Random(3)
+	with planner.batch():
+		for item in rng.sample(planner.items, n // 10):
+			planner.update_by_id(item.id, effort_minutes=rng.choice((25, 50, 90, 180)))
+	start = time.perf_counter()
+	plan = planner.plan_study()
+	first = time.perf_counter() - start
+	print(f"plan: {n:,} items, {plan['blocks']:,} blocks, {len(plan['late']):,} late")
+	print(f"  from scratch   : {first * 1000:8.1f} ms")
+	seconds = []
+	for item in rng.sample(planner.items, 5):
+		planner.update_by_id(item.id, effort_minutes=rng.choice((25, 50, 90, 180)))
+		start = time.perf_counter()
+		planner.plan_study()
+		seconds.append(time.perf_counter() - start)
+	print(f"  after one edit : {sum(seconds) / len(seconds) * 1000:8.1f} ms (save not included)")
+
+
+def bench_subjects(n: int = 100_000):
+	"""Per-subject totals at 100k items: regrouping every item vs the maintained rollups"""
+	storage = _homework_storage(n)
+	planner = HomeworkPlanner(storage)
+	items = planner.items
+	
+	def regroup():
+		today = today_ordinal()
+		totals: dict = {}
+		for item in items:
+			row = totals.setdefault(item.subject, [0, 0])
+			row[0] += 1
+			row[1] += item.is_overdue(today)
+		return totals
+	
+	assert {r["subject"]: [r["total"], r["overdue"]] for r in planner.get_subject_rollups()} == regroup()
+	print(f"subjects: {n:,} items, {len(planner.subjects):,} subjects")
+	print(f"  regroup scan   : {1000 / _throughput(regroup):8.2f} ms/query")
+	print(f"  rollups        : {1000 / _throughput(planner.get_subject_rollups):8.3f} ms/query")
+	_, shared = _measure_memory(lambda: HomeworkPlanner(storage))
+	print(f"  load memory    : {shared / 2**20:8.1f} MiB (subject strings shared per course)")
+
+
+def bench_pomodoro(seconds: int = 3_600):
+	"""Catching the Pomodoro timer up after a suspend: one tick() per second vs a single advance()"""
+	engine = PomodoroEngine(JSONStorage(tempfile.mkdtemp()))
+	engine.start()
+	engine.pause()
+	start = time.perf_counter()
+	for _ in range(seconds):
+		engine.tick()
+	ticked = time.perf_counter() - start
+	state = engine.state
+	after_ticks = (state.mode, state.seconds_left, state.completed_sessions)
+	engine.reset()
+	engine.start()
+	engine.pause()
+	start = time.perf_counter()
+	engine.advance(seconds)
+	advanced = time.perf_counter() - start
+	state = engine.state
+	assert (state.mode, state.seconds_left, state.completed_sessions) == after_ticks
+	print(f"pomodoro: catching up {seconds:,} s ({after_ticks[2]} work sessions)")
+	print(f"  tick() loop    : {ticked * 1000:9.1f} ms")
+	print(f"  advance()      : {advanced * 1000:9.3f} ms")
+
+
+def _class_feed(student: int, courses: int = 6, weeks: int = 14) -> str:
+	"""One student's semester .ics: shared course deadlines plus a few personal reminders"""
+	start = datetime.date.today()
+	lines = ["BEGIN:VCALENDAR", "VERSION:2.0"]
+	for course in range(courses):
+		for week in range(weeks):
+			for task in ("Lab", "Quiz"):
+				day = start + datetime.timedelta(days=week * 7 + course)
+				lines += ["BEGIN:VEVENT", f"UID:{course}-{week}-{task}@portal",
+					f"SUMMARY:{task} {week + 1}", f"CATEGORIES:COURSE {course}",
+					f"DTSTART:{day:%Y%m%d}T235900Z", "END:VEVENT"]
+	for note in range(10):
+		day = start + datetime.timedelta(days=note)
+		lines += ["BEGIN:VTODO", f"UID:s{student}-{note}@portal", f"SUMMARY:Reminder {note}",
+			f"DUE;VALUE=DATE:{day:%Y%m%d}", "END:VTODO"]
+	lines.append("END:VCALENDAR")
+	return "\r\n".join(lines) + "\r\n"
+
+
+def bench_ics(students: int = 60):
+	"""Import a whole class's semester feeds into one planner (mostly duplicate deadlines)"""
+	feeds = [_class_feed(student) for student in range(students)]
+	events = sum(feed.count("BEGIN:V") - 1 for feed in feeds)
+	planner = HomeworkPlanner(JSONStorage(tempfile.mkdtemp()))
+	totals = {"added": 0, "duplicates": 0, "skipped": 0}
+	start = time.perf_counter()
+	for feed in feeds:
+		for key, value in planner.import_ics(io.StringIO(feed)).items():
+			totals[key] += value
+	seconds = time.perf_counter() - start
+	print(f"ics: {students} feeds, {events:,} events -> {totals}")
+	print(f"  import         : {seconds:8.2f} s ({events / seconds:,.0f} events/s)")
+	start = time.perf_counter()
+	size = sum(len(line) for line in planner.export_ics())
+	print(f"  export         : {time.perf_counter() - start:8.2f} s ({size / 1024:,.0f} KiB)")
+
+
+BENCHMARKS = {
+	"courses": bench_courses,
+	"overdue": bench_overdue,
+	"search": bench_search,
+	"ics": bench_ics,
+	"load": bench_load,
+	"sync": bench_sync,
+	"plan": bench_plan,
+	"subjects": bench_subjects,
+	"pomodoro": bench_pomodoro,
+}
+
+
+if __name__ == "__main__":
+	selected = sys.argv[1:] or list(BENCHMARKS)
+	for name in selected:
+		if name not in BENCHMARKS:
+			print(f"Unknown benchmark '{name}'. Available: {', '.join(BENCHMARKS)}")
+			sys.exit(1)
+		BENCHMARKS[name]()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.homework_item import HomeworkItem, NO_DUE_ORDINAL, parse_due_ordinal
+
+
+# Homework completed longer ago than this moves to the archive
+ARCHIVE_AFTER_DAYS = 90
+
+
+class HomeworkArchive:
+	"""Append-only cold store for finished homework.
+	
+	Records are JSON lines (gzip members when the name ends in .gz); restoring
+	an item appends a tombstone instead of rewriting the file. The index of
+	id -> (file offset, due key, subject, search text) is built on first use by
+	streaming the file once, and records are only read back for query results.
+	"""
+	
+	def __init__(self, storage, storage_name: str = "homework_archive.jsonl"):
+		if not isinstance(storage_name, str) or not storage_name.strip():
+			raise ValueError("Archive name must be a non-empty string")
+		self._storage = storage  # Private attribute
+		self._storage_name = storage_name.strip()  # Private attribute
+		self._index: Optional[Dict[str, Tuple[int, int, str, str]]] = None  # Private attribute: loaded on demand
+	
+	def _entries(self) -> Dict[str, Tuple[int, int, str, str]]:
+		"""Private method to get the index, streaming the archive file the first time"""
+		if self._index is None:
+			index: Dict[str, Tuple[int, int, str, str]] = {}
+			for offset, record in self._storage.iter_lines(self._storage_name):
+				if not isinstance(record, dict) or not isinstance(record.get("id"), str):
+					continue
+				if record.get("restored"):
+					index.pop(record["id"], None)
+					continue
+				due = parse_due_ordinal(record.get("due", ""))
+				text = f"{record.get('title', '')} {record.get('subject', '')} {record.get('details', '')}".lower()
+				index[record["id"]] = (offset, NO_DUE_ORDINAL if due is None else due, record.get("subject", ""), text)
+			self._index = index
+		return self._index
+	
+	def __len__(self) -> int:
+		return len(self._entries())
+	
+	def __contains__(self, item_id: str) -> bool:
+		return item_id in self._entries()
+	
+	def append(self, items: Iterable[HomeworkItem]) -> None:
+		"""Append items to the archive file"""
+		stamp = date.today().isoformat()
+		self._storage.append_lines(self._storage_name, (dict(item.to_dict(), archived=stamp) for item in items))
+		self._index = None  # New offsets are picked up by the next query
+	
+	def forget(self, item_ids: Iterable[str]) -> None:
+		"""Drop items from the archive by appending tombstones"""
+		entries = self._entries()
+		dropped = [item_id for item_id in dict.fromkeys(item_ids) if entries.pop(item_id, None) is not None]
+		if dropped:
+			self._storage.append_lines(self._storage_name, ({"id": item_id, "restored": True} for item_id in dropped))
+	
+	def read(self, item_ids: Iterable[str]) -> List[HomeworkItem]:
+		"""Read archived items back from the file (unknown ids are skipped)"""
+		entries = self._entries()
+		offsets = [entries[item_id][0] for item_id in dict.fromkeys(item_ids) if item_id in entries]
+		if not offsets:
+			return []
+		records = self._storage.read_lines_at(self._storage_name, offsets)
+		items = []
+		for offset in offsets:
+			fields = dict(records.get(offset) or {})
+			fields.pop("archived", None)
+			item_id = fields.pop("id", "")
+			try:
+				items.append(HomeworkItem(**fields, item_id=item_id))
+			except (TypeError, ValueError):
+				continue  # A damaged record stays in the archive
+		return items
+	
+	def query(self, text: str = "", subject: Optional[str] = None, first: int = 0, last: int = NO_DUE_ORDINAL, limit: Optional[int] = 50) -> List[HomeworkItem]:
+		"""Find archived items due in [first, last] whose text contains every word, newest first"""
+		words = text.lower().split()
+		matches = [
+			(due, item_id) for item_id, (_, due, item_subject, item_text) in self._entries().items()
+			if first <= due <= last and (subject is None or item_subject == subject)
+			and all(word in item_text for word in words)
+		]
+		matches.sort(reverse=True)
+		return self.read(item_id for _, item_id in matches[:limit])
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import List, Dict, Tuple, Optional, Iterable
+import re
+
+
+# Built-in subject categories; custom courses are stored on top of these
+DEFAULT_SUBJECTS: Dict[str, Tuple[str, ...]] = {
+	"Programming Subjects": (
+		"AMCS1013 - PROGRAMMING FUNDAMENTALS (3 credits)",
+		"AMCS1034 - SOFTWARE DEVELOPMENT FUNDAMENTALS (4 credits)",
+		"AMCS1043 - DATA STRUCTURES AND ALGORITHMS (3 credits)",
+		"AMCS1054 - OBJECT-ORIENTED PROGRAMMING (4 credits)",
+		"AMCS1084 - SOFTWARE ENGINEERING (4 credits)",
+		"AMCS1093 - ARTIFICIAL INTELLIGENCE (3 credits)",
+		"AMCS1103 - MACHINE LEARNING (3 credits)",
+		"AMCS1114 - MOBILE APPLICATION DEVELOPMENT (4 credits)",
+		"AMCS1123 - WEB DEVELOPMENT (3 credits)",
+		"AMCS1133 - CLOUD COMPUTING (3 credits)",
+		"AMCS1143 - CYBERSECURITY FUNDAMENTALS (3 credits)",
+		"AMCS1153 - HUMAN-COMPUTER INTERACTION (3 credits)",
+		"AMCS1163 - SOFTWARE TESTING (3 credits)",
+		"AMIT2014 - WEB AND MOBILE SYSTEMS (4 credits)",
+	),
+	"Mathematics Subjects": (
+		"AMAT1013 - CALCULUS I (3 credits)",
+		"AMAT1023 - CALCULUS II (3 credits)",
+		"AMAT1033 - LINEAR ALGEBRA (3 credits)",
+		"AMAT1043 - PROBABILITY AND STATISTICS (3 credits)",
+		"AMAT1053 - DIFFERENTIAL EQUATIONS (3 credits)",
+		"AMCS1073 - DISCRETE MATHEMATICS (3 credits)",
+	),
+	"Theory Subjects": (
+		"AMCS1023 - DATABASE SYSTEMS (3 credits)",
+		"AMCS1063 - COMPUTER ARCHITECTURE (3 credits)",
+		"AMCS2093 - OPERATING SYSTEMS (3 credits)",
+		"AMIT2033 - NETWORKING ESSENTIALS (3 credits)",
+		"AMIS1012 - ETHICS IN COMPUTING (2 credits)",
+	),
+	"General Subjects": (
+		"ECOQ - CO-CURRICULAR (2 credits)",
+		"EGU2 - ELECTIVE COURSE (2 credits)",
+		"MPU-2202 - CIVIC CONSCIOUSNESS AND VOLUNTEERISM",
+		"MPU-2212 - BAHASA KEBANGSAAN A",
+	),
+}
+
+_CREDITS_PATTERN = re.compile(r"\((\d+(?:\.\d+)?) credits?\)", re.IGNORECASE)
+_WORD_START = re.compile(r"[0-9A-Za-z]+")
+
+
+class CourseCatalog:
+	"""Persistent course catalog with type-ahead prefix search.
+	
+	Built-in categories come from DEFAULT_SUBJECTS; only custom courses are
+	written to storage. Every word of a course name is a sorted search key, so
+	search("data") and search("amcs10") are a bisect plus one step per match.
+	"""
+	
+	def __init__(self, storage, storage_name: str = "course_catalog.json"):
+		"""Initialize the catalog with proper validation"""
+		try:
+			if not storage:
+				raise ValueError("Storage object is required")
+			if not isinstance(storage_name, str) or not storage_name.strip():
+				raise ValueError("Storage name must be a non-empty string")
+			
+			self._storage = storage  # Private attribute for encapsulation
+			self._storage_name = storage_name.strip()  # Private attribute
+			self._categories: Dict[str, List[str]] = {}  # Private attribute
+			self._custom: Dict[str, List[str]] = {}  # Private attribute
+			self._category_of: Dict[str, str] = {}  # Private attribute
+			self._index: List[Tuple[str, str]] = []  # Private attribute: sorted (key, course)
+			self._names: Optional[Tuple[str, ...]] = None  # Private attribute: sorted names, built on first empty search
+			self._load_catalog()
+		except Exception as e:
+			raise RuntimeError(f"Failed to initialize Course Catalog: {e}")
+	
+	def _load_catalog(self):
+		"""Private method to merge stored custom courses over the defaults"""
+		try:
+			data = self._storage.load(self._storage_name, default={})
+			custom = data.get("custom", {}) if isinstance(data, dict) else {}
+			for category, courses in DEFAULT_SUBJECTS.items():
+				self._categories[category] = []
+				self._register_all(category, courses)
+			for category, courses in custom.items():
+				if isinstance(category, str) and isinstance(courses, list):
+					self._categories.setdefault(category, [])
+					added = self._register_all(category, (c for c in courses if isinstance(c, str)))
+					if added:
+						self._custom[category] = added
+			self._index.sort()
+		except Exception as e:
+			raise RuntimeError(f"Failed to load course catalog: {e}")
+	
+	def _save_catalog(self):
+		"""Private method to save custom courses with error handling"""
+		try:
+			self._storage.save(self._storage_name, {"custom": self._custom})
+		except Exception as e:
+			raise RuntimeError(f"Failed to save course catalog: {e}")
+	
+	@staticmethod
+	def _keys(course: str) -> List[str]:
+		"""Private method to build search keys: the name from each word onwards"""
+		lowered = course.lower()
+		return [lowered[match.start():] for match in _WORD_START.finditer(lowered)]
+	
+	def _register_all(self, category: str, courses: Iterable[str]) -> List[str]:
+		"""Private method to add courses without sorting the index (bulk load)"""
+		added = []
+		for course in courses:
+			course = course.strip()
+			if course and course not in self._category_of:
+				self._categories[category].append(course)
+				self._category_of[course] = category
+				self._index.extend((key, course) for key in self._keys(course))
+				added.append(course)
+		return added
+	
+	@property
+	def categories(self) -> Tuple[str, ...]:
+		"""Get category names in display order"""
+		return tuple(self._categories)
+	
+	def __len__(self) -> int:
+		return len(self._category_of)
+	
+	def __contains__(self, course: str) -> bool:
+		return course in self._category_of
+	
+	def courses_in(self, category: str) -> Tuple[str, ...]:
+		"""Get the courses of one category (empty for unknown categories)"""
+		return tuple(self._categories.get(category, ()))
+	
+	def category_of(self, course: str) -> Optional[str]:
+		"""Get the category a course belongs to, or None"""
+		return self._category_of.get(course)
+	
+	def credits_of(self, course: str) -> Optional[float]:
+		"""Get the credit hours written in a course name like '(3 credits)', or None"""
+		match = _CREDITS_PATTERN.search(course or "")
+		return float(match.group(1)) if match else None
+	
+	def add_course(self, category: str, course: str) -> str:
+		"""Add and persist a custom course"""
+		try:
+			if not isinstance(category, str) or not category.strip():
+				raise ValueError("Category must be a non-empty string")
+			if not isinstance(course, str) or not course.strip():
+				raise ValueError("Course name cannot be empty")
+			category = category.strip()
+			course = course.strip()
+			if course in self._category_of:
+				raise ValueError(f"Course '{course}' already exists in {self._category_of[course]}")
+			
+			self._categories.setdefault(category, []).append(course)
+			self._custom.setdefault(category, []).append(course)
+			self._category_of[course] = category
+			for key in self._keys(course):
+				insort(self._index, (key, course))
+			self._names = None
+			self._save_catalog()
+			return course
+		except ValueError:
+			raise  # Re-raise validation errors
+		except Exception as e:
+			raise RuntimeError(f"Unexpected error adding course: {e}")
+	
+	def import_courses(self, category: str, courses: Iterable[str], persist: bool = True) -> int:
+		"""Bulk-add courses (e.g. an institution list), skipping ones already known"""
+		try:
+			if not isinstance(category, str) or not category.strip():
+				raise ValueError("Category must be a non-empty string")
+			category = category.strip()
+			self._categories.setdefault(category, [])
+			added = self._register_all(category, courses)
+			self._index.sort()
+			if added:
+				self._names = None
+			if persist and added:
+				self._custom.setdefault(category, []).extend(added)
+				self._save_catalog()
+			return len(added)
+		except ValueError:
+			raise  # Re-raise validation errors
+		except Exception as e:
+			raise RuntimeError(f"Failed to import courses: {e}")
+	
+	def search(self, prefix: str, limit: int = 20, category: Optional[str] = None) -> Tuple[str, ...]:
+		"""Find courses with a word starting with prefix (case-insensitive), ordered by the matched text;
+		an empty prefix lists courses by name"""
+		query = (prefix or "").strip().lower()
+		if not query:
+			if category:
+				return self.courses_in(category)[:limit]
+			if self._names is None:
+				self._names = tuple(sorted(self._category_of, key=str.lower))
+			return self._names[:limit]
+		results: List[str] = []
+		seen = set()
+		position = bisect_left(self._index, (query, ""))
+		while position < len(self._index) and len(results) < limit:
+			key, course = self._index[position]
+			if not key.startswith(query):
+				break
+			if course not in seen and (category is None or self._category_of[course] == category):
+				seen.add(course)
+				results.append(course)
+			position += 1
+		return tuple(results)
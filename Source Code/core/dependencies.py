@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from heapq import heapify, heappop, heappush
+from typing import Dict, Iterable, List, Mapping, Set, Tuple
+
+from core.homework_item import HomeworkItem, PRIORITIES
+
+
+class DependencyGraph:
+	"""Prerequisite links between homework items, indexed in both directions.
+	
+	requires[a] holds the ids a waits for and unlocks[b] the ids waiting for
+	b. Links are kept by id even while the prerequisite is absent (removed or
+	archived); such a prerequisite simply counts as done. A link that would
+	close a cycle is found by searching only the items that already depend
+	on the item, so the check costs the size of that part of the graph.
+	"""
+	
+	def __init__(self):
+		self._requires: Dict[str, Set[str]] = {}  # Private attribute: item id -> prerequisite ids
+		self._unlocks: Dict[str, Set[str]] = {}  # Private attribute: prerequisite id -> dependent ids
+		self._links = 0  # Private attribute
+	
+	def __len__(self) -> int:
+		return self._links
+	
+	def requires(self, item_id: str) -> Set[str]:
+		"""Get the ids an item waits for"""
+		return self._requires.get(item_id, set())
+	
+	def unlocks(self, item_id: str) -> Set[str]:
+		"""Get the ids waiting for an item"""
+		return self._unlocks.get(item_id, set())
+	
+	def would_cycle(self, item_id: str, prerequisite_id: str) -> bool:
+		"""Check whether making item_id wait for prerequisite_id would close a cycle"""
+		if item_id == prerequisite_id:
+			return True
+		stack, seen = [item_id], {item_id}
+		while stack:
+			for dependent in self._unlocks.get(stack.pop(), ()):
+				if dependent == prerequisite_id:
+					return True
+				if dependent not in seen:
+					seen.add(dependent)
+					stack.append(dependent)
+		return False
+	
+	def set_requires(self, item_id: str, prerequisite_ids: Iterable[str]) -> List[str]:
+		"""Replace an item's links, skipping (and returning) the ones that would close a cycle"""
+		self.discard(item_id)
+		skipped = []
+		for prerequisite_id in prerequisite_ids:
+			if self.would_cycle(item_id, prerequisite_id):
+				skipped.append(prerequisite_id)
+				continue
+			self._requires.setdefault(item_id, set()).add(prerequisite_id)
+			self._unlocks.setdefault(prerequisite_id, set()).add(item_id)
+			self._links += 1
+		return skipped
+	
+	def discard(self, item_id: str) -> None:
+		"""Drop the links from an item to its prerequisites (links to it stay)"""
+		for prerequisite_id in self._requires.pop(item_id, ()):
+			dependents = self._unlocks[prerequisite_id]
+			dependents.discard(item_id)
+			if not dependents:
+				del self._unlocks[prerequisite_id]
+			self._links -= 1
+	
+	def clear(self) -> None:
+		"""Drop every link"""
+		self.__init__()
+	
+	def order(self, items: Mapping[str, HomeworkItem]) -> List[HomeworkItem]:
+		"""Topologically order items (id -> item), most pressing first among those that are ready.
+		
+		An item's effective deadline is the earliest due date of itself and
+		everything that waits for it. Ready items are taken from a heap by
+		(effective deadline, due date, priority); links to ids outside items
+		are ignored. Runs in O((n + links) log n).
+		"""
+		effective = {item_id: item.due_key for item_id, item in items.items()}
+		waiting = {item_id: sum(1 for p in self._requires.get(item_id, ()) if p in items) for item_id in items}
+		# Kahn's algorithm once in any order to propagate deadlines back to prerequisites
+		stack = [item_id for item_id, count in waiting.items() if not count]
+		remaining = dict(waiting)
+		topological = []
+		while stack:
+			item_id = stack.pop()
+			topological.append(item_id)
+			for dependent in self._unlocks.get(item_id, ()):
+				if dependent in remaining:
+					remaining[dependent] -= 1
+					if not remaining[dependent]:
+						stack.append(dependent)
+		for item_id in reversed(topological):
+			deadline = effective[item_id]
+			for prerequisite_id in self._requires.get(item_id, ()):
+				if prerequisite_id in effective and effective[prerequisite_id] > deadline:
+					effective[prerequisite_id] = deadline
+		ranks = {priority: rank for rank, priority in enumerate(PRIORITIES)}
+		
+		def entry(item_id: str) -> Tuple[int, int, int, int, str]:
+			item = items[item_id]
+			return (effective[item_id], item.due_key, ranks.get(item.priority, 1), position[item_id], item_id)
+		
+		position = {item_id: index for index, item_id in enumerate(items)}
+		heap = [entry(item_id) for item_id, count in waiting.items() if not count]
+		heapify(heap)
+		ordered: List[HomeworkItem] = []
+		while heap:
+			item_id = heappop(heap)[-1]
+			ordered.append(items[item_id])
+			for dependent in self._unlocks.get(item_id, ()):
+				if dependent in waiting:
+					waiting[dependent] -= 1
+					if not waiting[dependent]:
+						heappush(heap, entry(dependent))
+		return ordered
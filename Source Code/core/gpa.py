@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, asdict
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Set, Iterable, Optional
 import json
 import os
 
+from core.storage import JSONStorage
+
 
 GRADE_POINTS = {
 	"A": 4.00,
@@ -19,11 +22,21 @@ GRADE_POINTS = {
 	"F": 0.00,
 }
 
+# Allowed total credit hours for one semester
+MIN_SEMESTER_CREDITS = 10
+MAX_SEMESTER_CREDITS = 23
+
+# Grades in GRADE_POINTS order, addressed by a one-byte code in CourseTable
+GRADE_CODES: Tuple[str, ...] = tuple(GRADE_POINTS)
+_GRADE_INDEX = {grade: code for code, grade in enumerate(GRADE_CODES)}
+
 
 # Base class for academic records
 class AcademicRecord:
 	"""Base class for academic records with common functionality"""
 	
+	__slots__ = ("_name",)
+	
 	def __init__(self, name: str):
 		self._name = name  # Private attribute for encapsulation
 	
@@ -50,11 +63,14 @@ class AcademicRecord:
 class Course(AcademicRecord):
 	"""Course class with inheritance from AcademicRecord"""
 	
-	def __init__(self, name: str, credits: float, grade: str):
+	__slots__ = ("credits", "grade", "semester")
+	
+	def __init__(self, name: str, credits: float, grade: str, semester: int = 1):
 		"""Initialize course with validation"""
 		super().__init__(name)
 		self.credits = credits
 		self.grade = grade
+		self.semester = semester
 		self._validate_course_data()
 	
 	def _validate_course_data(self):
@@ -66,13 +82,16 @@ class Course(AcademicRecord):
 			raise ValueError("Credits must be one of: 2.0, 3.0, 4.0")
 		if self.grade not in GRADE_POINTS:
 			raise ValueError(f"Invalid grade. Valid grades: {list(GRADE_POINTS.keys())}")
+		if not isinstance(self.semester, int) or isinstance(self.semester, bool) or self.semester < 1:
+			raise ValueError("Semester must be a positive integer")
 	
 	def to_dict(self) -> Dict:
 		"""Override parent method to include course-specific data"""
 		base_dict = super().to_dict()
 		base_dict.update({
 			"credits": self.credits,
-			"grade": self.grade
+			"grade": self.grade,
+			"semester": self.semester
 		})
 		return base_dict
 	
@@ -85,20 +104,233 @@ class Course(AcademicRecord):
 		return self.credits * self.get_grade_points()
 
 
+class CourseTable:
+	"""Struct-of-arrays course storage for cohort-scale data.
+
+	Each field lives in its own column (array('d') credits, array('B') grade
+	codes, array('H') semesters) instead of one object per course. Per-grade
+	credit and count totals are maintained on every change, so GPA totals and
+	grade distributions never scan the rows.
+	"""
+	
+	def __init__(self):
+		self._names: List[str] = []  # Private attribute for encapsulation
+		self._credits = array("d")  # Private attribute
+		self._grades = array("B")  # Private attribute
+		self._semesters = array("H")  # Private attribute
+		self._grade_credits = array("d", [0.0] * len(GRADE_CODES))  # Private attribute
+		self._grade_counts = array("L", [0] * len(GRADE_CODES))  # Private attribute
+	
+	def __len__(self) -> int:
+		return len(self._names)
+	
+	def _grade_code(self, grade: str) -> int:
+		"""Private method to map a grade onto its column code"""
+		if grade not in _GRADE_INDEX:
+			raise ValueError(f"Invalid grade. Valid grades: {list(GRADE_POINTS.keys())}")
+		return _GRADE_INDEX[grade]
+	
+	def _check_index(self, index: int) -> None:
+		"""Private method to validate a row index"""
+		if not isinstance(index, int):
+			raise TypeError("Index must be an integer")
+		if index < 0 or index >= len(self._names):
+			raise IndexError(f"Course index {index} out of range (0-{len(self._names)-1})")
+	
+	def _tally(self, code: int, credits: float, sign: int) -> None:
+		"""Private method to keep the per-grade totals in step with the rows"""
+		self._grade_credits[code] += sign * credits
+		self._grade_counts[code] += sign
+	
+	def append(self, name: str, credits: float, grade: str, semester: int = 1) -> int:
+		"""Append a course row and return its index"""
+		code = self._grade_code(grade)
+		if not 1 <= semester <= 0xFFFF:
+			raise ValueError("Semester must be between 1 and 65535")
+		self._names.append(name)
+		self._credits.append(float(credits))
+		self._grades.append(code)
+		self._semesters.append(semester)
+		self._tally(code, float(credits), 1)
+		return len(self._names) - 1
+	
+	def extend(self, rows: Iterable[Tuple[str, float, str, int]]) -> None:
+		"""Append many (name, credits, grade, semester) rows"""
+		for name, credits, grade, semester in rows:
+			self.append(name, credits, grade, semester)
+	
+	def set(self, index: int, name: str, credits: float, grade: str, semester: int) -> None:
+		"""Overwrite a course row in place"""
+		self._check_index(index)
+		code = self._grade_code(grade)
+		if not 1 <= semester <= 0xFFFF:
+			raise ValueError("Semester must be between 1 and 65535")
+		self._tally(self._grades[index], self._credits[index], -1)
+		self._names[index] = name
+		self._credits[index] = float(credits)
+		self._grades[index] = code
+		self._semesters[index] = semester
+		self._tally(code, float(credits), 1)
+	
+	def pop(self, index: int) -> Tuple[str, float, str, int]:
+		"""Remove a course row and return it as (name, credits, grade, semester)"""
+		self._check_index(index)
+		row = self.row(index)
+		self._tally(self._grades[index], self._credits[index], -1)
+		del self._names[index]
+		del self._credits[index]
+		del self._grades[index]
+		del self._semesters[index]
+		return row
+	
+	def clear(self) -> None:
+		"""Remove every row"""
+		self.__init__()
+	
+	def row(self, index: int) -> Tuple[str, float, str, int]:
+		"""Get a course row as (name, credits, grade, semester)"""
+		self._check_index(index)
+		return (self._names[index], self._credits[index], GRADE_CODES[self._grades[index]], self._semesters[index])
+	
+	def course(self, index: int) -> Course:
+		"""Materialize one row as a Course"""
+		name, credits, grade, semester = self.row(index)
+		return Course(name=name, credits=credits, grade=grade, semester=semester)
+	
+	def courses(self) -> Tuple[Course, ...]:
+		"""Materialize every row as a Course"""
+		return tuple(
+			Course(name=name, credits=credits, grade=GRADE_CODES[code], semester=semester)
+			for name, credits, code, semester in zip(self._names, self._credits, self._grades, self._semesters)
+		)
+	
+	def totals(self) -> Tuple[float, float]:
+		"""Get (total_credits, weighted_points) from the per-grade totals"""
+		total_credits = sum(self._grade_credits)
+		weighted_points = sum(credits * GRADE_POINTS[grade] for grade, credits in zip(GRADE_CODES, self._grade_credits))
+		return total_credits, weighted_points
+	
+	def grade_counts(self) -> Dict[str, int]:
+		"""Get the number of courses per grade (grades without courses omitted)"""
+		return {grade: count for grade, count in zip(GRADE_CODES, self._grade_counts) if count}
+	
+	def grade_credits(self) -> Dict[str, float]:
+		"""Get the credits per grade (grades without courses omitted)"""
+		return {grade: credits for grade, credits, count in zip(GRADE_CODES, self._grade_credits, self._grade_counts) if count}
+
+
+class _FenwickTree:
+	"""Binary indexed tree over a fixed number of slots (0-based)"""
+	
+	def __init__(self, size: int):
+		self._size = size
+		self._tree = [0] * (size + 1)
+	
+	@classmethod
+	def from_values(cls, values: List) -> "_FenwickTree":
+		"""Build a tree from per-slot values in O(n)"""
+		fenwick = cls(len(values))
+		tree = fenwick._tree
+		for i, value in enumerate(values, 1):
+			tree[i] += value
+			parent = i + (i & -i)
+			if parent <= fenwick._size:
+				tree[parent] += tree[i]
+		return fenwick
+	
+	def __len__(self) -> int:
+		return self._size
+	
+	def add(self, slot: int, delta) -> None:
+		"""Add delta to a single slot"""
+		i = slot + 1
+		while i <= self._size:
+			self._tree[i] += delta
+			i += i & -i
+	
+	def prefix_sum(self, slot: int):
+		"""Sum of slots 0..slot inclusive (0 when slot < 0)"""
+		total = 0
+		i = min(slot + 1, self._size)
+		while i > 0:
+			total += self._tree[i]
+			i -= i & -i
+		return total
+	
+	def range_sum(self, first: int, last: int):
+		"""Sum of slots first..last inclusive"""
+		if last < first:
+			return 0
+		return self.prefix_sum(last) - self.prefix_sum(first - 1)
+
+
+class _SemesterRollup:
+	"""Per-semester credit and weighted-point totals with Fenwick prefix sums.
+
+	Totals are kept in hundredths as integers so repeated add/subtract never drifts.
+	"""
+	
+	def __init__(self, capacity: int = 16):
+		self._credits = [0] * capacity
+		self._points = [0] * capacity
+		self._credit_tree = _FenwickTree(capacity)
+		self._point_tree = _FenwickTree(capacity)
+	
+	def _ensure_capacity(self, semester: int) -> None:
+		"""Private method to grow the trees so the semester has a slot"""
+		if semester <= len(self._credits):
+			return
+		capacity = len(self._credits)
+		while capacity < semester:
+			capacity *= 2
+		padding = [0] * (capacity - len(self._credits))
+		self._credits.extend(padding)
+		self._points.extend(padding)
+		self._credit_tree = _FenwickTree.from_values(self._credits)
+		self._point_tree = _FenwickTree.from_values(self._points)
+	
+	def add(self, semester: int, credits: float, weighted_points: float, sign: int = 1) -> None:
+		"""Add (or with sign=-1 subtract) a course's totals to its semester"""
+		self._ensure_capacity(semester)
+		credit_units = sign * int(round(credits * 100))
+		point_units = sign * int(round(weighted_points * 100))
+		self._credits[semester - 1] += credit_units
+		self._points[semester - 1] += point_units
+		self._credit_tree.add(semester - 1, credit_units)
+		self._point_tree.add(semester - 1, point_units)
+	
+	def range_totals(self, first: int, last: int) -> Tuple[float, float]:
+		"""Get (credits, weighted_points) summed over semesters first..last"""
+		last = min(last, len(self._credits))
+		return (
+			self._credit_tree.range_sum(first - 1, last - 1) / 100,
+			self._point_tree.range_sum(first - 1, last - 1) / 100,
+		)
+	
+	def semesters(self) -> Tuple[int, ...]:
+		"""Get the semesters that currently hold credits"""
+		return tuple(i + 1 for i, units in enumerate(self._credits) if units)
+
+
 class GPACalculator:
 	"""Enhanced GPA Calculator with inheritance, encapsulation, and comprehensive exception handling"""
 	
-	def __init__(self, storage, history_name: str = "gpa_history.json"):
+	def __init__(self, storage, history_name: str = "gpa_history.json", setup_name: str = "semester_setup.json"):
 		"""Initialize GPA Calculator with proper validation"""
 		try:
 			if not storage:
 				raise ValueError("Storage object is required")
 			if not isinstance(history_name, str) or not history_name.strip():
 				raise ValueError("History name must be a non-empty string")
+			if not isinstance(setup_name, str) or not setup_name.strip():
+				raise ValueError("Setup name must be a non-empty string")
 			
 			self._storage = storage  # Private attribute for encapsulation
 			self._history_name = history_name.strip()  # Private attribute
-			self._courses: List[Course] = []  # Private attribute
+			self._setup_name = setup_name.strip()  # Private attribute
+			self._table = CourseTable()  # Private attribute
+			self._rollup = _SemesterRollup()  # Private attribute
+			self._courses: Optional[Tuple[Course, ...]] = None  # Private attribute: cached courses view
 			self._history: List[Dict] = self._load_history()  # Private attribute
 		except Exception as e:
 			raise RuntimeError(f"Failed to initialize GPA Calculator: {e}")
@@ -117,15 +349,51 @@ class GPACalculator:
 		except Exception as e:
 			raise RuntimeError(f"Failed to save GPA history: {e}")
 	
+	@property
+	def semester_setup(self) -> Dict:
+		"""Get the persisted semester setup as {"total_credits": int, "is_setup": bool}"""
+		try:
+			data = self._storage.load(self._setup_name, default={})
+			total_credits = data.get("total_credits", 0) if isinstance(data, dict) else 0
+			if isinstance(total_credits, int) and MIN_SEMESTER_CREDITS <= total_credits <= MAX_SEMESTER_CREDITS:
+				return {"total_credits": total_credits, "is_setup": True}
+			return {"total_credits": 0, "is_setup": False}
+		except Exception as e:
+			raise RuntimeError(f"Failed to load semester setup: {e}")
+	
+	def save_semester_setup(self, total_credits: int) -> Dict:
+		"""Validate and persist the semester's total credit hours"""
+		try:
+			if not isinstance(total_credits, int) or isinstance(total_credits, bool):
+				raise TypeError("Total credit hours must be an integer")
+			if total_credits < MIN_SEMESTER_CREDITS or total_credits > MAX_SEMESTER_CREDITS:
+				raise ValueError(f"Total credit hours must be between {MIN_SEMESTER_CREDITS} and {MAX_SEMESTER_CREDITS}")
+			self._storage.save(self._setup_name, {"total_credits": total_credits})
+			return {"total_credits": total_credits, "is_setup": True}
+		except (TypeError, ValueError):
+			raise  # Re-raise validation errors
+		except Exception as e:
+			raise RuntimeError(f"Failed to save semester setup: {e}")
+	
 	@property
 	def courses(self) -> Tuple[Course, ...]:
-		"""Get courses as immutable tuple for encapsulation"""
-		return tuple(self._courses)
+		"""Get courses as immutable tuple for encapsulation
+
+		The tuple is cached until the next add, update, remove or clear, so
+		its Course objects are read-only snapshots: change a course through
+		update_course. Use get_course, get_course_count and get_total_credits
+		when only one row or an aggregate is needed.
+		"""
+		if self._courses is None:
+			self._courses = self._table.courses()
+		return self._courses
 
 	def clear_courses(self) -> None:
 		"""Clear all courses from the current calculation"""
 		try:
-			self._courses.clear()
+			self._table.clear()
+			self._rollup = _SemesterRollup()
+			self._courses = None
 		except Exception as e:
 			raise RuntimeError(f"Failed to clear courses: {e}")
 	
@@ -134,7 +402,7 @@ class GPACalculator:
 		"""Get history as immutable tuple for encapsulation"""
 		return tuple(self._history)
 	
-	def add_course(self, name: str, credits: float, grade: str) -> Course:
+	def add_course(self, name: str, credits: float, grade: str, semester: int = 1) -> Course:
 		"""Add a course with comprehensive validation"""
 		try:
 			# Input validation
@@ -154,8 +422,10 @@ class GPACalculator:
 				raise ValueError(f"Invalid grade '{grade}'. Valid grades: {list(GRADE_POINTS.keys())}")
 			
 			# Create and add course
-			course = Course(name=name.strip(), credits=credits_float, grade=grade_upper)
-			self._courses.append(course)
+			course = Course(name=name.strip(), credits=credits_float, grade=grade_upper, semester=semester)
+			self._table.append(course.name, course.credits, course.grade, course.semester)
+			self._rollup.add(course.semester, course.credits, course.get_weighted_points())
+			self._courses = None
 			return course
 			
 		except ValueError:
@@ -168,23 +438,26 @@ class GPACalculator:
 		try:
 			if not isinstance(index, int):
 				raise TypeError("Index must be an integer")
-			if index < 0 or index >= len(self._courses):
-				raise IndexError(f"Course index {index} out of range (0-{len(self._courses)-1})")
+			if index < 0 or index >= len(self._table):
+				raise IndexError(f"Course index {index} out of range (0-{len(self._table)-1})")
 			
-			return self._courses.pop(index)
+			course = Course(*self._table.pop(index))
+			self._rollup.add(course.semester, course.credits, course.get_weighted_points(), sign=-1)
+			self._courses = None
+			return course
 			
 		except (TypeError, IndexError):
 			raise  # Re-raise validation errors
 		except Exception as e:
 			raise RuntimeError(f"Unexpected error removing course: {e}")
 
-	def update_course(self, index: int, name: str, credits: float, grade: str) -> Course:
-		"""Update a course by index with validation"""
+	def update_course(self, index: int, name: str, credits: float, grade: str, semester: Optional[int] = None) -> Course:
+		"""Update a course by index with validation (semester=None keeps the current semester)"""
 		try:
 			if not isinstance(index, int):
 				raise TypeError("Index must be an integer")
-			if index < 0 or index >= len(self._courses):
-				raise IndexError(f"Course index {index} out of range (0-{len(self._courses)-1})")
+			if index < 0 or index >= len(self._table):
+				raise IndexError(f"Course index {index} out of range (0-{len(self._table)-1})")
 			
 			# Input validation
 			if not isinstance(name, str) or not name.strip():
@@ -202,12 +475,16 @@ class GPACalculator:
 			if grade_upper not in GRADE_POINTS:
 				raise ValueError(f"Invalid grade '{grade}'. Valid grades: {list(GRADE_POINTS.keys())}")
 			
-			# Update the course in place
-			course = self._courses[index]
-			course.name = name.strip()
-			course.credits = credits_float
-			course.grade = grade_upper
-			course._validate_course_data()  # Re-validate
+			# Validate the replacement before touching the stored row
+			old_course = self._table.course(index)
+			new_semester = old_course.semester if semester is None else semester
+			course = Course(name=name.strip(), credits=credits_float, grade=grade_upper, semester=new_semester)
+			
+			# Update the row in place, moving its totals in the semester rollup
+			self._table.set(index, course.name, course.credits, course.grade, course.semester)
+			self._rollup.add(old_course.semester, old_course.credits, old_course.get_weighted_points(), sign=-1)
+			self._rollup.add(course.semester, course.credits, course.get_weighted_points())
+			self._courses = None
 			
 			return course
 			
@@ -219,11 +496,10 @@ class GPACalculator:
 	def calculate(self) -> Dict[str, float]:
 		"""Calculate GPA with comprehensive error handling"""
 		try:
-			if not self._courses:
+			if not len(self._table):
 				return {"gpa": 0.0, "total_credits": 0.0, "weighted_points": 0.0}
 			
-			total_credits = sum(course.credits for course in self._courses)
-			weighted_points = sum(course.get_weighted_points() for course in self._courses)
+			total_credits, weighted_points = self._table.totals()
 			
 			if total_credits <= 0:
 				raise ValueError("Total credits must be greater than 0")
@@ -238,6 +514,53 @@ class GPACalculator:
 		except Exception as e:
 			raise RuntimeError(f"Error calculating GPA: {e}")
 
+	def _validate_semester(self, semester: int) -> None:
+		"""Private method to validate a semester number"""
+		if not isinstance(semester, int) or isinstance(semester, bool) or semester < 1:
+			raise ValueError("Semester must be a positive integer")
+	
+	def _summarize(self, total_credits: float, weighted_points: float) -> Dict[str, float]:
+		"""Private method to format totals the same way calculate() does"""
+		gpa = weighted_points / total_credits if total_credits > 0 else 0.0
+		return {
+			"gpa": round(gpa, 2),
+			"total_credits": round(total_credits, 2),
+			"weighted_points": round(weighted_points, 2),
+		}
+	
+	@property
+	def semesters(self) -> Tuple[int, ...]:
+		"""Get the semesters that have at least one course"""
+		return self._rollup.semesters()
+	
+	def get_range_gpa(self, first_semester: int, last_semester: int) -> Dict[str, float]:
+		"""Calculate GPA over semesters first..last inclusive in O(log n)"""
+		try:
+			self._validate_semester(first_semester)
+			self._validate_semester(last_semester)
+			if last_semester < first_semester:
+				raise ValueError("Last semester must not come before first semester")
+			return self._summarize(*self._rollup.range_totals(first_semester, last_semester))
+		except ValueError:
+			raise  # Re-raise validation errors
+		except Exception as e:
+			raise RuntimeError(f"Error calculating semester range GPA: {e}")
+	
+	def get_semester_gpa(self, semester: int) -> Dict[str, float]:
+		"""Calculate GPA for a single semester"""
+		return self.get_range_gpa(semester, semester)
+	
+	def get_cumulative_gpa(self, semester: int) -> Dict[str, float]:
+		"""Calculate cumulative GPA (CGPA) from semester 1 through the given semester"""
+		return self.get_range_gpa(1, semester)
+	
+	def get_cumulative_gpa_trend(self) -> Tuple[Tuple[int, float], ...]:
+		"""Get (semester, CGPA after that semester) for every semester with courses"""
+		try:
+			return tuple((semester, self.get_cumulative_gpa(semester)["gpa"]) for semester in self.semesters)
+		except Exception as e:
+			raise RuntimeError(f"Error getting cumulative GPA trend: {e}")
+	
 	def save_result(self, gpa_value: float) -> bool:
 		"""Save GPA result to history with validation"""
 		try:
@@ -267,29 +590,37 @@ class GPACalculator:
 	def get_course_count(self) -> int:
 		"""Get the total number of courses"""
 		try:
-			return len(self._courses)
+			return len(self._table)
 		except Exception as e:
 			raise RuntimeError(f"Error getting course count: {e}")
 	
+	def get_course(self, index: int) -> Course:
+		"""Get one course by index without materializing the others"""
+		try:
+			return self._table.course(index)
+		except (TypeError, IndexError):
+			raise  # Re-raise validation errors
+		except Exception as e:
+			raise RuntimeError(f"Error getting course: {e}")
+	
+	def get_total_credits(self) -> float:
+		"""Get the total credits of all courses from the per-grade totals"""
+		try:
+			return self._table.totals()[0]
+		except Exception as e:
+			raise RuntimeError(f"Error getting total credits: {e}")
+	
 	def get_grade_distribution(self) -> Dict[str, int]:
 		"""Get the distribution of grades with error handling"""
 		try:
-			distribution = {}
-			for course in self._courses:
-				distribution[course.grade] = distribution.get(course.grade, 0) + 1
-			return distribution
+			return self._table.grade_counts()
 		except Exception as e:
 			raise RuntimeError(f"Error getting grade distribution: {e}")
 	
 	def get_credit_distribution_by_grade(self) -> Dict[str, float]:
 		"""Get the distribution of credits by grade with error handling"""
 		try:
-			distribution = {}
-			for course in self._courses:
-				if course.grade not in distribution:
-					distribution[course.grade] = 0.0
-				distribution[course.grade] += course.credits
-			return distribution
+			return self._table.grade_credits()
 		except Exception as e:
 			raise RuntimeError(f"Error getting credit distribution: {e}")
 	
@@ -333,9 +664,175 @@ class GPACalculator:
 	def get_course_summary(self) -> Tuple[Dict[str, any], ...]:
 		"""Get course summary as tuple of dictionaries"""
 		try:
-			return tuple(course.to_dict() for course in self._courses)
+			return tuple(course.to_dict() for course in self.courses)
 		except Exception as e:
 			raise RuntimeError(f"Error getting course summary: {e}")
 
 
 
+class CohortRanking:
+	"""Sorted multiset of cohort GPAs answering rank, percentile and top-k queries.
+
+	GPAs are held at two-decimal precision on the 0.00-4.00 scale, so every value
+	falls into one of 401 buckets. A Fenwick tree counts students per bucket,
+	which makes insert, update, delete, rank and percentile O(log n) in the
+	number of buckets regardless of cohort size.
+	"""
+	
+	_SCALE = 100
+	_BUCKETS = 401
+	
+	def __init__(self, entries: Iterable[Tuple[str, float]] = ()):
+		"""Initialize the ranking, optionally bulk-loading (student_id, gpa) pairs"""
+		self._gpas: Dict[str, float] = {}  # Private attribute for encapsulation
+		self._buckets: Dict[int, Set[str]] = {}  # Private attribute
+		self._counts = _FenwickTree(self._BUCKETS)  # Private attribute
+		self.bulk_load(entries)
+	
+	@classmethod
+	def from_history_dir(cls, base_dir: str, history_name: str = "gpa_history.json") -> "CohortRanking":
+		"""Build a ranking from per-student folders each holding a GPA history file.
+
+		The folder name is used as the student id and the latest saved GPA as the
+		student's value. Folders without history are skipped.
+		"""
+		try:
+			if not isinstance(base_dir, str) or not os.path.isdir(base_dir):
+				raise ValueError(f"Cohort directory not found: {base_dir}")
+			entries = []
+			for student_id in sorted(os.listdir(base_dir)):
+				student_dir = os.path.join(base_dir, student_id)
+				if not os.path.isfile(os.path.join(student_dir, history_name)):
+					continue
+				history = JSONStorage(student_dir).load(history_name, default=[])
+				if isinstance(history, list) and history and isinstance(history[-1], dict):
+					entries.append((student_id, history[-1].get("gpa", 0.0)))
+			return cls(entries)
+		except (TypeError, ValueError):
+			raise  # Re-raise validation errors
+		except Exception as e:
+			raise RuntimeError(f"Failed to load cohort histories: {e}")
+	
+	def _bucket(self, gpa: float) -> int:
+		"""Private method to validate a GPA and map it onto its bucket"""
+		if not isinstance(gpa, (int, float)) or isinstance(gpa, bool):
+			raise TypeError("GPA value must be a number")
+		if gpa < 0 or gpa > 4.0:
+			raise ValueError("GPA value must be between 0.0 and 4.0")
+		return int(round(gpa * self._SCALE))
+	
+	def _insert(self, student_id: str, bucket: int) -> None:
+		"""Private method to place a student in a bucket"""
+		self._gpas[student_id] = bucket / self._SCALE
+		self._buckets.setdefault(bucket, set()).add(student_id)
+		self._counts.add(bucket, 1)
+	
+	def _discard(self, student_id: str) -> int:
+		"""Private method to take a student out of its bucket"""
+		bucket = self._bucket(self._gpas.pop(student_id))
+		members = self._buckets[bucket]
+		members.discard(student_id)
+		if not members:
+			del self._buckets[bucket]
+		self._counts.add(bucket, -1)
+		return bucket
+	
+	def bulk_load(self, entries: Iterable[Tuple[str, float]]) -> int:
+		"""Replace the ranking with (student_id, gpa) pairs, building the tree in O(n)"""
+		try:
+			gpas: Dict[str, float] = {}
+			buckets: Dict[int, Set[str]] = {}
+			counts = [0] * self._BUCKETS
+			for student_id, gpa in entries:
+				if not isinstance(student_id, str) or not student_id.strip():
+					raise ValueError("Student id must be a non-empty string")
+				if student_id in gpas:
+					raise ValueError(f"Duplicate student id: {student_id}")
+				bucket = self._bucket(gpa)
+				gpas[student_id] = bucket / self._SCALE
+				buckets.setdefault(bucket, set()).add(student_id)
+				counts[bucket] += 1
+			self._gpas = gpas
+			self._buckets = buckets
+			self._counts = _FenwickTree.from_values(counts)
+			return len(gpas)
+		except (TypeError, ValueError):
+			raise  # Re-raise validation errors
+		except Exception as e:
+			raise RuntimeError(f"Failed to bulk-load cohort: {e}")
+	
+	def __len__(self) -> int:
+		return len(self._gpas)
+	
+	def __contains__(self, student_id: str) -> bool:
+		return student_id in self._gpas
+	
+	def add(self, student_id: str, gpa: float) -> None:
+		"""Add a student's GPA to the cohort"""
+		if not isinstance(student_id, str) or not student_id.strip():
+			raise ValueError("Student id must be a non-empty string")
+		if student_id in self._gpas:
+			raise ValueError(f"Student '{student_id}' is already ranked")
+		self._insert(student_id, self._bucket(gpa))
+	
+	def update(self, student_id: str, gpa: float) -> None:
+		"""Change a ranked student's GPA"""
+		if student_id not in self._gpas:
+			raise KeyError(f"Student '{student_id}' is not ranked")
+		bucket = self._bucket(gpa)
+		self._discard(student_id)
+		self._insert(student_id, bucket)
+	
+	def remove(self, student_id: str) -> float:
+		"""Remove a student from the cohort, returning their GPA"""
+		if student_id not in self._gpas:
+			raise KeyError(f"Student '{student_id}' is not ranked")
+		gpa = self._gpas[student_id]
+		self._discard(student_id)
+		return gpa
+	
+	def get_gpa(self, student_id: str) -> float:
+		"""Get a ranked student's GPA"""
+		if student_id not in self._gpas:
+			raise KeyError(f"Student '{student_id}' is not ranked")
+		return self._gpas[student_id]
+	
+	def count_above(self, gpa: float) -> int:
+		"""Number of students with a strictly higher GPA"""
+		return len(self._gpas) - self._counts.prefix_sum(self._bucket(gpa))
+	
+	def rank_of_gpa(self, gpa: float) -> int:
+		"""Competition rank (1 = best) a GPA would hold in the cohort"""
+		return self.count_above(gpa) + 1
+	
+	def rank(self, student_id: str) -> int:
+		"""Competition rank (1 = best) of a ranked student; ties share a rank"""
+		return self.rank_of_gpa(self.get_gpa(student_id))
+	
+	def percentile_of_gpa(self, gpa: float) -> float:
+		"""Percentile rank of a GPA: share of the cohort below it, counting ties as half"""
+		if not self._gpas:
+			return 0.0
+		bucket = self._bucket(gpa)
+		below = self._counts.prefix_sum(bucket - 1)
+		equal = len(self._buckets.get(bucket, ()))
+		return round((below + 0.5 * equal) / len(self._gpas) * 100, 2)
+	
+	def percentile(self, student_id: str) -> float:
+		"""Percentile rank of a ranked student within the cohort"""
+		return self.percentile_of_gpa(self.get_gpa(student_id))
+	
+	def top(self, k: int) -> Tuple[Tuple[str, float], ...]:
+		"""Get the k highest (student_id, gpa) pairs, ties ordered by student id"""
+		if not isinstance(k, int) or k < 0:
+			raise ValueError("k must be a non-negative integer")
+		result: List[Tuple[str, float]] = []
+		for bucket in sorted(self._buckets, reverse=True):
+			if len(result) >= k:
+				break
+			gpa = bucket / self._SCALE
+			for student_id in sorted(self._buckets[bucket]):
+				if len(result) >= k:
+					break
+				result.append((student_id, gpa))
+		return tuple(result)
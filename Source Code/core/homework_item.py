@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from datetime import datetime, date
+from typing import Dict, Iterable, Literal, Optional, Tuple
+import uuid
+
+
+Status = Literal["Pending", "In Progress", "Completed"]
+Priority = Literal["High", "Medium", "Low"]
+
+STATUSES: Tuple[str, ...] = ("Pending", "In Progress", "Completed")
+PRIORITIES: Tuple[str, ...] = ("High", "Medium", "Low")  # Most urgent first
+
+
+# Base class for academic tasks
+class AcademicTask:
+	"""Base class for academic tasks with common functionality"""
+	
+	def __init__(self, title: str, subject: str):
+		self._title = title  # Private attribute for encapsulation
+		self._subject = subject  # Private attribute for encapsulation
+	
+	@property
+	def title(self) -> str:
+		"""Get the title of the task"""
+		return self._title
+	
+	@title.setter
+	def title(self, value: str):
+		"""Set the title with validation"""
+		if not isinstance(value, str) or not value.strip():
+			raise ValueError("Title must be a non-empty string")
+		self._title = value.strip()
+	
+	@property
+	def subject(self) -> str:
+		"""Get the subject of the task"""
+		return self._subject
+	
+	@subject.setter
+	def subject(self, value: str):
+		"""Set the subject with validation"""
+		if not isinstance(value, str) or not value.strip():
+			raise ValueError("Subject must be a non-empty string")
+		self._subject = value.strip()
+	
+	def to_dict(self) -> Dict:
+		"""Convert to dictionary format"""
+		return {"title": self._title, "subject": self._subject}
+	
+	def __str__(self) -> str:
+		return f"{self.__class__.__name__}: {self._title} ({self._subject})"
+
+
+# Sort key for items whose due date does not parse: after every real date
+NO_DUE_ORDINAL = date.max.toordinal() + 1
+
+
+def parse_due_ordinal(value) -> Optional[int]:
+	"""Parse a YYYY-MM-DD due date into a date ordinal, or None if invalid"""
+	if not isinstance(value, str):
+		return None
+	if len(value) == 10 and value[4] == "-" and value[7] == "-":
+		try:
+			return date(int(value[:4]), int(value[5:7]), int(value[8:])).toordinal()
+		except ValueError:
+			pass
+	try:
+		# Slow path for forms strptime also accepts, e.g. unpadded months
+		return datetime.strptime(value, "%Y-%m-%d").date().toordinal()
+	except (ValueError, TypeError):
+		return None
+
+
+def today_ordinal() -> int:
+	"""Get today's date as an ordinal, computed once per query by callers"""
+	return date.today().toordinal()
+
+
+def new_item_id() -> str:
+	"""Generate a short random id for a homework item"""
+	return uuid.uuid4().hex[:12]
+
+
+class HomeworkItem(AcademicTask):
+	"""Homework item class with inheritance from AcademicTask"""
+	
+	def __init__(self, subject: str, title: str, due: str = "", status: Status = "Pending", details: str = "", priority: Priority = "Medium", item_id: str = "", requires: Iterable[str] = (), effort_minutes: int = 0, completed_on: str = ""):
+		"""Initialize homework item with validation (a new id is generated when none is given)"""
+		super().__init__(title, subject)
+		self._id = item_id or new_item_id()  # Private attribute: stable identity
+		self.due = due
+		self.status = status
+		self.details = details
+		self.priority = priority
+		self._requires: Tuple[str, ...] = tuple(dict.fromkeys(requires))  # Private attribute: prerequisite ids
+		self.effort_minutes = effort_minutes  # Estimated work; 0 means not estimated
+		self.completed_on = completed_on  # Day it was marked Completed (YYYY-MM-DD); "" if unfinished or unknown
+		self._validate_homework_data()
+	
+	@classmethod
+	def from_trusted_dict(cls, data: Dict) -> "HomeworkItem":
+		"""Build an item from a to_dict() record written by our own save, skipping validation"""
+		item = cls.__new__(cls)
+		item._title = data["title"]
+		item._subject = data["subject"]
+		item._id = data["id"]
+		item.due = data["due"]
+		item.status = data["status"]
+		item.details = data["details"]
+		item.priority = data["priority"]
+		item._requires = tuple(data.get("requires", ()))
+		item.effort_minutes = data.get("effort_minutes", 0)
+		item.completed_on = data.get("completed_on", "")
+		return item
+	
+	@property
+	def id(self) -> str:
+		"""Get the stable unique id of the item"""
+		return self._id
+	
+	@property
+	def requires(self) -> Tuple[str, ...]:
+		"""Get the ids of the items this one depends on (changed through the planner)"""
+		return self._requires
+	
+	@property
+	def due(self) -> str:
+		"""Get the due date string (YYYY-MM-DD)"""
+		return self._due
+	
+	@due.setter
+	def due(self, value: str):
+		"""Set the due date, parsing it once into a date ordinal"""
+		self._due = value
+		self._due_ordinal = parse_due_ordinal(value)
+	
+	@property
+	def due_ordinal(self) -> Optional[int]:
+		"""Get the due date as a date ordinal (None when the date is invalid)"""
+		return self._due_ordinal
+	
+	@property
+	def due_key(self) -> int:
+		"""Get a sortable due-date key; invalid dates sort last"""
+		return NO_DUE_ORDINAL if self._due_ordinal is None else self._due_ordinal
+	
+	def _validate_homework_data(self):
+		"""Private method for data validation - encapsulation"""
+		if not isinstance(self._id, str) or not self._id.strip():
+			raise ValueError("Item id must be a non-empty string")
+		if not self.title.strip():
+			raise ValueError("Title is required")
+		if self.title.strip().isdigit():
+			raise ValueError("Title must contain text, not just numbers")
+		if not self.subject.strip():
+			raise ValueError("Subject is required")
+		if not self.due.strip():
+			raise ValueError("Due date is required")
+		if self.status not in ["Pending", "In Progress", "Completed"]:
+			raise ValueError(f"Invalid status. Valid statuses: {['Pending', 'In Progress', 'Completed']}")
+		if self.priority not in ["High", "Medium", "Low"]:
+			raise ValueError(f"Invalid priority. Valid priorities: {['High', 'Medium', 'Low']}")
+		if not self._is_valid_date_format():
+			raise ValueError("Due date must be in YYYY-MM-DD format")
+		if any(not isinstance(item_id, str) or not item_id or item_id == self._id for item_id in self._requires):
+			raise ValueError("Prerequisites must be the ids of other items")
+		if not isinstance(self.effort_minutes, int) or isinstance(self.effort_minutes, bool) or self.effort_minutes < 0:
+			raise ValueError("Effort must be a whole number of minutes (0 if not estimated)")
+		if not isinstance(self.completed_on, str) or (self.completed_on and parse_due_ordinal(self.completed_on) is None):
+			raise ValueError("Completion date must be in YYYY-MM-DD format")
+	
+	def _is_valid_date_format(self) -> bool:
+		"""Private method to validate date format (parsed once when due is set)"""
+		return self._due_ordinal is not None
+	
+	def is_valid_date(self) -> bool:
+		"""Public method to check if date is valid"""
+		return self._is_valid_date_format()
+	
+	def is_overdue(self, today: Optional[int] = None) -> bool:
+		"""Check if the homework is overdue; pass today_ordinal() when checking many items"""
+		if self._due_ordinal is None or self.status == "Completed":
+			return False
+		if today is None:
+			today = today_ordinal()
+		return self._due_ordinal < today
+	
+	def to_dict(self) -> Dict:
+		"""Override parent method to include homework-specific data"""
+		base_dict = super().to_dict()
+		base_dict.update({
+			"id": self._id,
+			"due": self.due,
+			"status": self.status,
+			"details": self.details,
+			"priority": self.priority
+		})
+		if self._requires:
+			base_dict["requires"] = list(self._requires)
+		if self.effort_minutes:
+			base_dict["effort_minutes"] = self.effort_minutes
+		if self.completed_on:
+			base_dict["completed_on"] = self.completed_on
+		return base_dict
+	
+	def get_priority_weight(self) -> int:
+		"""Get priority as numeric weight for sorting"""
+		priority_weights = {"High": 3, "Medium": 2, "Low": 1}
+		return priority_weights.get(self.priority, 2)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import hashlib
+
+
+# Components that become homework; everything else in a feed is skipped
+HOMEWORK_COMPONENTS = ("VTODO", "VEVENT")
+
+# UIDs written by write_calendar; importing them keeps the original item id
+UID_SUFFIX = "@student-toolkit"
+
+# iCalendar PRIORITY is 1 (highest) .. 9 (lowest), 0 = undefined
+_PRIORITY_FROM_ICS = {**{n: "High" for n in range(1, 5)}, 5: "Medium", **{n: "Low" for n in range(6, 10)}}
+_PRIORITY_TO_ICS = {"High": 1, "Medium": 5, "Low": 9}
+_STATUS_FROM_ICS = {"COMPLETED": "Completed", "IN-PROCESS": "In Progress"}
+_STATUS_TO_ICS = {"Completed": "COMPLETED", "In Progress": "IN-PROCESS", "Pending": "NEEDS-ACTION"}
+_FREQ_DAYS = {"DAILY": 1, "WEEKLY": 7}
+
+
+def unfold(lines: Iterable[str]) -> Iterator[str]:
+	"""Join folded content lines (continuations start with a space or tab), one line at a time"""
+	pending = None
+	for raw in lines:
+		line = raw.rstrip("\r\n")
+		if line[:1] in (" ", "\t") and pending is not None:
+			pending += line[1:]
+			continue
+		if pending is not None:
+			yield pending
+		pending = line
+	if pending:
+		yield pending
+
+
+def parse_line(line: str) -> Tuple[str, Dict[str, str], str]:
+	"""Split 'NAME;PARAM=x:value' into (NAME, {PARAM: x}, value)"""
+	head, _, value = line.partition(":")
+	name, *params = head.split(";")
+	return name.upper(), dict(param.partition("=")[::2] for param in params), value
+
+
+def unescape(value: str) -> str:
+	"""Decode an iCalendar TEXT value"""
+	if "\\" not in value:
+		return value
+	out: List[str] = []
+	chars = iter(value)
+	for char in chars:
+		if char == "\\":
+			char = next(chars, "")
+			out.append("\n" if char in ("n", "N") else char)
+		else:
+			out.append(char)
+	return "".join(out)
+
+
+def escape(value: str) -> str:
+	"""Encode text as an iCalendar TEXT value"""
+	return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+
+
+def read_components(lines: Iterable[str]) -> Iterator[Dict[str, Tuple[Dict[str, str], str]]]:
+	"""Stream VTODO/VEVENT components as {property: (params, value)}; memory holds one component"""
+	component: Optional[Dict[str, Tuple[Dict[str, str], str]]] = None
+	depth = 0  # Nested components (e.g. VALARM) inside the current one are skipped
+	for line in unfold(lines):
+		name, params, value = parse_line(line)
+		if name == "BEGIN":
+			if component is not None:
+				depth += 1
+			elif value.upper() in HOMEWORK_COMPONENTS:
+				component = {"BEGIN": ({}, value.upper())}
+		elif name == "END":
+			if component is not None:
+				if depth:
+					depth -= 1
+				else:
+					yield component
+					component = None
+		elif component is not None and not depth and name not in component:
+			component[name] = (params, value)
+
+
+def ics_date(value: str) -> str:
+	"""Convert 20250115 or 20250115T235900Z to YYYY-MM-DD (the date part is kept as written)"""
+	digits = value.strip()[:8]
+	if len(digits) != 8 or not digits.isdigit():
+		return ""
+	return f"{digits[:4]}-{digits[4:6]}-{digits[6:]}"
+
+
+def parse_rrule(value: str) -> Optional[Dict]:
+	"""Map a DAILY/WEEKLY RRULE to recurrence fields, or None for rules that cannot be represented"""
+	parts = dict(part.partition("=")[::2] for part in value.upper().split(";") if part)
+	every = _FREQ_DAYS.get(parts.get("FREQ", ""))
+	if every is None or set(parts) - {"FREQ", "INTERVAL", "UNTIL", "COUNT", "WKST"}:
+		return None
+	try:
+		interval = int(parts.get("INTERVAL", "1"))
+		count = int(parts.get("COUNT", "0"))
+	except ValueError:
+		return None
+	return {"every_days": every * interval, "until": ics_date(parts.get("UNTIL", "")), "count": count}
+
+
+def component_to_fields(component: Dict[str, Tuple[Dict[str, str], str]], default_subject: str) -> Optional[Dict]:
+	"""Map one component to HomeworkPlanner fields (plus uid and recurrence), or None if it has no date"""
+	# Portal deadlines are usually events that start at the due time
+	due_property = ("DUE", "DTSTART") if component["BEGIN"][1] == "VTODO" else ("DTSTART", "DTEND")
+	due = next((ics_date(component[name][1]) for name in due_property if name in component), "")
+	if not due:
+		return None
+	title = unescape(component.get("SUMMARY", ({}, ""))[1]).strip()
+	# CATEGORIES is a comma-separated list; escaped commas belong to the first name
+	categories = component.get("CATEGORIES", ({}, ""))[1].replace("\\,", "\0").split(",")[0]
+	categories = unescape(categories.replace("\0", "\\,")).strip()
+	try:
+		priority = _PRIORITY_FROM_ICS.get(int(component.get("PRIORITY", ({}, "0"))[1]), "Medium")
+	except ValueError:
+		priority = "Medium"
+	rrule = component.get("RRULE")
+	return {
+		"uid": component.get("UID", ({}, ""))[1].strip(),
+		"subject": categories or default_subject,
+		"title": title or "(untitled)",
+		"due": due,
+		"details": unescape(component.get("DESCRIPTION", ({}, ""))[1]).strip(),
+		"priority": priority,
+		"status": _STATUS_FROM_ICS.get(component.get("STATUS", ({}, ""))[1].strip().upper(), "Pending"),
+		"recurrence": parse_rrule(rrule[1]) if rrule else None,
+	}
+
+
+def uid_item_id(uid: str) -> str:
+	"""Derive a stable 12-character item id from an iCalendar UID, so re-imports map to the same item"""
+	if uid.endswith(UID_SUFFIX) and len(uid) == 12 + len(UID_SUFFIX):
+		return uid[:12]  # One of our own exports
+	return hashlib.blake2b(uid.encode("utf-8"), digest_size=6).hexdigest()
+
+
+def fold(line: str) -> Iterator[str]:
+	"""Fold a content line to at most 75 octets per line (RFC 5545), never splitting a character"""
+	encoded = line.encode("utf-8")
+	if len(encoded) <= 75:
+		yield line + "\r\n"
+		return
+	start, limit = 0, 75
+	while start < len(encoded):
+		end = min(start + limit, len(encoded))
+		while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+			end -= 1  # Back off to a character boundary
+		yield ("" if start == 0 else " ") + encoded[start:end].decode("utf-8") + "\r\n"
+		start, limit = end, 74  # Continuation lines spend one octet on the leading space
+
+
+def write_calendar(entries: Iterable[Dict], stamp: str) -> Iterator[str]:
+	"""Stream a VCALENDAR of VTODOs from item dictionaries (to_dict() form), one line at a time"""
+	yield from fold("BEGIN:VCALENDAR")
+	yield from fold("VERSION:2.0")
+	yield from fold("PRODID:-//TARUMT Student Toolkit//Homework Planner//EN")
+	for entry in entries:
+		due = entry["due"].replace("-", "")
+		yield from fold("BEGIN:VTODO")
+		yield from fold(f"UID:{entry['id']}{UID_SUFFIX}")
+		yield from fold(f"DTSTAMP:{stamp}")
+		yield from fold(f"SUMMARY:{escape(entry['title'])}")
+		yield from fold(f"CATEGORIES:{escape(entry['subject'])}")
+		yield from fold(f"DUE;VALUE=DATE:{due}")
+		yield from fold(f"PRIORITY:{_PRIORITY_TO_ICS.get(entry['priority'], 5)}")
+		yield from fold(f"STATUS:{_STATUS_TO_ICS.get(entry['status'], 'NEEDS-ACTION')}")
+		if entry.get("details"):
+			yield from fold(f"DESCRIPTION:{escape(entry['details'])}")
+		recurrence = entry.get("recurrence")
+		if recurrence:
+			rule = f"RRULE:FREQ=DAILY;INTERVAL={recurrence['every_days']}"
+			if recurrence.get("until"):
+				rule += f";UNTIL={recurrence['until'].replace('-', '')}"
+			if recurrence.get("count"):
+				rule += f";COUNT={recurrence['count']}"
+			yield from fold(rule)
+		yield from fold("END:VTODO")
+	yield from fold("END:VCALENDAR")
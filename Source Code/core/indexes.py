@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from heapq import merge
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.homework_item import HomeworkItem, NO_DUE_ORDINAL, PRIORITIES, STATUSES, today_ordinal
+from core.recurrence import RECURRENCE_HORIZON_DAYS, RecurringHomework, _STATUS_SLOT
+
+
+class SubjectRollups:
+	"""Subject strings interned to small integer ids, with per-subject counts kept as items change.
+	
+	Every item of a subject shares one string object, so a long course name
+	is stored once however many items use it. For each id the table keeps
+	counts by status and the sorted (due key, seq) entries of unfinished
+	items, so a subject's overdue count and next due date are a bisect away.
+	Recurring series are not counted here; rollup() adds them when asked.
+	Ids are never reused while the planner is open.
+	"""
+	
+	def __init__(self):
+		self._ids: Dict[str, int] = {}  # Private attribute: subject -> id
+		self._names: List[str] = []  # Private attribute: id -> the shared subject string
+		self._counts: List[List[int]] = []  # Private attribute: id -> counts in STATUSES order
+		self._open: List[List[Tuple[int, int]]] = []  # Private attribute: id -> sorted (due key, seq) of unfinished items
+	
+	def __len__(self) -> int:
+		return len(self._names)
+	
+	def intern(self, subject: str) -> int:
+		"""Get the id of a subject, assigning the next one on first sight"""
+		subject_id = self._ids.get(subject)
+		if subject_id is None:
+			subject_id = self._ids[subject] = len(self._names)
+			self._names.append(subject)
+			self._counts.append([0] * len(STATUSES))
+			self._open.append([])
+		return subject_id
+	
+	def id_of(self, subject: str) -> Optional[int]:
+		"""Get the id of a known subject, or None"""
+		return self._ids.get(subject)
+	
+	def name(self, subject_id: int) -> str:
+		"""Get the shared string of a subject id"""
+		return self._names[subject_id]
+	
+	def add(self, subject_id: int, status: str, due: int, seq: int, keep_sorted: bool = True) -> None:
+		"""Count one item (bulk loaders pass keep_sorted=False and call finish_bulk())"""
+		self._counts[subject_id][_STATUS_SLOT.get(status, 0)] += 1
+		if status != "Completed":
+			if keep_sorted:
+				insort(self._open[subject_id], (due, seq))
+			else:
+				self._open[subject_id].append((due, seq))
+	
+	def remove(self, subject_id: int, status: str, due: int, seq: int) -> None:
+		"""Stop counting one item, given the values it was counted with"""
+		self._counts[subject_id][_STATUS_SLOT.get(status, 0)] -= 1
+		if status != "Completed":
+			entries = self._open[subject_id]
+			del entries[bisect_left(entries, (due, seq))]
+	
+	def reset(self) -> None:
+		"""Zero every rollup, keeping the subject ids"""
+		self._counts = [[0] * len(STATUSES) for _ in self._names]
+		self._open = [[] for _ in self._names]
+	
+	def finish_bulk(self) -> None:
+		"""Sort the unfinished entries after adds made with keep_sorted=False"""
+		for entries in self._open:
+			entries.sort()
+	
+	def rollup(self, subject_id: int, today: int, series: Iterable[RecurringHomework] = (), until: int = 0) -> Dict:
+		"""Get id, subject, total, per-status and overdue counts and the next due date from today ("" if none).
+		
+		series adds the occurrences of those recurring series due from
+		RECURRENCE_HORIZON_DAYS before today up to until, the window that
+		get_priority_sorted and get_overdue_items list.
+		"""
+		pending, in_progress, completed = self._counts[subject_id]
+		entries = self._open[subject_id]
+		overdue = bisect_left(entries, (today,))
+		upcoming = entries[overdue][0] if overdue < len(entries) else NO_DUE_ORDINAL
+		for recurring in series:
+			extra_pending, extra_in_progress, extra_completed = recurring.status_counts(until, today - RECURRENCE_HORIZON_DAYS)
+			pending, in_progress, completed = pending + extra_pending, in_progress + extra_in_progress, completed + extra_completed
+			overdue += recurring.overdue_count(today, today - RECURRENCE_HORIZON_DAYS)
+			next_open = recurring.next_open(today, until)
+			if next_open is not None and next_open < upcoming:
+				upcoming = next_open
+		return {
+			"id": subject_id,
+			"subject": self._names[subject_id],
+			"total": pending + in_progress + completed,
+			"pending": pending,
+			"in_progress": in_progress,
+			"completed": completed,
+			"overdue": overdue,
+			"next_due": date.fromordinal(upcoming).isoformat() if upcoming < NO_DUE_ORDINAL else "",
+		}
+
+
+class HomeworkIndexes:
+	"""Secondary indexes over homework items: status, due date, priority and subject.
+
+	Every item gets an insertion sequence number; sorting a result by it gives
+	the same order as a scan of the planner's list. Due-date entries are
+	(due_key, seq, item) tuples kept sorted, so the unique seq means items are never
+	compared. A snapshot of the indexed fields lets an item be unindexed after
+	it has already been mutated. The overdue counter is kept relative to
+	`today` and recounted by bisection when the date changes. Subjects are
+	interned through `subjects`, which also keeps the per-subject rollups.
+	"""
+	
+	def __init__(self):
+		self._seq: Dict[HomeworkItem, int] = {}  # Private attribute for encapsulation
+		self._snapshot: Dict[HomeworkItem, Tuple[str, str, str, int]] = {}  # Private attribute
+		self._next_seq = 0  # Private attribute
+		self.by_status: Dict[str, Dict[HomeworkItem, None]] = {status: {} for status in STATUSES}
+		self.by_priority: Dict[str, Dict[HomeworkItem, None]] = {priority: {} for priority in PRIORITIES}
+		self.by_subject: Dict[str, Dict[HomeworkItem, None]] = {}
+		self.subjects = SubjectRollups()
+		self.by_due: List[Tuple[int, int, HomeworkItem]] = []
+		# Due-sorted entries per (status, priority) so priority views are concatenations
+		self.by_status_priority: Dict[Tuple[str, str], List[Tuple[int, int, HomeworkItem]]] = {
+			(status, priority): [] for status in STATUSES for priority in PRIORITIES
+		}
+		self.today = today_ordinal()
+		self.overdue = 0  # Unfinished items due before self.today
+	
+	def __len__(self) -> int:
+		return len(self._seq)
+	
+	def add(self, item: HomeworkItem, seq: Optional[int] = None, keep_sorted: bool = True) -> None:
+		"""Index an item (seq is reused when re-indexing); bulk loaders pass keep_sorted=False and call finish_bulk()"""
+		if seq is None:
+			seq = self._next_seq
+			self._next_seq += 1
+		elif seq >= self._next_seq:
+			self._next_seq = seq + 1
+		subject_id = self.subjects.intern(item.subject)
+		if item._subject is not self.subjects.name(subject_id):
+			item._subject = self.subjects.name(subject_id)  # Share one string per subject
+		fields = (item.status, item.priority, item.subject, item.due_key)
+		self._seq[item] = seq
+		self._snapshot[item] = fields
+		status, priority, subject, due = fields
+		self.subjects.add(subject_id, status, due, seq, keep_sorted)
+		self.by_status.setdefault(status, {})[item] = None
+		self.by_priority.setdefault(priority, {})[item] = None
+		self.by_subject.setdefault(subject, {})[item] = None
+		entry = (due, seq, item)
+		if keep_sorted:
+			insort(self.by_due, entry)
+			insort(self.by_status_priority.setdefault((status, priority), []), entry)
+		else:
+			self.by_due.append(entry)
+			self.by_status_priority.setdefault((status, priority), []).append(entry)
+		if status != "Completed" and due < self.today:
+			self.overdue += 1
+	
+	def remove(self, item: HomeworkItem) -> int:
+		"""Drop an item from every index using its last indexed field values"""
+		seq = self._seq.pop(item)
+		status, priority, subject, due = self._snapshot.pop(item)
+		del self.by_status[status][item]
+		del self.by_priority[priority][item]
+		subject_items = self.by_subject[subject]
+		del subject_items[item]
+		if not subject_items:
+			del self.by_subject[subject]
+		self.subjects.remove(self.subjects.id_of(subject), status, due, seq)
+		entry = (due, seq, item)
+		self._remove_entry(self.by_due, entry)
+		self._remove_entry(self.by_status_priority[(status, priority)], entry)
+		if status != "Completed" and due < self.today:
+			self.overdue -= 1
+		return seq
+	
+	def reindex(self, item: HomeworkItem) -> None:
+		"""Refresh an item's entries after its fields changed"""
+		if self._snapshot.get(item) == (item.status, item.priority, item.subject, item.due_key):
+			return
+		self.add(item, self.remove(item))
+	
+	def clear(self) -> None:
+		"""Drop every entry (subject ids are kept)"""
+		subjects = self.subjects
+		self.__init__()
+		subjects.reset()
+		self.subjects = subjects
+	
+	def finish_bulk(self) -> None:
+		"""Sort the due-date lists after adds made with keep_sorted=False"""
+		self.by_due.sort()
+		for entries in self.by_status_priority.values():
+			entries.sort()
+		self.subjects.finish_bulk()
+	
+	def roll_day(self, today: int) -> bool:
+		"""Recount overdue items for a new day in O(log n); returns whether the day changed"""
+		if today == self.today:
+			return False
+		self.today = today
+		self.overdue = sum(
+			bisect_left(entries, (today,))
+			for (status, _), entries in self.by_status_priority.items() if status != "Completed"
+		)
+		return True
+	
+	@staticmethod
+	def _remove_entry(entries: List[Tuple[int, int, HomeworkItem]], entry: Tuple[int, int, HomeworkItem]) -> None:
+		"""Private method to delete one entry from a sorted list"""
+		position = bisect_left(entries, entry[:2])
+		if position < len(entries) and entries[position][:2] == entry[:2]:
+			del entries[position]
+	
+	def seq_of(self, item: HomeworkItem) -> int:
+		"""Get an item's sequence number (its place in the planner's list)"""
+		return self._seq[item]
+	
+	def in_list_order(self, items) -> Tuple[HomeworkItem, ...]:
+		"""Order a subset of items the way the planner's list holds them"""
+		return tuple(sorted(items, key=self._seq.__getitem__))
+	
+	def due_before(self, day: int) -> List[HomeworkItem]:
+		"""Items due strictly before a day ordinal, earliest first"""
+		end = bisect_left(self.by_due, (day,))
+		return [entry[2] for entry in self.by_due[:end]]
+	
+	def due_between(self, first_day: int, last_day: int) -> List[HomeworkItem]:
+		"""Items due within [first_day, last_day] (day ordinals) inclusive, earliest first"""
+		start = bisect_left(self.by_due, (first_day,))
+		end = bisect_right(self.by_due, (last_day, float("inf")))
+		return [entry[2] for entry in self.by_due[start:end]]
+	
+	def priority_sorted(self, statuses: Tuple[str, ...], due_before: Optional[int] = None) -> List[HomeworkItem]:
+		"""Items with the given statuses ordered by (priority, due), optionally only due before a day"""
+		result: List[HomeworkItem] = []
+		for priority in PRIORITIES:
+			lists = []
+			for status in statuses:
+				entries = self.by_status_priority.get((status, priority), [])
+				if due_before is not None:
+					entries = entries[:bisect_left(entries, (due_before,))]
+				lists.append(entries)
+			result.extend(entry[2] for entry in merge(*lists))
+		return result
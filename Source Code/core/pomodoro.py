@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, asdict
-from typing import Literal, Callable, Optional, Tuple, Dict
+from typing import Literal, Callable, Optional, Tuple, Dict, List
 import json
 import os
+import time
 
 
 Mode = Literal["Work", "Short Break", "Long Break", "Idle"]
 
+# The session log is fsynced after this many appended sessions, or on the first append this long after the last fsync
+SESSION_SYNC_EVERY = 8
+SESSION_SYNC_SECONDS = 300
+
+# Running totals carried by every session log record, so the newest record holds the statistics
+_SESSION_TOTALS = ("sessions", "completed", "work_sessions", "work_seconds", "break_seconds")
+
 
 # Base class for timer configurations
 class TimerConfig:
@@ -92,6 +100,7 @@ class PomodoroState:
 	seconds_left: int = 0
 	cycles_completed: int = 0
 	completed_sessions: int = 0
+	phase_started: float = 0.0  # Wall-clock time the running phase began or resumed, 0 when stopped
 	
 	def __post_init__(self):
 		"""Validate state data"""
@@ -107,6 +116,8 @@ class PomodoroState:
 			raise ValueError("Cycles completed must be a non-negative integer")
 		if not isinstance(self.completed_sessions, int) or self.completed_sessions < 0:
 			raise ValueError("Completed sessions must be a non-negative integer")
+		if isinstance(self.phase_started, bool) or not isinstance(self.phase_started, (int, float)) or self.phase_started < 0:
+			raise ValueError("Phase start must be a non-negative timestamp")
 	
 	def is_active(self) -> bool:
 		"""Check if timer is currently active"""
@@ -120,12 +131,18 @@ class PomodoroState:
 
 
 class PomodoroEngine:
-	"""Enhanced tick-driven Pomodoro logic engine with inheritance, encapsulation, and comprehensive exception handling.
+	"""Enhanced clock-driven Pomodoro logic engine with inheritance, encapsulation, and comprehensive exception handling.
 
-	External orchestrator calls tick() every second and can persist state.
+	The running timer is stored as (phase, the moment it began on a monotonic
+	clock) and the current state is computed whenever it is read, so nothing
+	has to be called every second and a suspended laptop catches up on the
+	next read. advance(n) jumps across any number of work/break phases in
+	closed form. State is saved only when the phase changes or the caller
+	starts, pauses, resets or advances the timer.
 	"""
 
-	def __init__(self, storage, storage_name: str = "pomodoro.json"):
+	def __init__(self, storage, storage_name: str = "pomodoro.json",
+			clock: Callable[[], float] = time.monotonic, wall_clock: Callable[[], float] = time.time):
 		"""Initialize Pomodoro Engine with proper validation"""
 		try:
 			if not storage:
@@ -135,6 +152,8 @@ class PomodoroEngine:
 			
 			self._storage = storage  # Private attribute for encapsulation
 			self._storage_name = storage_name.strip()  # Private attribute
+			self._clock = clock  # Private attribute: monotonic seconds that drive the running phase
+			self._wall_clock = wall_clock  # Private attribute: only used to save when the phase began
 			
 			# Load data with error handling
 			data = self._load_pomodoro_data()
@@ -142,6 +161,11 @@ class PomodoroEngine:
 			# Initialize settings and state with validation
 			self._settings = self._create_settings(data.get("settings", {}))
 			self._state = self._create_state(data.get("state", {}))
+			self._phase_left = self._state.seconds_left  # Private attribute: seconds left when the phase began or resumed
+			self._phase_start: Optional[float] = None  # Private attribute: clock() at that moment, None while stopped
+			if self._state.phase_started and self._state.mode != "Idle":
+				# Still running when last saved: the time since then counts, including time the app was closed
+				self._phase_start = clock() - max(0.0, wall_clock() - self._state.phase_started)
 			
 		except Exception as e:
 			raise RuntimeError(f"Failed to initialize Pomodoro Engine: {e}")
@@ -188,9 +212,11 @@ class PomodoroEngine:
 				'long_break': self._settings.long_break,
 				'cycles_before_long': self._settings.cycles_before_long
 			}
+			state_dict = asdict(self._state)
+			state_dict["seconds_left"] = self._phase_left  # Saved as of the phase start, not the current second
 			data = {
 				"settings": settings_dict,
-				"state": asdict(self._state)
+				"state": state_dict
 			}
 			self._storage.save(self._storage_name, data)
 		except Exception as e:
@@ -203,9 +229,15 @@ class PomodoroEngine:
 	
 	@property
 	def state(self) -> PomodoroState:
-		"""Get pomodoro state"""
+		"""Get pomodoro state as of now"""
+		self._catch_up()
 		return self._state
 	
+	@property
+	def running(self) -> bool:
+		"""Check if the clock is currently counting down (started and not paused)"""
+		return self._phase_start is not None
+	
 	def save(self) -> bool:
 		"""Save current state and settings"""
 		try:
@@ -215,20 +247,29 @@ class PomodoroEngine:
 			raise RuntimeError(f"Failed to save pomodoro data: {e}")
 
 	def start(self) -> bool:
-		"""Start the pomodoro timer with validation"""
+		"""Start the pomodoro timer with validation (resumes a paused work phase)"""
 		try:
+			self._catch_up()
 			if self._state.mode in ("Idle", "Short Break", "Long Break") or self._state.seconds_left <= 0:
 				self._state.mode = "Work"
 				self._state.seconds_left = self._settings.get_work_seconds()
+				self._phase_start = None  # A fresh work phase starts now even if a break was running
+			if self._phase_start is None:
+				self._anchor(self._clock(), self._state.seconds_left)
 			self._save_pomodoro_data()
 			return True
 		except Exception as e:
 			raise RuntimeError(f"Failed to start pomodoro timer: {e}")
 
 	def pause(self) -> bool:
-		"""Pause the pomodoro timer (no-op for core logic)"""
+		"""Pause the pomodoro timer, keeping the seconds left"""
 		try:
-			# No-op for core logic; pausing managed by caller (stop calling tick)
+			if self._phase_start is not None:
+				self._catch_up()
+				self._phase_start = None
+				self._phase_left = self._state.seconds_left
+				self._state.phase_started = 0.0
+				self._save_pomodoro_data()
 			return True
 		except Exception as e:
 			raise RuntimeError(f"Failed to pause pomodoro timer: {e}")
@@ -237,47 +278,128 @@ class PomodoroEngine:
 		"""Reset the pomodoro timer to initial state"""
 		try:
 			self._state = PomodoroState()
+			self._phase_start = None
+			self._phase_left = 0
 			self._save_pomodoro_data()
 			return True
 		except Exception as e:
 			raise RuntimeError(f"Failed to reset pomodoro timer: {e}")
 
-	def _transition(self):
-		"""Private method to handle state transitions with validation"""
+	def _anchor(self, moment: float, seconds_left: int):
+		"""Private method to record that the current phase began or resumed at clock() == moment with seconds_left to go"""
+		self._phase_start = moment
+		self._phase_left = seconds_left
+		self._state.phase_started = self._wall_clock() - (self._clock() - moment)
+
+	def _phase_seconds(self, mode: str) -> int:
+		"""Private method to get the full length of a phase"""
+		if mode == "Work":
+			return self._settings.get_work_seconds()
+		if mode == "Short Break":
+			return self._settings.get_short_break_seconds()
+		return self._settings.get_long_break_seconds()
+
+	def _jump(self, seconds: int) -> Optional[int]:
+		"""Private method to move the state from its phase start forward by seconds in closed form.
+		
+		Returns how many of those seconds passed before the resulting phase
+		began, or None when no phase boundary was crossed.
+		"""
 		try:
-			if self._state.mode == "Work":
-				self._state.completed_sessions += 1
-				self._state.cycles_completed = (self._state.cycles_completed + 1) % self._settings.cycles_before_long
-				if self._state.cycles_completed == 0:
-					self._state.mode = "Long Break"
-					self._state.seconds_left = self._settings.get_long_break_seconds()
+			state = self._state
+			if state.mode == "Idle" or seconds < self._phase_left:
+				if state.mode != "Idle":
+					state.seconds_left = self._phase_left - seconds
+				return None
+			work = self._settings.get_work_seconds()
+			short = self._settings.get_short_break_seconds()
+			cycles = self._settings.cycles_before_long
+			pair = work + short
+			long_start = cycles * work + (cycles - 1) * short  # Offset of the long break within a round
+			per_round = long_start + self._settings.get_long_break_seconds()
+			
+			def works_done(offset: int) -> int:
+				# Work phases finished by this offset, counted from the first work phase of a round
+				rounds, rest = divmod(offset, per_round)
+				return rounds * cycles + (0 if rest < work else min(cycles, (rest - work) // pair + 1))
+			
+			# Offset at which the current phase ends; a work phase ending there is finished too
+			if state.mode == "Work":
+				end = state.cycles_completed * pair + work
+			elif state.mode == "Short Break":
+				end = state.cycles_completed * pair
+			else:
+				end = 0
+			offset = end + seconds - self._phase_left
+			state.completed_sessions += works_done(offset) - works_done(end) + (state.mode == "Work")
+			rest = offset % per_round
+			if rest >= long_start:
+				state.mode, state.cycles_completed, state.seconds_left = "Long Break", 0, per_round - rest
+			else:
+				done, into = divmod(rest, pair)
+				if into < work:
+					state.mode, state.cycles_completed, state.seconds_left = "Work", done, work - into
 				else:
-					self._state.mode = "Short Break"
-					self._state.seconds_left = self._settings.get_short_break_seconds()
-			elif self._state.mode in ("Short Break", "Long Break", "Idle"):
-				self._state.mode = "Work"
-				self._state.seconds_left = self._settings.get_work_seconds()
+					state.mode, state.cycles_completed, state.seconds_left = "Short Break", done + 1, pair - into
+			return seconds - (self._phase_seconds(state.mode) - state.seconds_left)
 		except Exception as e:
 			raise RuntimeError(f"Failed to transition pomodoro state: {e}")
 
-	def tick(self) -> bool:
-		"""Process one second tick with comprehensive error handling"""
+	def _catch_up(self) -> bool:
+		"""Private method to bring a running timer up to the clock; saves and returns True when the phase changed"""
+		if self._phase_start is None:
+			return False
+		elapsed = max(0, int(self._clock() - self._phase_start))
+		began = self._jump(elapsed)
+		if began is None:
+			return False
+		self._anchor(self._phase_start + began, self._phase_seconds(self._state.mode))
+		self._save_pomodoro_data()
+		return True
+
+	def advance(self, n_seconds: int) -> bool:
+		"""Move the timer n_seconds forward (running or paused) as if that time had passed"""
 		try:
-			if self._state.seconds_left <= 0:
-				self._transition()
-			self._state.seconds_left -= 1
-			if self._state.seconds_left < 0:
-				self._state.seconds_left = 0
+			if isinstance(n_seconds, bool) or not isinstance(n_seconds, int) or n_seconds < 0:
+				raise ValueError("Seconds must be a non-negative integer")
+			if self._phase_start is not None:
+				self._phase_start -= n_seconds
+				self._state.phase_started -= n_seconds
+				if self._catch_up():
+					return True  # Already saved at the new phase
+			else:
+				self._jump(n_seconds)
+				self._phase_left = self._state.seconds_left  # Still paused, now at this point
 			self._save_pomodoro_data()
 			return True
+		except ValueError:
+			raise  # Re-raise validation errors
+		except Exception as e:
+			raise RuntimeError(f"Failed to advance pomodoro timer: {e}")
+
+	def tick(self) -> bool:
+		"""Process one second (same as advance(1)); a running timer follows the clock without it"""
+		try:
+			return self.advance(1)
 		except Exception as e:
 			raise RuntimeError(f"Failed to process pomodoro tick: {e}")
 	
+	def seconds_to_next_phase(self) -> Optional[float]:
+		"""Get the seconds until the running phase ends (for scheduling one wake-up), or None when stopped"""
+		try:
+			if self._phase_start is None:
+				return None
+			self._catch_up()
+			return max(0.0, self._phase_start + self._phase_left - self._clock())
+		except Exception as e:
+			raise RuntimeError(f"Failed to get time to next phase: {e}")
+	
 	def get_session_info(self) -> Tuple[str, int, int, int]:
 		"""Get current session information as tuple"""
 		try:
-			minutes, seconds = self._state.get_time_remaining()
-			return (self._state.mode, minutes, seconds, self._state.completed_sessions)
+			state = self.state
+			minutes, seconds = state.get_time_remaining()
+			return (state.mode, minutes, seconds, state.completed_sessions)
 		except Exception as e:
 			raise RuntimeError(f"Failed to get session info: {e}")
 	
@@ -296,9 +418,108 @@ class PomodoroEngine:
 	def is_timer_active(self) -> bool:
 		"""Check if timer is currently active"""
 		try:
-			return self._state.is_active()
+			return self.state.is_active()
 		except Exception as e:
 			raise RuntimeError(f"Failed to check timer status: {e}")
 
 
+class SessionLog:
+	"""Append-only log of finished Pomodoro sessions (completed or abandoned), kept as JSON lines.
+	
+	Each record carries running totals, so statistics come from the newest
+	record and history pages are read backwards from the end of the file:
+	opening the history costs the same after one session or ten thousand.
+	Appends reach the OS immediately; fsync is batched (every
+	SESSION_SYNC_EVERY sessions or SESSION_SYNC_SECONDS) and done by flush().
+	"""
+	
+	def __init__(self, storage, name: str = "pomodoro_sessions.jsonl"):
+		"""Initialize the session log with validation"""
+		try:
+			if not storage:
+				raise ValueError("Storage object is required")
+			if not isinstance(name, str) or not name.strip():
+				raise ValueError("Log name must be a non-empty string")
+			self._storage = storage  # Private attribute for encapsulation
+			self._name = name.strip()  # Private attribute
+			self._totals: Optional[Dict[str, int]] = None  # Private attribute: read from the newest record on first use
+			self._unsynced = 0  # Private attribute: sessions appended since the last fsync
+			self._synced_at = time.monotonic()  # Private attribute
+		except Exception as e:
+			raise RuntimeError(f"Failed to initialize session log: {e}")
+	
+	def totals(self) -> Dict[str, int]:
+		"""Get sessions, completed, work_sessions, work_seconds and break_seconds over the whole log"""
+		try:
+			if self._totals is None:
+				records, _ = self.page(size=1)
+				last = records[0].get("totals", {}) if records else {}
+				self._totals = {key: int(last.get(key, 0)) for key in _SESSION_TOTALS}
+			return dict(self._totals)
+		except Exception as e:
+			raise RuntimeError(f"Failed to read session totals: {e}")
+	
+	def append(self, session: Dict) -> Dict:
+		"""Append a finished session (status, work_time/break_time as (minutes, seconds), completed_work_sessions, ...)"""
+		try:
+			if not isinstance(session, dict):
+				raise ValueError("Session must be a dictionary")
+			status = session.get("status")
+			if not isinstance(status, str) or not status.strip():
+				raise ValueError("Session status must be a non-empty string")
+			work_minutes, work_seconds = session.get("work_time", (0, 0))
+			break_minutes, break_seconds = session.get("break_time", (0, 0))
+			work_sessions = session.get("completed_work_sessions", 0)
+			if not isinstance(work_sessions, int) or work_sessions < 0:
+				raise ValueError("Completed work sessions must be a non-negative integer")
+			
+			totals = self.totals()
+			totals["sessions"] += 1
+			totals["completed"] += status == "Completed"
+			totals["work_sessions"] += work_sessions
+			totals["work_seconds"] += int(work_minutes) * 60 + int(work_seconds)
+			totals["break_seconds"] += int(break_minutes) * 60 + int(break_seconds)
+			record = {**session, "totals": totals}
+			self._storage.append_lines(self._name, (record,))
+			self._totals = totals
+			self._unsynced += 1
+			if self._unsynced >= SESSION_SYNC_EVERY or time.monotonic() - self._synced_at >= SESSION_SYNC_SECONDS:
+				self.flush()
+			return record
+		except ValueError:
+			raise  # Re-raise validation errors
+		except Exception as e:
+			raise RuntimeError(f"Failed to log pomodoro session: {e}")
+	
+	def flush(self) -> None:
+		"""Make every appended session durable (fsync); call before the app closes"""
+		try:
+			if self._unsynced:
+				self._storage.sync(self._name)
+				self._unsynced = 0
+			self._synced_at = time.monotonic()
+		except Exception as e:
+			raise RuntimeError(f"Failed to flush session log: {e}")
+	
+	def page(self, before: Optional[int] = None, size: int = 20) -> Tuple[List[Dict], Optional[int]]:
+		"""Get up to size sessions, newest first, older than the cursor; returns (sessions, cursor for the next page or None)"""
+		try:
+			if not isinstance(size, int) or size <= 0:
+				raise ValueError("Page size must be a positive integer")
+			sessions: List[Dict] = []
+			cursor = None
+			for offset, record in self._storage.iter_lines_reversed(self._name, before):
+				if len(sessions) == size:
+					return sessions, cursor
+				if isinstance(record, dict):
+					sessions.append(record)
+					cursor = offset
+			return sessions, None
+		except ValueError:
+			raise  # Re-raise validation errors
+		except Exception as e:
+			raise RuntimeError(f"Failed to read session log: {e}")
+
+
+
 
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Dict, Iterator, List, Optional
+
+from core.homework_item import HomeworkItem, Priority, Status, STATUSES, parse_due_ordinal, today_ordinal
+
+
+# Position of each status in a per-status counts list
+_STATUS_SLOT = {status: slot for slot, status in enumerate(STATUSES)}
+
+
+# Open-ended views (all / by priority / next up) show recurring occurrences this far ahead, and
+# overdue views show those missed this far back, so their cost does not grow with a series' age
+RECURRENCE_HORIZON_DAYS = 28
+
+# Occurrence status meaning "removed from the series"
+SKIPPED = "Skipped"
+
+
+class RecurrenceRule:
+	"""Compact repeat rule: every N days from the first due date, optionally until a date or N times"""
+	
+	__slots__ = ("every_days", "until", "count", "_until_ordinal")
+	
+	def __init__(self, every_days: int = 7, until: str = "", count: int = 0):
+		if isinstance(every_days, bool) or not isinstance(every_days, int) or every_days < 1:
+			raise ValueError("Repeat interval must be a positive number of days")
+		if isinstance(count, bool) or not isinstance(count, int) or count < 0:
+			raise ValueError("Repeat count must be a non-negative integer (0 = no limit)")
+		until = until.strip() if isinstance(until, str) else ""
+		until_ordinal = parse_due_ordinal(until) if until else None
+		if until and until_ordinal is None:
+			raise ValueError("Repeat end date must be in YYYY-MM-DD format")
+		self.every_days = every_days
+		self.until = until
+		self.count = count
+		self._until_ordinal = until_ordinal
+	
+	@classmethod
+	def from_dict(cls, data: Dict) -> "RecurrenceRule":
+		"""Build a rule from its stored form"""
+		if isinstance(data, cls):
+			return data
+		if not isinstance(data, dict):
+			raise ValueError("Recurrence must be a dictionary")
+		return cls(data.get("every_days", 7), data.get("until", ""), data.get("count", 0))
+	
+	def to_dict(self) -> Dict:
+		"""Convert to dictionary format"""
+		return {"every_days": self.every_days, "until": self.until, "count": self.count}
+	
+	def last_ordinal(self, first: int) -> Optional[int]:
+		"""Get the last occurrence for a series starting at first, or None if open-ended"""
+		last = self._until_ordinal
+		if self.count:
+			by_count = first + (self.count - 1) * self.every_days
+			last = by_count if last is None else min(last, by_count)
+		return last
+	
+	def ordinals(self, first: int, start: int, end: int) -> Iterator[int]:
+		"""Lazily yield occurrence ordinals within [start, end] (O(1) memory)"""
+		last = self.last_ordinal(first)
+		if last is not None:
+			end = min(end, last)
+		if start <= first:
+			ordinal = first
+		else:
+			steps = -(-(start - first) // self.every_days)  # Ceiling division
+			ordinal = first + steps * self.every_days
+		while ordinal <= end:
+			yield ordinal
+			ordinal += self.every_days
+	
+	def count_before(self, first: int, day: int) -> int:
+		"""Count occurrences strictly before a day in O(1)"""
+		last = self.last_ordinal(first)
+		if last is not None:
+			day = min(day, last + 1)
+		if day <= first:
+			return 0
+		return (day - 1 - first) // self.every_days + 1
+	
+	def includes(self, first: int, ordinal: int) -> bool:
+		"""Check whether a day is one of the series' occurrences"""
+		last = self.last_ordinal(first)
+		return ordinal >= first and (ordinal - first) % self.every_days == 0 and (last is None or ordinal <= last)
+
+
+class RecurringHomework(HomeworkItem):
+	"""A repeating homework series; its due date is the first occurrence.
+	
+	Occurrences are never stored: they are generated for the window being
+	viewed. Only occurrences whose status was changed are kept, as a
+	{date ordinal: status} map.
+	"""
+	
+	def __init__(self, subject: str, title: str, due: str = "", status: Status = "Pending", details: str = "", priority: Priority = "Medium", item_id: str = "", recurrence=None, exceptions: Optional[Dict[str, str]] = None):
+		"""Initialize a series with validation"""
+		super().__init__(subject, title, due, status, details, priority, item_id)
+		self.rule = RecurrenceRule.from_dict(recurrence if recurrence is not None else {})
+		self._exceptions: Dict[int, str] = {}  # Private attribute: ordinal -> status
+		for day, day_status in (exceptions or {}).items():
+			ordinal = parse_due_ordinal(day)
+			if ordinal is None or day_status not in STATUSES + (SKIPPED,):
+				raise ValueError(f"Invalid occurrence status for {day}: {day_status}")
+			self._exceptions[ordinal] = day_status
+	
+	def occurrence_id(self, ordinal: int) -> str:
+		"""Get the id of one occurrence: '<series id>@YYYY-MM-DD'"""
+		return f"{self.id}@{date.fromordinal(ordinal).isoformat()}"
+	
+	def status_on(self, ordinal: int) -> str:
+		"""Get the status of the occurrence on a day"""
+		return self._exceptions.get(ordinal, "Pending")
+	
+	def set_status_on(self, ordinal: int, status: str) -> None:
+		"""Set the status of one occurrence ('Pending' clears the stored exception)"""
+		if status not in STATUSES + (SKIPPED,):
+			raise ValueError(f"Invalid status. Valid statuses: {list(STATUSES)}")
+		if not self.rule.includes(self.due_key, ordinal):
+			raise ValueError("Date is not an occurrence of this series")
+		if status == "Pending":
+			self._exceptions.pop(ordinal, None)
+		else:
+			self._exceptions[ordinal] = status
+	
+	def prune_exceptions(self) -> None:
+		"""Forget stored statuses for dates that are no longer occurrences (after a rule change)"""
+		first = self.due_key
+		self._exceptions = {o: s for o, s in self._exceptions.items() if self.rule.includes(first, o)}
+	
+	def overdue_count(self, today: int, since: int = 0) -> int:
+		"""Count unfinished occurrences due within [since, today) (closed form over the rule, minus stored statuses)"""
+		if self._due_ordinal is None or since >= today:
+			return 0
+		done = sum(1 for ordinal, status in self._exceptions.items() if since <= ordinal < today and status in ("Completed", SKIPPED))
+		return self.rule.count_before(self._due_ordinal, today) - self.rule.count_before(self._due_ordinal, since) - done
+	
+	def status_counts(self, end: int, since: int = 0) -> List[int]:
+		"""Count the occurrences due within [since, end] in STATUSES order (closed form over the rule, minus skipped ones)"""
+		counts = [0] * len(STATUSES)
+		if self._due_ordinal is None or since > end:
+			return counts
+		total = self.rule.count_before(self._due_ordinal, end + 1) - self.rule.count_before(self._due_ordinal, since)
+		for ordinal, status in self._exceptions.items():
+			if since <= ordinal <= end:
+				if status == SKIPPED:
+					total -= 1
+				else:
+					counts[_STATUS_SLOT[status]] += 1
+		counts[_STATUS_SLOT["Pending"]] += total - sum(counts)
+		return counts
+	
+	def next_open(self, start: int, end: int) -> Optional[int]:
+		"""Get the first unfinished occurrence within [start, end], or None"""
+		for occurrence in self.occurrences(start, end):
+			if occurrence.status != "Completed":
+				return occurrence.due_ordinal
+		return None
+	
+	def occurrence(self, ordinal: int) -> Optional["HomeworkOccurrence"]:
+		"""Get the occurrence on a day, or None if the series has none (or it was skipped)"""
+		if not self.rule.includes(self.due_key, ordinal) or self._exceptions.get(ordinal) == SKIPPED:
+			return None
+		return HomeworkOccurrence(self, ordinal)
+	
+	def occurrences(self, start: int, end: int) -> Iterator["HomeworkOccurrence"]:
+		"""Lazily generate the occurrences due within [start, end] (date ordinals)"""
+		if self._due_ordinal is None:
+			return
+		for ordinal in self.rule.ordinals(self._due_ordinal, start, end):
+			if self._exceptions.get(ordinal) != SKIPPED:
+				yield HomeworkOccurrence(self, ordinal)
+	
+	def to_dict(self) -> Dict:
+		"""Override parent method to include the rule and changed occurrences"""
+		base_dict = super().to_dict()
+		base_dict.update({
+			"recurrence": self.rule.to_dict(),
+			"exceptions": {date.fromordinal(o).isoformat(): s for o, s in sorted(self._exceptions.items())}
+		})
+		return base_dict
+
+
+class HomeworkOccurrence:
+	"""One generated occurrence of a RecurringHomework, read like a HomeworkItem"""
+	
+	__slots__ = ("series", "due_ordinal")
+	
+	def __init__(self, series: RecurringHomework, ordinal: int):
+		self.series = series
+		self.due_ordinal = ordinal
+	
+	@property
+	def id(self) -> str:
+		"""Get the occurrence id: '<series id>@YYYY-MM-DD'"""
+		return self.series.occurrence_id(self.due_ordinal)
+	
+	@property
+	def subject(self) -> str:
+		"""Get the series subject"""
+		return self.series.subject
+	
+	@property
+	def title(self) -> str:
+		"""Get the series title"""
+		return self.series.title
+	
+	@property
+	def details(self) -> str:
+		"""Get the series details"""
+		return self.series.details
+	
+	@property
+	def priority(self) -> str:
+		"""Get the series priority"""
+		return self.series.priority
+	
+	@property
+	def status(self) -> str:
+		"""Get this occurrence's status"""
+		return self.series.status_on(self.due_ordinal)
+	
+	@property
+	def due(self) -> str:
+		"""Get the due date string (YYYY-MM-DD)"""
+		return date.fromordinal(self.due_ordinal).isoformat()
+	
+	@property
+	def due_key(self) -> int:
+		"""Get a sortable due-date key"""
+		return self.due_ordinal
+	
+	@property
+	def effort_minutes(self) -> int:
+		"""Get the series' effort estimate (each occurrence needs the same work)"""
+		return self.series.effort_minutes
+	
+	def is_valid_date(self) -> bool:
+		"""Occurrence dates are always valid"""
+		return True
+	
+	def is_overdue(self, today: Optional[int] = None) -> bool:
+		"""Check if the occurrence is overdue"""
+		if self.status == "Completed":
+			return False
+		return self.due_ordinal < (today_ordinal() if today is None else today)
+	
+	def get_priority_weight(self) -> int:
+		"""Get priority as numeric weight for sorting"""
+		return self.series.get_priority_weight()
+	
+	def to_dict(self) -> Dict:
+		"""Convert to dictionary format (as a stored item would look)"""
+		return {"title": self.title, "subject": self.subject, "id": self.id, "due": self.due,
+			"status": self.status, "details": self.details, "priority": self.priority}
+	
+	def __eq__(self, other) -> bool:
+		return isinstance(other, HomeworkOccurrence) and other.series is self.series and other.due_ordinal == self.due_ordinal
+	
+	def __hash__(self) -> int:
+		return hash((id(self.series), self.due_ordinal))
+	
+	def __str__(self) -> str:
+		return f"{self.__class__.__name__}: {self.title} ({self.subject}) on {self.due}"
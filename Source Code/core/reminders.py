@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from datetime import datetime, date, time
+from heapq import heapify, heappop, heappush
+from typing import Dict, List, Optional, Tuple
+
+
+# Homework is due at the end of its due day; reminders fire this long before
+DEADLINE_TIME = time(23, 59)
+REMINDER_LEAD_HOURS = 24
+
+
+def deadline_timestamp(ordinal: int) -> float:
+	"""Get the local epoch time a due date (as an ordinal) runs out"""
+	return datetime.combine(date.fromordinal(ordinal), DEADLINE_TIME).timestamp()
+
+
+class ReminderScheduler:
+	"""Min-heap of (fire time, key) reminders with lazy cancellation.
+	
+	A key is an item or series id; rescheduling or cancelling a key just
+	marks its older heap entry stale. The UI only needs next_fire_time() to
+	arm one timer and pop_due() when it goes off, so its cost does not depend
+	on the number of items.
+	"""
+	
+	def __init__(self, lead_hours: float = REMINDER_LEAD_HOURS):
+		if not isinstance(lead_hours, (int, float)) or lead_hours < 0:
+			raise ValueError("Reminder lead time must be a non-negative number of hours")
+		self.lead_seconds = lead_hours * 3600
+		self._heap: List[Tuple[float, int, str, str]] = []  # Private attribute: (fire, counter, key, target id)
+		self._live: Dict[str, int] = {}  # Private attribute: key -> counter of its valid entry
+		self._counter = 0  # Private attribute
+	
+	def __len__(self) -> int:
+		return len(self._live)
+	
+	def schedule(self, key: str, deadline: float, target_id: str = "", now: Optional[float] = None) -> None:
+		"""(Re)schedule the reminder for key; deadlines already past are dropped"""
+		if now is None:
+			now = datetime.now().timestamp()
+		if deadline <= now:
+			self.cancel(key)
+			return
+		self._counter += 1
+		self._live[key] = self._counter
+		heappush(self._heap, (deadline - self.lead_seconds, self._counter, key, target_id or key))
+		if len(self._heap) > 2 * len(self._live) + 64:
+			self._heap = [entry for entry in self._heap if self._live.get(entry[2]) == entry[1]]
+			heapify(self._heap)
+	
+	def cancel(self, key: str) -> None:
+		"""Drop the reminder for key (its heap entry is skipped later)"""
+		self._live.pop(key, None)
+	
+	def clear(self) -> None:
+		"""Drop every reminder"""
+		self._heap, self._live = [], {}
+	
+	def next_fire_time(self) -> Optional[float]:
+		"""Get the epoch time of the earliest pending reminder, or None"""
+		while self._heap and self._live.get(self._heap[0][2]) != self._heap[0][1]:
+			heappop(self._heap)
+		return self._heap[0][0] if self._heap else None
+	
+	def pop_due(self, now: Optional[float] = None) -> List[Tuple[str, str]]:
+		"""Remove and return (key, target id) for every reminder whose time has come"""
+		if now is None:
+			now = datetime.now().timestamp()
+		fired = []
+		while self.next_fire_time() is not None and self._heap[0][0] <= now:
+			_, _, key, target_id = heappop(self._heap)
+			del self._live[key]
+			fired.append((key, target_id))
+		return fired
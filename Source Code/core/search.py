@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from heapq import nlargest
+from typing import Dict, List, Optional, Tuple
+import re
+
+from core.homework_item import HomeworkItem
+
+
+_TOKEN = re.compile(r"[0-9a-z]+")
+
+# Relevance weight of a token by the field it appears in
+SEARCH_FIELD_WEIGHTS: Tuple[Tuple[str, int], ...] = (("title", 3), ("subject", 2), ("details", 1))
+
+
+def tokenize(text: str) -> List[str]:
+	"""Split text into lowercase alphanumeric search tokens"""
+	return _TOKEN.findall(text.lower()) if isinstance(text, str) else []
+
+
+class HomeworkSearchIndex:
+	"""Inverted index over homework title, subject and details.
+	
+	Each token maps to {item id: weight}, weights summed from the fields it
+	occurs in (title 3, subject 2, details 1). Distinct tokens are also kept
+	sorted so every query word can match as a prefix via bisect, which makes
+	search-as-you-type work on partial words. All query words must match;
+	results are ranked by total weight, exact word matches counting double.
+	Items added with deferred=True (a bulk load) are only tokenized when the
+	first search needs them.
+	"""
+	
+	def __init__(self):
+		self._postings: Dict[str, Dict[str, int]] = {}  # Private attribute for encapsulation
+		self._tokens: List[str] = []  # Private attribute: sorted distinct tokens
+		self._terms: Dict[str, Dict[str, int]] = {}  # Private attribute: id -> its token weights
+		self._texts: Dict[str, Tuple[str, str, str]] = {}  # Private attribute: id -> indexed text
+		self._items: Dict[str, HomeworkItem] = {}  # Private attribute
+		self._due: Dict[str, int] = {}  # Private attribute: id -> due key for tie-breaking
+		self._pending: Dict[str, HomeworkItem] = {}  # Private attribute: deferred adds, not yet tokenized
+	
+	def __len__(self) -> int:
+		return len(self._items) + len(self._pending)
+	
+	@staticmethod
+	def _text_of(item: HomeworkItem) -> Tuple[str, str, str]:
+		"""Private method to read the indexed fields of an item"""
+		return (item.title, item.subject, item.details if isinstance(item.details, str) else "")
+	
+	def add(self, item: HomeworkItem, deferred: bool = False) -> None:
+		"""Index an item; bulk loaders pass deferred=True to tokenize it on the first search instead"""
+		if deferred:
+			self._pending[item.id] = item
+		else:
+			self._index(item, keep_sorted=True)
+	
+	def _index(self, item: HomeworkItem, keep_sorted: bool) -> None:
+		"""Private method to tokenize an item into the postings"""
+		text = self._text_of(item)
+		terms: Dict[str, int] = {}
+		for (_, weight), field_text in zip(SEARCH_FIELD_WEIGHTS, text):
+			for token in tokenize(field_text):
+				terms[token] = terms.get(token, 0) + weight
+		for token, weight in terms.items():
+			postings = self._postings.get(token)
+			if postings is None:
+				postings = self._postings[token] = {}
+				if keep_sorted:
+					insort(self._tokens, token)
+				else:
+					self._tokens.append(token)
+			postings[item.id] = weight
+		self._terms[item.id] = terms
+		self._texts[item.id] = text
+		self._items[item.id] = item
+		self._due[item.id] = item.due_key
+	
+	def _flush(self) -> None:
+		"""Private method to tokenize deferred items, sorting the token list once"""
+		if not self._pending:
+			return
+		for item in self._pending.values():
+			self._index(item, keep_sorted=False)
+		self._pending = {}
+		self._tokens.sort()
+	
+	def remove(self, item_id: str) -> None:
+		"""Drop an item from the index"""
+		if self._pending.pop(item_id, None) is not None:
+			return
+		terms = self._terms.pop(item_id, None)
+		if terms is None:
+			return
+		del self._texts[item_id]
+		del self._items[item_id]
+		del self._due[item_id]
+		for token in terms:
+			postings = self._postings[token]
+			del postings[item_id]
+			if not postings:
+				del self._postings[token]
+				position = bisect_left(self._tokens, token)
+				del self._tokens[position]
+	
+	def reindex(self, item: HomeworkItem) -> None:
+		"""Refresh an item after an update; tokens are rebuilt only if its text changed"""
+		if item.id in self._pending:
+			return  # Read when it is tokenized
+		if self._texts.get(item.id) == self._text_of(item):
+			self._due[item.id] = item.due_key
+			return
+		self.remove(item.id)
+		self.add(item)
+	
+	def clear(self) -> None:
+		"""Drop every entry"""
+		self.__init__()
+	
+	def _prefixed(self, word: str) -> List[str]:
+		"""Private method to list the indexed tokens that start with word"""
+		tokens = []
+		position = bisect_left(self._tokens, word)
+		while position < len(self._tokens) and self._tokens[position].startswith(word):
+			tokens.append(self._tokens[position])
+			position += 1
+		return tokens
+	
+	def _matches(self, word: str, tokens: List[str]) -> Dict[str, int]:
+		"""Private method to score every item containing one of a query word's tokens"""
+		if len(tokens) == 1:
+			bonus = 2 if tokens[0] == word else 1
+			return {item_id: weight * bonus for item_id, weight in self._postings[tokens[0]].items()}
+		scores: Dict[str, int] = {}
+		for token in tokens:
+			bonus = 2 if token == word else 1
+			for item_id, weight in self._postings[token].items():
+				scores[item_id] = scores.get(item_id, 0) + weight * bonus
+		return scores
+	
+	def _narrow(self, word: str, tokens: List[str], scores: Dict[str, int]) -> Dict[str, int]:
+		"""Private method to keep candidates containing one of a word's tokens, adding its score"""
+		word_scores: Dict[str, int] = {}
+		for token in tokens:
+			postings = self._postings[token]
+			bonus = 2 if token == word else 1
+			common = scores.keys() & postings.keys() if len(postings) > len(scores) else [i for i in postings if i in scores]
+			for item_id in common:
+				word_scores[item_id] = word_scores.get(item_id, 0) + postings[item_id] * bonus
+		return {item_id: scores[item_id] + word_score for item_id, word_score in word_scores.items()}
+	
+	def search(self, query: str, limit: Optional[int] = 50) -> List[HomeworkItem]:
+		"""Items matching every word of query (as prefixes), best first, earliest due on ties"""
+		words = set(tokenize(query))
+		if not words:
+			return []
+		self._flush()
+		# Start from the word with the fewest postings, then only check its candidates
+		expanded = sorted(
+			((sum(len(self._postings[token]) for token in tokens), word, tokens)
+			 for word in words for tokens in (self._prefixed(word),)),
+		)
+		scores = self._matches(expanded[0][1], expanded[0][2])
+		for _, word, tokens in expanded[1:]:
+			if not scores:
+				break
+			scores = self._narrow(word, tokens, scores)
+		if limit is not None and len(scores) > limit:
+			# Only items scoring at least the limit-th best score can be returned
+			threshold = nlargest(limit, scores.values())[-1] if limit else float("inf")
+			if threshold > min(scores.values()):
+				scores = {item_id: score for item_id, score in scores.items() if score >= threshold}
+		# Two stable sorts with C-level keys: earliest due first, then best score first
+		ranked = sorted(scores, key=self._due.__getitem__)
+		ranked.sort(key=scores.__getitem__, reverse=True)
+		return [self._items[item_id] for item_id in ranked[:limit]]
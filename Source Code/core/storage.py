@@ -1,6 +1,8 @@
+import gzip
+import hashlib
 import json
 import os
-from typing import Any
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 
 
 class JSONStorage:
@@ -8,6 +10,7 @@ class JSONStorage:
 
 	- Uses a base directory
 	- Provides load/save with defaults
+	- Provides append-only JSON-lines files (gzip-compressed when the name ends in .gz)
 	"""
 
 	def __init__(self, base_dir: str):
@@ -27,9 +30,127 @@ class JSONStorage:
 		except Exception:
 			return default
 
-	def save(self, name: str, data: Any) -> None:
+	def load_with_digest(self, name: str, default: Any) -> Tuple[Any, Optional[str]]:
+		"""Load like load() and also return the digest of the bytes read (None when the default is used)"""
 		path = self._path(name)
-		with open(path, "w", encoding="utf-8") as f:
-			json.dump(data, f, ensure_ascii=False, indent=2)
+		if not os.path.exists(path):
+			return default, None
+		try:
+			with open(path, "rb") as f:
+				raw = f.read()
+			return json.loads(raw.decode("utf-8")), hashlib.blake2b(raw, digest_size=16).hexdigest()
+		except Exception:
+			return default, None
+
+	def save(self, name: str, data: Any) -> str:
+		"""Write data as JSON and return the digest of the bytes written"""
+		path = self._path(name)
+		raw = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+		with open(path, "wb") as f:
+			f.write(raw)
+		return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+	def names(self, suffix: str = "") -> Tuple[str, ...]:
+		"""List the files in the base directory ending with suffix, sorted"""
+		return tuple(sorted(name for name in os.listdir(self.base_dir) if name.endswith(suffix)))
+
+	def _open_lines(self, name: str, mode: str):
+		opener = gzip.open if name.endswith(".gz") else open
+		return opener(self._path(name), mode)
+
+	def append_lines(self, name: str, records: Iterable[Any]) -> None:
+		"""Append records as JSON lines without rewriting the file"""
+		with self._open_lines(name, "ab") as f:
+			for record in records:
+				f.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
 
+	def sync(self, name: str) -> None:
+		"""Flush a file's written data to disk (fsync); appends are only handed to the OS until then"""
+		path = self._path(name)
+		if not os.path.exists(path):
+			return
+		with open(path, "rb+") as f:
+			os.fsync(f.fileno())
+
+	def write_lines(self, name: str, records: Iterable[Any]) -> None:
+		"""Replace a JSON-lines file with records (written to a temporary file, then renamed)"""
+		temp_path = self._path(name + ".tmp")
+		opener = gzip.open if name.endswith(".gz") else open
+		with opener(temp_path, "wb") as f:
+			for record in records:
+				f.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+		os.replace(temp_path, self._path(name))
+
+	def iter_lines(self, name: str, start: int = 0, strict: bool = False) -> Iterator[Tuple[int, Any]]:
+		"""Stream (offset, record) pairs from a JSON-lines file, from a previous offset on.
+		
+		Unreadable lines are skipped, or with strict the stream stops at the
+		first one (it may still be being written).
+		"""
+		if not os.path.exists(self._path(name)):
+			return
+		with self._open_lines(name, "rb") as f:
+			f.seek(start)
+			while True:
+				offset = f.tell()
+				line = f.readline()
+				if not line:
+					break
+				try:
+					record = json.loads(line)
+				except ValueError:
+					if strict:
+						return
+					continue
+				yield offset, record
+
+	def iter_lines_reversed(self, name: str, end: Optional[int] = None, chunk_size: int = 65536) -> Iterator[Tuple[int, Any]]:
+		"""Stream (offset, record) pairs newest first, from the end of the file or before a previous offset.
+
+		Reads fixed-size chunks backwards, so the first records cost the same
+		however long the file is. Unreadable lines are skipped.
+		"""
+		path = self._path(name)
+		if not os.path.exists(path):
+			return
+		if name.endswith(".gz"):
+			# A gzip stream cannot be read backwards; collect its offsets first
+			records = [(offset, record) for offset, record in self.iter_lines(name) if end is None or offset < end]
+			yield from reversed(records)
+			return
+		with open(path, "rb") as f:
+			position = f.seek(0, os.SEEK_END) if end is None else end
+			head = b""  # Start of the last chunk's first line, completed by the next chunk
+			while position > 0:
+				step = min(chunk_size, position)
+				position -= step
+				f.seek(position)
+				block = f.read(step) + head
+				lines = block.split(b"\n")
+				head = lines[0]
+				cursor = position + len(block)
+				for line in reversed(lines[1:]):
+					cursor -= len(line)
+					if line.strip():
+						try:
+							yield cursor, json.loads(line)
+						except ValueError:
+							pass
+					cursor -= 1  # The newline before this line
+			if head.strip():
+				try:
+					yield 0, json.loads(head)
+				except ValueError:
+					pass
 
+	def read_lines_at(self, name: str, offsets: Iterable[int]) -> Dict[int, Any]:
+		"""Read the records starting at offsets returned by iter_lines (one pass, in file order)"""
+		records: Dict[int, Any] = {}
+		with self._open_lines(name, "rb") as f:
+			for offset in sorted(set(offsets)):
+				f.seek(offset)
+				try:
+					records[offset] = json.loads(f.readline())
+				except ValueError:
+					continue
+		return records
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from datetime import date
+from heapq import merge
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from core.dependencies import DependencyGraph
+from core.homework_item import HomeworkItem
+
+
+# Study blocks planned per day unless the caller says otherwise (8 x 25 min = 3h20 of focused work)
+STUDY_BLOCKS_PER_DAY = 8
+
+
+class StudyScheduler:
+	"""Earliest-deadline-first plan of pomodoro blocks for unfinished items, kept up to date incrementally.
+	
+	Each item needs ceil(effort / block length) blocks (at least one) and
+	must finish by the last block of its due day. Prerequisites are honoured
+	by tightening deadlines (Blazewicz): a prerequisite must end at least one
+	dependent's worth of blocks before that dependent's deadline, so plain EDF
+	order on the tightened deadlines never runs a dependent first. Items are
+	kept sorted by that order with prefix sums of their blocks; a change
+	re-sorts only the items whose deadline moved and recomputes the sums from
+	the first position that changed. Day k of the plan holds blocks
+	[k * per_day, (k + 1) * per_day).
+	"""
+	
+	def __init__(self, items: Mapping[str, HomeworkItem], graph: DependencyGraph, block_minutes: int = 25, blocks_per_day: int = STUDY_BLOCKS_PER_DAY):
+		"""Initialize over the planner's id -> item mapping and prerequisite graph"""
+		if not isinstance(block_minutes, int) or block_minutes <= 0:
+			raise ValueError("Block length must be a positive number of minutes")
+		if not isinstance(blocks_per_day, int) or blocks_per_day <= 0:
+			raise ValueError("Blocks per day must be a positive integer")
+		self._items = items  # Private attribute: shared with the planner
+		self._graph = graph  # Private attribute: shared with the planner
+		self._block_minutes = block_minutes  # Private attribute
+		self._per_day = blocks_per_day  # Private attribute
+		self.clear()
+	
+	@property
+	def block_minutes(self) -> int:
+		"""Get the length of one study block in minutes"""
+		return self._block_minutes
+	
+	@property
+	def blocks_per_day(self) -> int:
+		"""Get the daily capacity in blocks"""
+		return self._per_day
+	
+	def __len__(self) -> int:
+		self._settle()
+		return len(self._order)
+	
+	def blocks_for(self, item: HomeworkItem) -> int:
+		"""Get the number of blocks an item needs (one when it has no estimate)"""
+		return max(1, -(-item.effort_minutes // self._block_minutes))
+	
+	def clear(self) -> None:
+		"""Forget the plan; the next query rebuilds it from every item"""
+		self._order: List[Tuple[int, int, str]] = []  # Private attribute: sorted (deadline, due key, id)
+		self._key_of: Dict[str, Tuple[int, int, str]] = {}  # Private attribute
+		self._blocks: Dict[str, int] = {}  # Private attribute: id -> blocks needed
+		self._ends = array("q")  # Private attribute: _ends[i] = blocks through _order[i]
+		self._dirty_from = 0  # Private attribute: first position whose prefix sum is stale
+		self._changed: Set[str] = set()  # Private attribute: ids to re-place
+		self._rebuild = True  # Private attribute: re-place everything
+	
+	def update(self, item_id: str) -> None:
+		"""Note that an item (and so its prerequisites) changed; call before and after relinking"""
+		if not self._rebuild:
+			self._changed.add(item_id)
+			self._changed.update(self._graph.requires(item_id))
+	
+	def _deadline(self, item_id: str) -> Optional[int]:
+		"""Private method to get an item's tightened deadline in blocks, or None if it is not planned"""
+		item = self._items.get(item_id)
+		if item is None or item.status == "Completed":
+			return None
+		deadline = (item.due_key + 1) * self._per_day
+		for dependent in self._graph.unlocks(item_id):
+			key = self._key_of.get(dependent)
+			if key is not None and key[0] - self._blocks[dependent] < deadline:
+				deadline = key[0] - self._blocks[dependent]
+		return deadline
+	
+	def _build(self) -> None:
+		"""Private method to place every unfinished item, dependents before their prerequisites"""
+		self.clear()
+		self._rebuild = False
+		planned = [item_id for item_id, item in self._items.items() if item.status != "Completed"]
+		waiting = {item_id: 0 for item_id in planned}
+		for item_id in planned:
+			for prerequisite_id in self._graph.requires(item_id):
+				if prerequisite_id in waiting:
+					waiting[prerequisite_id] += 1
+		stack = [item_id for item_id, count in waiting.items() if not count]
+		while stack:
+			item_id = stack.pop()
+			item = self._items[item_id]
+			self._blocks[item_id] = self.blocks_for(item)
+			self._key_of[item_id] = (self._deadline(item_id), item.due_key, item_id)
+			for prerequisite_id in self._graph.requires(item_id):
+				if prerequisite_id in waiting:
+					waiting[prerequisite_id] -= 1
+					if not waiting[prerequisite_id]:
+						stack.append(prerequisite_id)
+		self._order = sorted(self._key_of.values())
+	
+	def _settle(self) -> None:
+		"""Private method to re-place changed items, then their prerequisites while deadlines keep moving"""
+		if self._rebuild:
+			self._build()
+		work = list(self._changed)
+		self._changed.clear()
+		while work:
+			item_id = work.pop()
+			deadline = self._deadline(item_id)
+			old = self._key_of.get(item_id)
+			if deadline is None:
+				if old is None:
+					continue
+				new, blocks = None, 0
+			else:
+				item = self._items[item_id]
+				new, blocks = (deadline, item.due_key, item_id), self.blocks_for(item)
+				if new == old and blocks == self._blocks[item_id]:
+					continue
+			if old is not None:
+				index = bisect_left(self._order, old)
+				del self._order[index]
+				self._dirty_from = min(self._dirty_from, index)
+				del self._key_of[item_id], self._blocks[item_id]
+			if new is not None:
+				index = bisect_left(self._order, new)
+				self._order.insert(index, new)
+				self._dirty_from = min(self._dirty_from, index)
+				self._key_of[item_id], self._blocks[item_id] = new, blocks
+			work.extend(self._graph.requires(item_id))
+		if self._dirty_from < len(self._order) or len(self._ends) > len(self._order):
+			del self._ends[self._dirty_from:]
+			total = self._ends[-1] if self._ends else 0
+			for key in self._order[self._dirty_from:]:
+				total += self._blocks[key[2]]
+				self._ends.append(total)
+		self._dirty_from = len(self._order)
+	
+	def plan(self, today: int, days: int = 14, extra: Iterable = ()) -> Dict:
+		"""Get the plan from today (an ordinal) as {"days", "late", "blocks"}.
+		
+		days is a tuple of (date, ((item, blocks), ...)) for the next `days`
+		days, late the items that would finish after their due date, in plan
+		order, and blocks the total still to do. extra holds unfinished items
+		that are not in the mapping (recurring occurrences); they have no
+		prerequisites and are merged into the EDF order for this plan only.
+		"""
+		self._settle()
+		per_day = self._per_day
+		stored = ((key, self._items[key[2]], 0, end) for key, end in zip(self._order, self._ends))
+		virtual = sorted(
+			(((item.due_key + 1) * per_day, item.due_key, item.id), item, self.blocks_for(item), 0)
+			for item in extra
+		)
+		late: List[HomeworkItem] = []
+		schedule: List[List[Tuple[HomeworkItem, int]]] = [[] for _ in range(days)]
+		limit = days * per_day
+		start = shift = 0  # shift: extra blocks placed so far, which push stored items back
+		for key, item, blocks, end in merge(stored, virtual, key=lambda entry: entry[0]):
+			if blocks:
+				shift += blocks
+				end = start + blocks
+			else:
+				end += shift
+			if today + (end - 1) // per_day > key[1]:
+				late.append(item)
+			block = start
+			while block < min(end, limit):
+				day = block // per_day
+				taken = min(end, limit, (day + 1) * per_day) - block
+				schedule[day].append((item, taken))
+				block += taken
+			start = end
+		return {
+			"days": tuple((date.fromordinal(today + day).isoformat(), tuple(entries)) for day, entries in enumerate(schedule)),
+			"late": tuple(late),
+			"blocks": start,
+		}
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import uuid
+
+
+# Fields of a homework record that merge independently; the id is the key
+SYNC_FIELDS = ("subject", "title", "due", "status", "details", "priority", "requires", "effort_minutes", "completed_on", "recurrence", "exceptions")
+
+# Pseudo-field holding whether the item exists, so a removal merges like an edit
+ALIVE = "alive"
+
+# Each device appends its changes to "<device id><LOG_SUFFIX>" in the shared directory
+LOG_SUFFIX = ".sync.jsonl"
+
+
+class HomeworkSync:
+	"""Field-level last-writer-wins sync of a HomeworkPlanner through a shared directory.
+	
+	Every field of every item is a register stamped (Lamport clock, device
+	id) and the higher stamp wins, so replicas that have seen the same
+	changes agree whatever order they arrived in. A removal sets the item's
+	alive register to False. Each device appends only its own changes to its
+	log in the shared directory and remembers the offset it has read up to in
+	every other device's log (its version vector), so a sync reads and writes
+	deltas only. Local edits are the ids planner.changed_since() reports
+	since the last sync, compared field by field with the registers; the
+	first sync (and the one after a rejection) compares everything. Registers
+	are kept locally as an append-only journal that is compacted when it has
+	grown to several times the live data.
+	"""
+	
+	def __init__(self, planner, storage, remote, state_name: str = "homework_sync.json", journal_name: str = "homework_sync.jsonl"):
+		"""Initialize sync between a planner (local state in storage) and a shared directory storage"""
+		try:
+			if planner is None or not storage or not remote:
+				raise ValueError("Planner, local storage and remote storage are required")
+			if not isinstance(state_name, str) or not state_name.strip():
+				raise ValueError("State name must be a non-empty string")
+			if not isinstance(journal_name, str) or not journal_name.strip():
+				raise ValueError("Journal name must be a non-empty string")
+			
+			self._planner = planner  # Private attribute for encapsulation
+			self._storage = storage  # Private attribute
+			self._remote = remote  # Private attribute: the shared directory
+			self._state_name = state_name.strip()  # Private attribute
+			self._journal_name = journal_name.strip()  # Private attribute
+			state = storage.load(self._state_name, default={})
+			if not isinstance(state, dict):
+				state = {}
+			self._device: str = state.get("device") or uuid.uuid4().hex[:8]  # Private attribute
+			self._clock: int = int(state.get("clock", 0))  # Private attribute: Lamport clock
+			self._seen: Dict[str, int] = dict(state.get("seen", {}))  # Private attribute: device -> last applied offset
+			self._registers: Dict[str, Dict[str, list]] = {}  # Private attribute: id -> {field: [clock, device, value]}
+			self._journal_lines = 0  # Private attribute
+			for _, entry in storage.iter_lines(self._journal_name):
+				if not isinstance(entry, dict) or not isinstance(entry.get("r"), dict):
+					continue
+				registers = self._registers.setdefault(entry["id"], {})
+				for field, register in entry["r"].items():
+					registers[field] = register
+					self._clock = max(self._clock, register[0])  # The journal may be ahead of the state file
+				self._journal_lines += 1
+			self._synced_revision: Optional[int] = None  # Private attribute: planner revision after the last sync
+		except Exception as e:
+			raise RuntimeError(f"Failed to initialize Homework Sync: {e}")
+	
+	@property
+	def device_id(self) -> str:
+		"""Get this device's id (its log is '<id>.sync.jsonl' in the shared directory)"""
+		return self._device
+	
+	@property
+	def clock(self) -> int:
+		"""Get the Lamport clock"""
+		return self._clock
+	
+	def _save_state(self, dirty: Set[str]) -> None:
+		"""Private method to journal changed registers and save the clock and version vector"""
+		try:
+			if self._journal_lines > 4 * len(self._registers) + 1000:
+				self._storage.write_lines(self._journal_name, ({"id": item_id, "r": registers} for item_id, registers in self._registers.items()))
+				self._journal_lines = len(self._registers)
+			elif dirty:
+				self._storage.append_lines(self._journal_name, ({"id": item_id, "r": self._registers[item_id]} for item_id in dirty))
+				self._journal_lines += len(dirty)
+			self._storage.save(self._state_name, {"device": self._device, "clock": self._clock, "seen": self._seen})
+		except Exception as e:
+			raise RuntimeError(f"Failed to save sync state: {e}")
+	
+	def _local_ids(self) -> Iterator[str]:
+		"""Private method to list the ids that may differ from the registers: changed ones, or all after a full reset"""
+		planner = self._planner
+		if self._synced_revision is not None:
+			return iter(planner.changed_since(self._synced_revision))
+		ids = dict.fromkeys(item.id for item in planner.items)
+		ids.update(dict.fromkeys(series.id for series in planner.series))
+		ids.update(dict.fromkeys(item_id for item_id, registers in self._registers.items() if registers.get(ALIVE, (0, "", False))[2]))
+		return iter(ids)
+	
+	def _collect_local(self, dirty: Set[str]) -> List[Dict]:
+		"""Private method to stamp local edits since the last sync; returns them as log records"""
+		stamp = self._clock + 1  # One tick covers every local change since the last sync
+		device = self._device
+		planner = self._planner
+		deltas: List[Dict] = []
+		for item_id in self._local_ids():
+			if item_id not in planner:
+				registers = self._registers.get(item_id)
+				if registers is None or not registers.get(ALIVE, (0, "", False))[2]:
+					continue  # Never pushed, or its removal already was
+				if item_id in planner.archive:
+					continue  # Archived here, not removed: other devices keep their copy
+				registers[ALIVE] = [stamp, device, False]
+				deltas.append({"id": item_id, "c": stamp, "f": {ALIVE: False}})
+				dirty.add(item_id)
+				continue
+			record = planner.get(item_id).to_dict()
+			if "recurrence" not in record:
+				record.setdefault("requires", [])  # So clearing the last prerequisite is pushed too
+				record.setdefault("effort_minutes", 0)  # Likewise removing an estimate
+				record.setdefault("completed_on", "")  # And reopening a completed item
+			registers = self._registers.get(item_id)
+			if registers is None:
+				registers = self._registers[item_id] = {}
+			changed = {}
+			alive = registers.get(ALIVE)
+			if alive is None or not alive[2]:
+				changed[ALIVE] = True
+			for field in SYNC_FIELDS:
+				if field in record:
+					register = registers.get(field)
+					if register is None or register[2] != record[field]:
+						changed[field] = record[field]
+			if changed:
+				for field, value in changed.items():
+					registers[field] = [stamp, device, value]
+				deltas.append({"id": item_id, "c": stamp, "f": changed})
+				dirty.add(item_id)
+		if deltas:
+			self._clock = stamp
+		return deltas
+	
+	def _merge(self, device: str, record: Dict, changed: Set[str]) -> None:
+		"""Private method to merge one remote log record into the registers"""
+		item_id, clock, fields = record["id"], int(record["c"]), record["f"]
+		self._clock = max(self._clock, clock)
+		registers = self._registers.setdefault(item_id, {})
+		for field, value in fields.items():
+			register = registers.get(field)
+			if register is None or (clock, device) > (register[0], register[1]):
+				registers[field] = [clock, device, value]
+				changed.add(item_id)
+	
+	def _pull(self) -> Tuple[int, Set[str]]:
+		"""Private method to merge new records from every other device's log"""
+		pulled = 0
+		changed: Set[str] = set()
+		for name in self._remote.names(LOG_SUFFIX):
+			device = name[:-len(LOG_SUFFIX)]
+			if device == self._device:
+				continue
+			start = self._seen.get(device)
+			# Stop at an unreadable line rather than step over it: it may be a record still being written
+			for offset, record in self._remote.iter_lines(name, start or 0, strict=True):
+				if offset == start:
+					continue  # Applied by the previous sync
+				try:
+					self._merge(device, record, changed)
+				except (KeyError, TypeError, ValueError, AttributeError):
+					continue  # A damaged record is skipped
+				self._seen[device] = offset
+				pulled += 1
+		return pulled, changed
+	
+	def _apply(self, changed: Set[str]) -> Dict[str, int]:
+		"""Private method to bring the planner in line with the registers of changed items"""
+		records: List[Dict] = []
+		removed: List[str] = []
+		# Apply in (Lamport clock, device, id) order of each item's alive register rather than set order,
+		# so new items land in the same list order on every device
+		ordered = sorted(changed, key=lambda item_id: (*self._registers[item_id].get(ALIVE, (0, ""))[:2], item_id))
+		for item_id in ordered:
+			registers = self._registers[item_id]
+			if registers.get(ALIVE, (0, "", False))[2]:
+				record = {field: registers[field][2] for field in SYNC_FIELDS if field in registers}
+				record["id"] = item_id
+				records.append(record)
+			else:
+				removed.append(item_id)
+		if not records and not removed:
+			return {"updated": 0, "removed": 0, "rejected": 0, "relinked": 0}
+		return self._planner.apply_records(records, removed)
+	
+	def sync(self) -> Dict[str, int]:
+		"""Push local edits, pull and merge other devices' edits, and apply the result to the planner.
+		
+		Returns pushed and pulled record counts plus the planner's updated,
+		removed and rejected counts.
+		"""
+		try:
+			dirty: Set[str] = set()
+			deltas = []
+			if self._planner.revision != self._synced_revision:
+				deltas = self._collect_local(dirty)
+			if deltas:
+				self._remote.append_lines(self._device + LOG_SUFFIX, deltas)
+			pulled, changed = self._pull()
+			dirty |= changed
+			counts = {"pushed": len(deltas), "pulled": pulled}
+			counts.update(self._apply(changed))
+			# After a rejection or a cut link the planner and the registers differ; the next sync pushes the planner's values
+			self._synced_revision = None if counts["rejected"] or counts["relinked"] else self._planner.revision
+			if deltas or pulled:
+				self._save_state(dirty)
+			return counts
+		except Exception as e:
+			raise RuntimeError(f"Failed to sync homework: {e}")
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+
+# Undo steps kept in memory (a batch is one step); older steps are dropped
+UNDO_LIMIT = 100
+
+
+class UndoHistory:
+	"""Undo and redo stacks of steps, each a tuple of inverse operations.
+	
+	The owner records an inverse for every change and closes the step when it
+	saves, so a step covers exactly one save. What an inverse means is up to
+	the owner; this class only files them.
+	"""
+	
+	def __init__(self, limit: int = UNDO_LIMIT):
+		self._undo: deque = deque(maxlen=limit)  # Private attribute: steps of inverse operations
+		self._redo: deque = deque(maxlen=limit)  # Private attribute
+		self._open: List[tuple] = []  # Private attribute: inverses recorded since the last close_step()
+		self._replay_into: Optional[deque] = None  # Private attribute: where replay() files its own inverses
+		self._untracked_depth = 0  # Private attribute: bulk operations are not recorded
+	
+	@property
+	def can_undo(self) -> bool:
+		"""Check whether there is a step to undo"""
+		return bool(self._undo or self._open)
+	
+	@property
+	def can_redo(self) -> bool:
+		"""Check whether there is a step to redo"""
+		return bool(self._redo)
+	
+	def record(self, inverse: tuple) -> None:
+		"""Note how to reverse a change, in the open step"""
+		if not self._untracked_depth:
+			self._open.append(inverse)
+	
+	def mark(self) -> int:
+		"""Get a position in the open step, for discard()"""
+		return len(self._open)
+	
+	def since(self, mark: int) -> Tuple[tuple, ...]:
+		"""Get the inverses recorded since mark, oldest first"""
+		return tuple(self._open[mark:])
+	
+	def discard(self, mark: int) -> None:
+		"""Drop the inverses recorded since mark (their changes were rolled back)"""
+		del self._open[mark:]
+	
+	def close_step(self) -> None:
+		"""File the inverses recorded since the last call as one step"""
+		if not self._open:
+			return
+		step, self._open = tuple(self._open), []
+		if self._replay_into is not None:
+			self._replay_into.append(step)
+		else:
+			self._undo.append(step)
+			self._redo.clear()  # A new change ends the redo chain
+	
+	@contextmanager
+	def untracked(self) -> Iterator[None]:
+		"""Context for bulk operations: nothing is recorded, and the history is cleared on exit"""
+		self._untracked_depth += 1
+		try:
+			yield
+		finally:
+			self._untracked_depth -= 1
+			if not self._untracked_depth:
+				self._undo.clear()
+				self._redo.clear()
+				self._open = []
+	
+	@contextmanager
+	def replay(self, undo: bool = True) -> Iterator[Optional[tuple]]:
+		"""Context yielding the newest undo (or redo) step, or None when there is none.
+		
+		Steps closed inside the block go to the opposite stack; if the block
+		raises, the step is put back.
+		"""
+		source, target = (self._undo, self._redo) if undo else (self._redo, self._undo)
+		if not source:
+			yield None
+			return
+		step = source.pop()
+		self._replay_into = target
+		try:
+			yield step
+		except BaseException:
+			source.append(step)
+			raise
+		finally:
+			self._replay_into = None
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from heapq import heapify, heappop, heappush
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.homework_item import HomeworkItem, today_ordinal
+
+
+# One priority level is worth this many days of due-date slack in the default urgency score
+PRIORITY_DAYS = 7
+
+
+def default_urgency(item: HomeworkItem, today: int) -> float:
+	"""Default urgency score (higher is more urgent): priority weight in weeks minus days left"""
+	return item.get_priority_weight() * PRIORITY_DAYS - (item.due_key - today)
+
+
+class UrgencyQueue:
+	"""Heap of unfinished homework ordered by an urgency score (highest first).
+	
+	score(item, today) must depend only on the item and the day. Changed items
+	are pushed again and their older heap entries are skipped when they reach
+	the top (lazy invalidation), so top(k) and pop_next() cost O(k log n). The
+	heap is rebuilt when the day changes or stale entries outnumber live ones.
+	"""
+	
+	def __init__(self, items: Iterable[HomeworkItem] = (), score: Callable[[HomeworkItem, int], float] = default_urgency):
+		if not callable(score):
+			raise ValueError("Score must be a callable taking (item, today)")
+		self._score = score  # Private attribute for encapsulation
+		self._heap: List[Tuple[float, int, int, str, HomeworkItem]] = []  # Private attribute
+		self._live: Dict[str, int] = {}  # Private attribute: id -> counter of its valid entry
+		self._counter = 0  # Private attribute
+		self._today = today_ordinal()  # Private attribute
+		self.rebuild(items)
+	
+	def __len__(self) -> int:
+		return len(self._live)
+	
+	def __contains__(self, item_id: str) -> bool:
+		return item_id in self._live
+	
+	def _entry(self, item: HomeworkItem) -> Tuple[float, int, int, str, HomeworkItem]:
+		"""Private method to build a heap entry; ties go to the earlier due date"""
+		self._counter += 1
+		self._live[item.id] = self._counter
+		return (-self._score(item, self._today), item.due_key, self._counter, item.id, item)
+	
+	def rebuild(self, items: Iterable[HomeworkItem]) -> None:
+		"""Replace the queue contents with the unfinished items in O(n)"""
+		self._live = {}
+		self._today = today_ordinal()
+		self._heap = [self._entry(item) for item in items if item.status != "Completed"]
+		heapify(self._heap)
+	
+	def update(self, item: HomeworkItem) -> None:
+		"""Queue an added or changed item; completed items leave the queue"""
+		if item.status == "Completed":
+			self.discard(item.id)
+			return
+		heappush(self._heap, self._entry(item))
+		self._compact()
+	
+	def discard(self, item_id: str) -> None:
+		"""Drop an item from the queue (its heap entry becomes stale)"""
+		if self._live.pop(item_id, None) is not None:
+			self._compact()
+	
+	def _live_items(self) -> List[HomeworkItem]:
+		"""Private method to list the items whose heap entry is still valid"""
+		return [entry[4] for entry in self._heap if self._live.get(entry[3]) == entry[2]]
+	
+	def _compact(self) -> None:
+		"""Private method to rebuild once stale entries dominate the heap"""
+		if len(self._heap) > 2 * len(self._live) + 64:
+			self.rebuild(self._live_items())
+	
+	def _refresh_day(self) -> None:
+		"""Private method to rescore everything when the date has changed"""
+		if today_ordinal() != self._today:
+			self.rebuild(self._live_items())
+	
+	def _pop_live(self) -> Optional[Tuple[float, int, int, str, HomeworkItem]]:
+		"""Private method to pop the best valid entry, discarding stale ones on the way"""
+		while self._heap:
+			entry = heappop(self._heap)
+			if self._live.get(entry[3]) == entry[2]:
+				return entry
+		return None
+	
+	def top(self, k: int = 5) -> Tuple[HomeworkItem, ...]:
+		"""Get the k most urgent items without removing them"""
+		if not isinstance(k, int) or k < 0:
+			raise ValueError("k must be a non-negative integer")
+		self._refresh_day()
+		taken = []
+		while len(taken) < k:
+			entry = self._pop_live()
+			if entry is None:
+				break
+			taken.append(entry)
+		for entry in taken:
+			heappush(self._heap, entry)
+		return tuple(entry[4] for entry in taken)
+	
+	def score_of(self, item) -> float:
+		"""Score any item (e.g. one not in the queue) the way the queue ranks its entries"""
+		return self._score(item, self._today)
+	
+	def peek(self) -> Optional[HomeworkItem]:
+		"""Get the most urgent item, or None when the queue is empty"""
+		best = self.top(1)
+		return best[0] if best else None
+	
+	def pop_next(self) -> Optional[HomeworkItem]:
+		"""Remove and return the most urgent item, or None when the queue is empty"""
+		self._refresh_day()
+		entry = self._pop_live()
+		if entry is None:
+			return None
+		del self._live[entry[3]]
+		return entry[4]
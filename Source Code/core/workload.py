@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from array import array
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+from core.homework_item import HomeworkItem
+
+
+class WorkloadCalendar:
+	"""Per-day workload of unfinished homework, stored in arrays indexed by date ordinal.
+	
+	For each day it keeps the number of items due and their priority-weighted
+	load (High 3, Medium 2, Low 1). Updates are O(1) array writes. Range
+	totals come from prefix sums, rebuilt once after a change, so any number
+	of range queries between changes is O(1) each. Days that would stretch
+	the arrays past MAX_SPAN_DAYS (e.g. a typo like 9999-01-01) are kept in
+	a small overflow map instead.
+	"""
+	
+	MAX_SPAN_DAYS = 20 * 366
+	
+	def __init__(self):
+		self._base = 0  # Private attribute: ordinal of slot 0
+		self._counts = array("l")  # Private attribute
+		self._loads = array("l")  # Private attribute
+		self._count_prefix = array("l", [0])  # Private attribute: _count_prefix[i] = sum(_counts[:i])
+		self._load_prefix = array("l", [0])  # Private attribute
+		self._dirty = False  # Private attribute: prefix sums need rebuilding
+		self._contrib: Dict[str, Tuple[int, int]] = {}  # Private attribute: id -> (ordinal, load) counted
+		self._overflow: Dict[int, List[int]] = {}  # Private attribute: ordinal -> [count, load] outside the arrays
+	
+	def __len__(self) -> int:
+		return len(self._contrib)
+	
+	def _ensure(self, ordinal: int) -> Optional[int]:
+		"""Private method to grow the arrays to cover ordinal; returns its slot (None if too far out)"""
+		if self._counts and max(ordinal, self._base + len(self._counts) - 1) - min(ordinal, self._base) >= self.MAX_SPAN_DAYS:
+			return None
+		if not self._counts:
+			self._base = ordinal
+		if ordinal < self._base:
+			pad = max(self._base - ordinal, 32)
+			self._counts[0:0] = array("l", bytes(pad * self._counts.itemsize))
+			self._loads[0:0] = array("l", bytes(pad * self._loads.itemsize))
+			self._base -= pad
+		slot = ordinal - self._base
+		if slot >= len(self._counts):
+			pad = max(slot + 1 - len(self._counts), 32)
+			self._counts.extend(array("l", bytes(pad * self._counts.itemsize)))
+			self._loads.extend(array("l", bytes(pad * self._loads.itemsize)))
+		return slot
+	
+	def _apply(self, ordinal: int, load: int, sign: int) -> None:
+		"""Private method to add or subtract one item on a day"""
+		slot = self._ensure(ordinal)
+		if slot is None:
+			totals = self._overflow.setdefault(ordinal, [0, 0])
+			totals[0] += sign
+			totals[1] += sign * load
+			if not totals[0]:
+				del self._overflow[ordinal]
+			return
+		self._counts[slot] += sign
+		self._loads[slot] += sign * load
+		self._dirty = True
+	
+	def add(self, item: HomeworkItem) -> None:
+		"""Count an item on its due day (completed items and invalid dates are not counted)"""
+		if item.status == "Completed" or item.due_ordinal is None:
+			return
+		load = item.get_priority_weight()
+		self._contrib[item.id] = (item.due_ordinal, load)
+		self._apply(item.due_ordinal, load, 1)
+	
+	def remove(self, item_id: str) -> None:
+		"""Stop counting an item"""
+		counted = self._contrib.pop(item_id, None)
+		if counted is not None:
+			self._apply(counted[0], counted[1], -1)
+	
+	def reindex(self, item: HomeworkItem) -> None:
+		"""Recount an item after its due date, priority or status changed"""
+		self.remove(item.id)
+		self.add(item)
+	
+	def clear(self) -> None:
+		"""Drop every entry"""
+		self.__init__()
+	
+	def _prefix(self) -> None:
+		"""Private method to rebuild the prefix sums after changes"""
+		if self._dirty:
+			self._count_prefix = array("l", [0])
+			self._count_prefix.extend(accumulate(self._counts))
+			self._load_prefix = array("l", [0])
+			self._load_prefix.extend(accumulate(self._loads))
+			self._dirty = False
+	
+	def range_totals(self, first: int, last: int) -> Tuple[int, int]:
+		"""Get (items due, weighted load) within [first, last] (date ordinals) in O(1)"""
+		self._prefix()
+		size = len(self._counts)
+		start = min(max(first - self._base, 0), size)
+		end = min(max(last - self._base + 1, 0), size)
+		count = load = 0
+		if start < end:
+			count = self._count_prefix[end] - self._count_prefix[start]
+			load = self._load_prefix[end] - self._load_prefix[start]
+		for ordinal, (far_count, far_load) in self._overflow.items():
+			if first <= ordinal <= last:
+				count += far_count
+				load += far_load
+		return (count, load)
+	
+	def day(self, ordinal: int) -> Tuple[int, int]:
+		"""Get (items due, weighted load) on one day"""
+		slot = ordinal - self._base
+		if 0 <= slot < len(self._counts):
+			return (self._counts[slot], self._loads[slot])
+		return tuple(self._overflow.get(ordinal, (0, 0)))
+	
+	def daily(self, first: int, last: int) -> List[Tuple[int, int, int]]:
+		"""Get (ordinal, items due, weighted load) for every day in [first, last]"""
+		return [(ordinal, *self.day(ordinal)) for ordinal in range(first, last + 1)]
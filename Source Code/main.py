@@ -43,13 +43,14 @@ def run_gpa_calculator():
 		print("=== GPA Calculator ===")
 		print("Courses:")
 		for idx, c in enumerate(calc.courses):
-			print(f" {idx+1}. {c.name} - {c.credits} credits - {c.grade}")
+			print(f" {idx+1}. {c.name} - {c.credits} credits - {c.grade} (Semester {c.semester})")
 		print("\nMenu:")
 		print(" 1) Add Course")
 		print(" 2) Remove Course")
 		print(" 3) Calculate GPA")
 		print(" 4) Clear Courses")
-		print(" 5) Back to Home")
+		print(" 5) Semester GPA Report")
+		print(" 6) Back to Home")
 		choice = input("Select: ").strip()
 		if choice == "1":
 			try:
@@ -57,15 +58,17 @@ def run_gpa_calculator():
 				credits = float(input("Credits (e.g., 3): ").strip())
 				print("Valid grades:", ", ".join(GRADE_POINTS.keys()))
 				grade = input("Grade (e.g., A-, B+): ").strip().upper()
-				calc.add_course(name, credits, grade)
+				semester_raw = input("Semester (default 1): ").strip()
+				semester = int(semester_raw) if semester_raw else 1
+				calc.add_course(name, credits, grade, semester)
 			except Exception as e:
 				print(f"Error: {e}")
 			pause()
 		elif choice == "2":
 			try:
 				idx = int(input("Index to remove: ").strip()) - 1
-				if 0 <= idx < len(calc.courses):
-					course = calc.courses[idx]
+				if 0 <= idx < calc.get_course_count():
+					course = calc.get_course(idx)
 					print(f"\nCourse to remove: {course.name} ({course.credits} credits, Grade: {course.grade})")
 					confirm = input("Are you sure you want to remove this course? (y/N): ").strip().lower()
 					if confirm == 'y':
@@ -89,8 +92,8 @@ def run_gpa_calculator():
 				pass
 			pause()
 		elif choice == "4":
-			if len(calc.courses) > 0:
-				print(f"\nThis will remove ALL {len(calc.courses)} course(s) from your GPA calculation.")
+			if calc.get_course_count() > 0:
+				print(f"\nThis will remove ALL {calc.get_course_count()} course(s) from your GPA calculation.")
 				confirm = input("Are you sure you want to clear all courses? (y/N): ").strip().lower()
 				if confirm == 'y':
 					calc.clear_courses()
@@ -101,6 +104,21 @@ def run_gpa_calculator():
 				print("No courses to clear.")
 			pause()
 		elif choice == "5":
+			if not calc.semesters:
+				print("No courses added yet.")
+			else:
+				print("\nSemester | GPA  | CGPA")
+				for semester, cgpa in calc.get_cumulative_gpa_trend():
+					print(f" {semester:>7} | {calc.get_semester_gpa(semester)['gpa']:.2f} | {cgpa:.2f}")
+				try:
+					first = int(input("\nRange GPA from semester: ").strip())
+					last = int(input("Range GPA to semester: ").strip())
+					res = calc.get_range_gpa(first, last)
+					print(f"GPA (semesters {first}-{last}): {res['gpa']}  |  Total Credits: {res['total_credits']}")
+				except Exception as e:
+					print(f"Error: {e}")
+			pause()
+		elif choice == "6":
 			break
 		else:
 			print("Invalid option.")
@@ -108,9 +126,25 @@ def run_gpa_calculator():
 
 
 # ---- Homework Planner UI ----
+def select_homework_id(planner: HomeworkPlanner, prompt: str) -> str:
+	"""Map a listed item number (or an item id) to the item's id"""
+	choice = input(prompt).strip()
+	if choice in planner:
+		return choice
+	idx = int(choice) - 1
+	items = planner.items
+	if not 0 <= idx < len(items):
+		raise IndexError("Invalid homework index.")
+	return items[idx].id
+
+
 def run_homework_planner():
 	storage = get_storage()
 	planner = HomeworkPlanner(storage)
+	for position, reason in planner.load_errors:
+		print(f"Skipped saved entry {position + 1}: {reason}")
+	if planner.load_errors:
+		pause()
 	while True:
 		clear_screen()
 		print("=== Homework Planner ===")
@@ -124,7 +158,8 @@ def run_homework_planner():
 		print(" 2) Update Item")
 		print(" 3) Remove Item")
 		print(" 4) Mark Completed")
-		print(" 5) Back to Home")
+		print(" 5) What's Next")
+		print(" 6) Back to Home")
 		choice = input("Select: ").strip()
 		if choice == "1":
 			try:
@@ -138,28 +173,35 @@ def run_homework_planner():
 			pause()
 		elif choice == "2":
 			try:
-				idx = int(input("Index to update: ").strip()) - 1
+				item_id = select_homework_id(planner, "Index to update: ")
 				field = input("Field (subject/title/due/status/details): ").strip()
 				value = input("New value: ").strip()
-				planner.update(idx, **{field: value})
+				planner.update_by_id(item_id, **{field: value})
 			except Exception as e:
 				print(f"Error: {e}")
 			pause()
 		elif choice == "3":
 			try:
-				idx = int(input("Index to remove: ").strip()) - 1
-				planner.remove(idx)
+				item_id = select_homework_id(planner, "Index to remove: ")
+				planner.remove_by_id(item_id)
 			except Exception as e:
 				print(f"Error: {e}")
 			pause()
 		elif choice == "4":
 			try:
-				idx = int(input("Index to mark complete: ").strip()) - 1
-				planner.mark_complete(idx)
+				item_id = select_homework_id(planner, "Index to mark complete: ")
+				planner.mark_complete_by_id(item_id)
 			except Exception as e:
 				print(f"Error: {e}")
 			pause()
 		elif choice == "5":
+			next_tasks = planner.get_next_tasks(5)
+			if not next_tasks:
+				print("Nothing left to do.")
+			for rank, item in enumerate(next_tasks, start=1):
+				print(f" {rank}. [{item.priority}] {item.subject} - {item.title} (Due: {item.due})")
+			pause()
+		elif choice == "6":
 			break
 		else:
 			print("Invalid option.")
@@ -173,34 +215,40 @@ def run_pomodoro_timer():
 	while True:
 		clear_screen()
 		print("=== Pomodoro Timer ===")
-		print(f"Mode: {engine.state.mode} | Seconds Left: {engine.state.seconds_left} | Sessions: {engine.state.completed_sessions}")
+		state = engine.state
+		print(f"Mode: {state.mode} | Seconds Left: {state.seconds_left} | Sessions: {state.completed_sessions} | {'Running' if engine.running else 'Stopped'}")
 		print("\nMenu:")
 		print(" 1) Start/Resume Work")
-		print(" 2) Tick 10 seconds (fast-forward)")
+		print(" 2) Fast-forward 10 seconds")
 		print(" 3) Reset")
-		print(" 4) Live run (1 minute demo)")
-		print(" 5) Back to Home")
+		print(" 4) Live view (1 minute demo)")
+		print(" 5) Pause")
+		print(" 6) Back to Home")
 		choice = input("Select: ").strip()
 		if choice == "1":
 			engine.start()
 		elif choice == "2":
-			for _ in range(10):
-				engine.tick()
+			engine.advance(10)
 		elif choice == "3":
 			engine.reset()
 		elif choice == "4":
-			# Run ticking loop for up to 60 seconds for demo
+			# The engine follows the clock; this loop only redraws
+			if not engine.running:
+				print("Timer is not running. Start it first.")
+				pause()
+				continue
 			print("Running... Ctrl+C to stop early.")
 			try:
 				for _ in range(60):
-					engine.tick()
 					time.sleep(1)
-					print(f"Mode: {engine.state.mode} | Left: {engine.state.seconds_left}", end="\r")
+					print(f"Mode: {engine.state.mode} | Left: {engine.state.seconds_left}   ", end="\r")
 			except KeyboardInterrupt:
 				pass
 			print()
 			pause()
 		elif choice == "5":
+			engine.pause()
+		elif choice == "6":
 			break
 		else:
 			print("Invalid option.")
@@ -17,11 +17,98 @@ import threading
 from utils import COLORS
 from core.storage import JSONStorage
 from core.gpa import GPACalculator, GRADE_POINTS
-from core.homework import HomeworkPlanner
-from core.pomodoro import PomodoroEngine
+from core.catalog import CourseCatalog
+from core.sync import HomeworkSync
+from core.homework import HomeworkPlanner, HomeworkOccurrence, ARCHIVE_AFTER_DAYS, RECURRENCE_HORIZON_DAYS, REMINDER_LEAD_HOURS, STUDY_BLOCKS_PER_DAY, today_ordinal
+from core.pomodoro import PomodoroEngine, SessionLog
 from F_app import FlashcardApp
 from F_ui_components import UIComponents
 
+
+class TreeviewSync:
+    """Keep a ttk.Treeview in step with a list of rows by diffing, not rebuilding.
+
+    sync() deletes rows that disappeared, inserts new ones, updates only rows
+    whose values or tag changed and reorders with a single set_children call.
+    Tags are configured once up front. Only the first `window` rows are
+    materialized; further chunks are inserted as the view scrolls near the end.
+    If number_column is given, that first column shows each row's position; it
+    is filled in here and rewritten alone for rows that moved, so the rest of
+    a row is only compared against its own previous values.
+    """
+
+    def __init__(self, tree, tag_styles, window=300, number_column=None):
+        self.tree = tree
+        self.window = window
+        self.number_column = number_column
+        self._shown = {}  # iid -> (values, tag) as currently displayed, without the number
+        self._numbers = {}  # iid -> position shown in number_column
+        self._order = []  # displayed iids, top to bottom
+        self._pending = []  # rows not materialized yet
+        for tag, style in tag_styles.items():
+            tree.tag_configure(tag, **style)
+        tree.configure(yscrollcommand=self._on_yscroll)
+
+    def __len__(self):
+        return len(self._order) + len(self._pending)
+
+    def sync(self, rows):
+        """Show rows, a sequence of (iid, values, tag) tuples, in order"""
+        rows = list(rows)
+        limit = min(len(rows), max(self.window, len(self._order)))
+        visible, self._pending = rows[:limit], rows[limit:]
+
+        keep = {iid for iid, _, _ in visible}
+        gone = [iid for iid in self._order if iid not in keep]
+        if gone:
+            self.tree.delete(*gone)
+            for iid in gone:
+                del self._shown[iid]
+                self._numbers.pop(iid, None)
+
+        # After the deletes and appends below the tree holds the surviving rows
+        # in their old order followed by the new rows
+        current = [iid for iid in self._order if iid in keep]
+        for position, (iid, values, tag) in enumerate(visible, 1):
+            values = tuple(values)
+            shown = self._shown.get(iid)
+            if shown is None:
+                self.tree.insert("", tk.END, iid=iid, values=self._row_values(values, position), tags=(tag,))
+                current.append(iid)
+            elif shown != (values, tag):
+                self.tree.item(iid, values=self._row_values(values, position), tags=(tag,))
+            elif self.number_column and self._numbers.get(iid) != position:
+                self.tree.set(iid, self.number_column, position)
+            self._shown[iid] = (values, tag)
+            if self.number_column:
+                self._numbers[iid] = position
+
+        order = [iid for iid, _, _ in visible]
+        if current != order:
+            self.tree.set_children("", *order)
+        self._order = order
+
+    def _materialize_more(self):
+        """Private method to insert the next chunk of rows below the visible ones"""
+        chunk, self._pending = self._pending[:self.window], self._pending[self.window:]
+        for iid, values, tag in chunk:
+            values = tuple(values)
+            position = len(self._order) + 1
+            self.tree.insert("", tk.END, iid=iid, values=self._row_values(values, position), tags=(tag,))
+            self._shown[iid] = (values, tag)
+            if self.number_column:
+                self._numbers[iid] = position
+            self._order.append(iid)
+
+    def _row_values(self, values, position):
+        """Private method to prepend the row's position when there is a number column"""
+        return (position,) + values if self.number_column else values
+
+    def _on_yscroll(self, first, last):
+        """Load another chunk once the view is scrolled near the last materialized row"""
+        if self._pending and float(last) > 0.9:
+            self.tree.after_idle(self._materialize_more)
+
 def open_flashcards(root):
     try:
         # Create a new Toplevel window for flashcards instead of destroying main window
@@ -56,6 +143,7 @@ def open_flashcards(root):
 def open_gpa_gui(root):
     storage = JSONStorage(os.path.join(os.path.dirname(__file__), "data"))
     calc = GPACalculator(storage)
+    catalog = CourseCatalog(storage)
 
     w = tk.Toplevel(root)
     w.title("📊 GPA Calculator")
@@ -76,8 +164,8 @@ def open_gpa_gui(root):
             w.geometry(f"{w.winfo_screenwidth()}x{w.winfo_screenheight()}+0+0")
     w.update()  # Force update to apply the state
 
-    # Semester setup variables
-    semester_setup = {"total_credits": 0, "is_setup": False}
+    # Semester setup is persisted, so the setup dialog is only needed the first time
+    semester_setup = calc.semester_setup
 
     # Enhanced semester setup dialog - popup style
     def semester_setup_dialog():
@@ -283,8 +371,8 @@ def open_gpa_gui(root):
         
         current_info = tk.Label(current_frame, 
                               text=f"Total Credit Hours: {semester_setup['total_credits']}\n"
-                                   f"Current Courses: {len(calc.courses)} courses\n"
-                                   f"Current Credits: {sum(c.credits for c in calc.courses)}",
+                                   f"Current Courses: {calc.get_course_count()} courses\n"
+                                   f"Current Credits: {calc.get_total_credits()}",
                               font=("Arial", 12), fg="#333333", bg="white")
         current_info.pack(pady=(0, 15))
 
@@ -309,7 +397,7 @@ def open_gpa_gui(root):
         def update_warning():
             try:
                 new_total = int(credits_e.get())
-                current_credits = sum(c.credits for c in calc.courses)
+                current_credits = calc.get_total_credits()
                 if current_credits > new_total:
                     warning_label.config(text=f"⚠️ Warning: You have {current_credits} credits but setting total to {new_total}")
                 else:
@@ -331,7 +419,7 @@ def open_gpa_gui(root):
                     messagebox.showerror("Error", "Credit hours cannot exceed 23")
                     return
                 
-                current_credits = sum(c.credits for c in calc.courses)
+                current_credits = calc.get_total_credits()
                 if current_credits > new_total:
                     messagebox.showerror("Cannot Reduce Credits", 
                         f"❌ Cannot set total to {new_total} credits.\n\n"
@@ -375,14 +463,13 @@ def open_gpa_gui(root):
         dlg.wait_window()
         return result
 
-    # Show semester setup dialog first
-    setup_result = semester_setup_dialog()
-    if not setup_result["ok"]:
-        w.destroy()
-        return
-    
-    semester_setup["total_credits"] = setup_result["total_credits"]
-    semester_setup["is_setup"] = True
+    # Show semester setup dialog first (unless a saved setup exists)
+    if not semester_setup["is_setup"]:
+        setup_result = semester_setup_dialog()
+        if not setup_result["ok"]:
+            w.destroy()
+            return
+        semester_setup.update(calc.save_semester_setup(setup_result["total_credits"]))
 
     # Beautiful header with better visibility
     header_frame = tk.Frame(w, bg=COLORS["primary"], height=100)
@@ -420,10 +507,10 @@ def open_gpa_gui(root):
     def modify_credits():
         result = modify_credits_dialog()
         if result["ok"]:
-            # Update semester setup
-            semester_setup['total_credits'] = result["new_total"]
+            # Update and persist semester setup
+            semester_setup.update(calc.save_semester_setup(result["new_total"]))
             # Update the display
-            current_credits = sum(c.credits for c in calc.courses)
+            current_credits = calc.get_total_credits()
             semester_info_label.config(
                 text=f"📚 Semester Total: {semester_setup['total_credits']} credit hours | Current: {current_credits} credit hours"
             )
@@ -463,7 +550,7 @@ def open_gpa_gui(root):
             table.insert("", tk.END, iid=str(idx), values=(idx+1, c.name, c.credits, c.grade))
         
         # Update semester info
-        current_credits = sum(course.credits for course in calc.courses)
+        current_credits = calc.get_total_credits()
         semester_info_label.config(text=f"📚 Semester Total: {semester_setup['total_credits']} credit hours | Current: {current_credits} credit hours")
 
     # Dialog for add/edit
@@ -494,10 +581,22 @@ def open_gpa_gui(root):
         name_label = tk.Label(f, text="📖 Course Name", bg=COLORS["background"], 
                              fg=COLORS["text_primary"], font=("Arial", 14, "bold"))
         name_label.pack(anchor=tk.W, pady=(0, 5))
-        name_e = tk.Entry(f, width=50, bg=COLORS["border"], fg=COLORS["text_primary"], 
-                         insertbackground=COLORS["text_primary"], font=("Arial", 11)) 
+        # Editable combobox with type-ahead suggestions from the course catalog
+        name_e = ttk.Combobox(f, width=50, font=("Arial", 11))
         name_e.pack(fill=tk.X, pady=(0, 15))
 
+        def update_name_suggestions(event=None):
+            name_e['values'] = catalog.search(name_e.get())
+
+        def apply_catalog_credits(event=None):
+            catalog_credits = catalog.credits_of(name_e.get())
+            if catalog_credits in (2.0, 3.0, 4.0):
+                credits_var.set(f"{catalog_credits:.1f}")
+
+        name_e.bind('<KeyRelease>', update_name_suggestions)
+        name_e.bind('<<ComboboxSelected>>', apply_catalog_credits)
+        update_name_suggestions()
+
         # Credits restricted to 2.0, 3.0, 4.0
         credits_label = tk.Label(f, text="🎯 Credits", bg=COLORS["background"], 
                                 fg=COLORS["text_primary"], font=("Arial", 14, "bold"))
@@ -534,7 +633,7 @@ def open_gpa_gui(root):
 
         if initial is not None:
             name_e.insert(0, initial["name"]) 
-            credits_var.set(f"{float(initial["credits"]):.1f}")
+            credits_var.set(f"{float(initial['credits']):.1f}")
             grade_var.set(initial["grade"])
 
         # Button frame with VERY STRONG contrast
@@ -569,7 +668,7 @@ def open_gpa_gui(root):
                     return
                 
                 # Check if adding this course would exceed semester total
-                current_credits = sum(course.credits for course in calc.courses)
+                current_credits = calc.get_total_credits()
                 if initial is None:  # Only check for new courses, not edits
                     if current_credits + result["credits"] > semester_setup["total_credits"]:
                         messagebox.showerror("Error", f"Adding this course would exceed your semester total of {semester_setup['total_credits']} credit hours.\nCurrent: {current_credits} + New: {result['credits']} = {current_credits + result['credits']}")
@@ -609,7 +708,7 @@ def open_gpa_gui(root):
 
     def add_course():
         # Check if we've reached the semester credit limit
-        current_credits = sum(course.credits for course in calc.courses)
+        current_credits = calc.get_total_credits()
         if current_credits >= semester_setup["total_credits"]:
             messagebox.showwarning("Credit Limit Reached", 
                                  f"You have reached your semester total of {semester_setup['total_credits']} credit hours.\n"
@@ -631,7 +730,7 @@ def open_gpa_gui(root):
             messagebox.showwarning("Warning", "Please select a course to edit", parent=w)
             return
         idx = int(sel[0])
-        c = calc.courses[idx]
+        c = calc.get_course(idx)
         data = course_dialog({"name": c.name, "credits": c.credits, "grade": c.grade})
         if not data["ok"]:
             return
@@ -649,7 +748,7 @@ def open_gpa_gui(root):
         idx = int(sel[0])
         
         # Get course details for confirmation message
-        course = calc.courses[idx]
+        course = calc.get_course(idx)
         course_info = f"{course.name} ({course.credits} credits, Grade: {course.grade})"
         
         # Show confirmation dialog
@@ -671,7 +770,7 @@ def open_gpa_gui(root):
         # Show confirmation dialog
         result = messagebox.askyesno(
             "Confirm Clear All", 
-            f"Are you sure you want to remove ALL courses?\n\nThis will delete {len(calc.courses)} course(s) and cannot be undone.",
+            f"Are you sure you want to remove ALL courses?\n\nThis will delete {calc.get_course_count()} course(s) and cannot be undone.",
             icon='warning',
             parent=w
         )
@@ -1018,48 +1117,11 @@ def open_gpa_gui(root):
 
 def open_homework_gui(root):
     storage = JSONStorage(os.path.join(os.path.dirname(__file__), "data"))
-    planner = HomeworkPlanner(storage)
-
-    # Subject categories database
-    SUBJECTS_DATABASE = {
-        "Programming Subjects": [
-            "AMCS1013 - PROGRAMMING FUNDAMENTALS (3 credits)",
-            "AMCS1034 - SOFTWARE DEVELOPMENT FUNDAMENTALS (4 credits)",
-            "AMCS1043 - DATA STRUCTURES AND ALGORITHMS (3 credits)",
-            "AMCS1054 - OBJECT-ORIENTED PROGRAMMING (4 credits)",
-            "AMCS1084 - SOFTWARE ENGINEERING (4 credits)",
-            "AMCS1093 - ARTIFICIAL INTELLIGENCE (3 credits)",
-            "AMCS1103 - MACHINE LEARNING (3 credits)",
-            "AMCS1114 - MOBILE APPLICATION DEVELOPMENT (4 credits)",
-            "AMCS1123 - WEB DEVELOPMENT (3 credits)",
-            "AMCS1133 - CLOUD COMPUTING (3 credits)",
-            "AMCS1143 - CYBERSECURITY FUNDAMENTALS (3 credits)",
-            "AMCS1153 - HUMAN-COMPUTER INTERACTION (3 credits)",
-            "AMCS1163 - SOFTWARE TESTING (3 credits)",
-            "AMIT2014 - WEB AND MOBILE SYSTEMS (4 credits)"
-        ],
-        "Mathematics Subjects": [
-            "AMAT1013 - CALCULUS I (3 credits)",
-            "AMAT1023 - CALCULUS II (3 credits)",
-            "AMAT1033 - LINEAR ALGEBRA (3 credits)",
-            "AMAT1043 - PROBABILITY AND STATISTICS (3 credits)",
-            "AMAT1053 - DIFFERENTIAL EQUATIONS (3 credits)",
-            "AMCS1073 - DISCRETE MATHEMATICS (3 credits)"
-        ],
-        "Theory Subjects": [
-            "AMCS1023 - DATABASE SYSTEMS (3 credits)",
-            "AMCS1063 - COMPUTER ARCHITECTURE (3 credits)",
-            "AMCS2093 - OPERATING SYSTEMS (3 credits)",
-            "AMIT2033 - NETWORKING ESSENTIALS (3 credits)",
-            "AMIS1012 - ETHICS IN COMPUTING (2 credits)"
-        ],
-        "General Subjects": [
-            "ECOQ - CO-CURRICULAR (2 credits)",
-            "EGU2 - ELECTIVE COURSE (2 credits)",
-            "MPU-2202 - CIVIC CONSCIOUSNESS AND VOLUNTEERISM",
-            "MPU-2212 - BAHASA KEBANGSAAN A"
-        ]
-    }
+    # Old completed homework moves to the archive, keeping homework.json small
+    planner = HomeworkPlanner(storage, archive_after_days=ARCHIVE_AFTER_DAYS)
+
+    # Subject categories and custom courses (persisted in the course catalog)
+    catalog = CourseCatalog(storage)
 
     w = tk.Toplevel(root)
     w.title("📝 Homework Planner - Year 2 Semester 1")
@@ -1092,21 +1154,18 @@ def open_homework_gui(root):
     stats_frame = tk.Frame(frm, bg=COLORS["border"], relief=tk.RAISED, bd=2)
     stats_frame.pack(fill=tk.X, pady=(0, 15))
     
-    pending_count = sum(1 for item in planner.items if item.status == "Pending")
-    completed_count = sum(1 for item in planner.items if item.status == "Completed")
-    total_count = len(planner.items)
-    
-    # Calculate overdue items
-    from datetime import datetime
-    today = datetime.now().strftime("%Y-%m-%d")
-    overdue_count = sum(1 for item in planner.items if item.status == "Pending" and item.due < today)
-    
-    stats_text = f"📊 Quick Stats: {total_count} total | {pending_count} pending | {completed_count} completed | {overdue_count} overdue"
-    stats_label = tk.Label(stats_frame, text=stats_text, 
+    stats_label = tk.Label(stats_frame, 
                           fg=COLORS["text_primary"], bg=COLORS["border"], 
                           font=("Arial", 14, "bold"))
     stats_label.pack(pady=10)
 
+    def show_stats(stats):
+        # The planner keeps these counters up to date, so no rescan of the items
+        stats_label.config(text=f"📊 Quick Stats: {stats['total']} total | {stats['pending']} pending | "
+                                f"{stats['completed']} completed | {stats['overdue']} overdue")
+
+    unsubscribe_stats = planner.subscribe_stats(show_stats)
+
     # Simple filter buttons with better spacing
     filter_frame = tk.Frame(frm, bg=COLORS["background"])
     filter_frame.pack(fill=tk.X, pady=(0, 8))
@@ -1142,6 +1201,39 @@ def open_homework_gui(root):
                            command=lambda: apply_filter("overdue"), cursor="hand2", height=1, width=10)
     overdue_btn.pack(side=tk.LEFT, padx=(0, 5))
 
+    next_btn = tk.Button(filter_frame, text="🎯 Next Up", 
+                        font=("Arial", 11, "bold"), fg="white", 
+                        bg=COLORS["primary"], relief=tk.RAISED, bd=2,
+                        command=lambda: apply_filter("next"), cursor="hand2", height=1, width=10)
+    next_btn.pack(side=tk.LEFT, padx=(0, 5))
+
+    study_btn = tk.Button(filter_frame, text="📚 Study Order", 
+                         font=("Arial", 11, "bold"), fg="white", 
+                         bg=COLORS["accent"], relief=tk.RAISED, bd=2,
+                         command=lambda: apply_filter("study"), cursor="hand2", height=1, width=13)
+    study_btn.pack(side=tk.LEFT, padx=(0, 5))
+
+    # Search-as-you-type over title, subject and details (planner's inverted index)
+    search_var = tk.StringVar()
+    search_entry = ttk.Entry(filter_frame, textvariable=search_var, font=("Arial", 11), width=30)
+    search_entry.pack(side=tk.RIGHT)
+    search_label = tk.Label(filter_frame, text="🔍 Search:", font=("Arial", 11, "bold"),
+                           fg=COLORS["text_primary"], bg=COLORS["background"])
+    search_label.pack(side=tk.RIGHT, padx=(10, 5))
+    pending_search = {"after_id": None}
+
+    def on_search_typed(event=None):
+        # Debounce keystrokes so fast typing runs one query, not one per key
+        if pending_search["after_id"] is not None:
+            w.after_cancel(pending_search["after_id"])
+        pending_search["after_id"] = w.after(150, run_search)
+
+    def run_search():
+        pending_search["after_id"] = None
+        refresh()
+
+    search_entry.bind("<KeyRelease>", on_search_typed)
+
     # Status color guide
     guide_frame = tk.Frame(frm, bg=COLORS["background"])
     guide_frame.pack(fill=tk.X, pady=(5, 10))
@@ -1198,61 +1290,105 @@ def open_homework_gui(root):
     tree.bind("<Motion>", show_tooltip)
     tree.bind("<Leave>", hide_tooltip)
 
-    def refresh():
-        for iid in tree.get_children():
-            tree.delete(iid)
-        
-        # Filter items
-        filtered_items = planner.items
+    def current_view():
+        query = search_var.get().strip()
+        if query:
+            # Ranked search results, narrowed by the status filters
+            matches = planner.search(query, limit=1000)
+            if current_filter["value"] == "pending":
+                return [item for item in matches if item.status == "Pending"]
+            if current_filter["value"] == "completed":
+                return [item for item in matches if item.status == "Completed"]
+            if current_filter["value"] == "overdue":
+                today = today_ordinal()
+                return [item for item in matches if item.is_overdue(today)]
+            return matches
+        # Filtered view sorted by priority (High -> Medium -> Low) then by due date,
+        # served from the planner's indexes; row iids are the items' stable ids
         if current_filter["value"] == "pending":
-            filtered_items = [item for item in planner.items if item.status == "Pending"]
-        elif current_filter["value"] == "completed":
-            filtered_items = [item for item in planner.items if item.status == "Completed"]
-        elif current_filter["value"] == "overdue":
-            from datetime import datetime
-            today = datetime.now().strftime("%Y-%m-%d")
-            filtered_items = [item for item in planner.items if item.status == "Pending" and item.due < today]
-
-        # Sort by priority (High -> Medium -> Low) then by due date
-        priority_order = {"High": 0, "Medium": 1, "Low": 2}
-        filtered_items = list(filtered_items)
-        filtered_items.sort(key=lambda x: (priority_order.get(getattr(x, 'priority', 'Medium'), 1), getattr(x, 'due', None) or "9999-12-31"))
-
-        for idx, item in enumerate(filtered_items):
-            # Use colored text for priority display
-            if item.priority == "High":
-                priority_display = "● HIGH"
-            elif item.priority == "Medium":
-                priority_display = "● MED"
-            else:  # Low
-                priority_display = "● LOW"
+            return planner.get_priority_sorted("Pending")
+        if current_filter["value"] == "completed":
+            return planner.get_priority_sorted("Completed")
+        if current_filter["value"] == "overdue":
+            return planner.get_priority_sorted(overdue_only=True)
+        if current_filter["value"] == "next":
+            # The ten most urgent unfinished items from the planner's urgency heap
+            return planner.get_next_tasks(10)
+        if current_filter["value"] == "study":
+            # Unfinished items with prerequisites first, most pressing deadline chains first
+            return planner.get_study_order()
+        return planner.get_priority_sorted()
+
+    # Row colors are configured once; refresh() only diffs the rows (TreeviewSync numbers the ID column)
+    rows_view = TreeviewSync(tree, {
+        "completed": {"foreground": "green", "background": "#f0f8f0"},
+        "overdue": {"foreground": "red", "background": "#fff0f0"},
+        "pending": {"foreground": "orange", "background": "#fff8f0"},
+        "in_progress": {"foreground": "blue", "background": "#f0f0ff"},
+    }, number_column="id")
+    priority_labels = {"High": "● HIGH", "Medium": "● MED", "Low": "● LOW"}
+
+    def refresh():
+        filtered_items = current_view()
+        today = today_ordinal()  # Once per refresh, not per row
+
+        rows = []
+        for item in filtered_items:
+            # Apply color styling based on status
+            if item.status == "Completed":
+                tag = "completed"
+            elif item.status == "Pending" and item.is_overdue(today):
+                tag = "overdue"
+            elif item.status == "Pending":
+                tag = "pending"
+            else:  # In Progress or other status
+                tag = "in_progress"
             
-            status_icon = "✅" if item.status == "Completed" else "⏳"
-            tree.insert("", tk.END, iid=str(idx), values=(
-                idx + 1,
+            status_icon = "✅" if item.status == "Completed" else "🔒" if planner.is_blocked(item.id) else "⏳"
+            rows.append((item.id, (
                 item.subject[:80] + "..." if len(item.subject) > 80 else item.subject,
                 item.title[:60] + "..." if len(item.title) > 60 else item.title,
                 item.due,
-                priority_display,
+                priority_labels.get(item.priority, "● LOW"),
                 f"{status_icon} {item.status}"
-            ))
-            
-            # Apply color styling based on status
-            from datetime import datetime
-            today = datetime.now().strftime("%Y-%m-%d")
-            
-            if item.status == "Completed":
-                tree.tag_configure("completed", foreground="green", background="#f0f8f0")
-                tree.item(str(idx), tags=("completed",))
-            elif item.status == "Pending" and item.due and item.due < today:
-                tree.tag_configure("overdue", foreground="red", background="#fff0f0")
-                tree.item(str(idx), tags=("overdue",))
-            elif item.status == "Pending":
-                tree.tag_configure("pending", foreground="orange", background="#fff8f0")
-                tree.item(str(idx), tags=("pending",))
-            else:  # In Progress or other status
-                tree.tag_configure("in_progress", foreground="blue", background="#f0f0ff")
-                tree.item(str(idx), tags=("in_progress",))
+            ), tag))
+
+        rows_view.sync(rows)
+        planner.roll_day()  # Overdue count after midnight
+        arm_reminders()
+
+    # Deadline reminders: one after() handle, always re-armed to the planner's next reminder
+    reminder_timer = {"handle": None}
+
+    def arm_reminders():
+        if reminder_timer["handle"] is not None:
+            w.after_cancel(reminder_timer["handle"])
+            reminder_timer["handle"] = None
+        next_time = planner.next_reminder_time()
+        if next_time is None:
+            return
+        delay_ms = int(max(0.0, next_time - time.time()) * 1000)
+        # Capped so a suspended laptop or clock change is noticed within a few hours
+        reminder_timer["handle"] = w.after(min(delay_ms, 6 * 3600 * 1000), fire_reminders)
+
+    def fire_reminders():
+        reminder_timer["handle"] = None
+        planner.roll_day()
+        due_soon = planner.due_reminders()
+        if due_soon:
+            lines = "\n".join(f"• {item.title} ({item.subject[:40]}) - due {item.due}" for item in due_soon)
+            messagebox.showinfo("⏰ Homework Reminder", f"Due within {REMINDER_LEAD_HOURS} hours:\n\n{lines}", parent=w)
+        arm_reminders()
+
+    def on_window_destroy(event):
+        if event.widget is not w:
+            return
+        unsubscribe_stats()
+        if reminder_timer["handle"] is not None:
+            w.after_cancel(reminder_timer["handle"])
+            reminder_timer["handle"] = None
+
+    w.bind("<Destroy>", on_window_destroy, add="+")
 
     # Add homework dialog - improved version
     def homework_dialog(initial=None):
@@ -1283,7 +1419,7 @@ def open_homework_gui(root):
                                  fg=COLORS["text_primary"], font=("Arial", 12, "bold"))
         category_label.pack(anchor=tk.W, pady=(0, 5))
         category_var = tk.StringVar(value="Programming Subjects")
-        category_cb = ttk.Combobox(f, textvariable=category_var, values=list(SUBJECTS_DATABASE.keys()), 
+        category_cb = ttk.Combobox(f, textvariable=category_var, values=list(catalog.categories), 
                                   state="readonly", font=("Arial", 11))
         category_cb.pack(fill=tk.X, pady=(0, 15))
 
@@ -1297,8 +1433,22 @@ def open_homework_gui(root):
         subject_frame.pack(fill=tk.X, pady=(0, 15))
         
         subject_var = tk.StringVar()
-        subject_cb = ttk.Combobox(subject_frame, textvariable=subject_var, state="readonly", font=("Arial", 11))
+        subject_cb = ttk.Combobox(subject_frame, textvariable=subject_var, font=("Arial", 11))
         subject_cb.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+
+        # Typing searches every category; picking a match switches to its category
+        def search_subjects(event):
+            if event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+                return
+            subject_cb['values'] = catalog.search(subject_var.get())
+
+        def on_subject_selected(event=None):
+            category = catalog.category_of(subject_var.get())
+            if category and category != category_var.get():
+                category_var.set(category)
+
+        subject_cb.bind('<KeyRelease>', search_subjects)
+        subject_cb.bind('<<ComboboxSelected>>', on_subject_selected)
         
         # Add custom course button
         add_course_btn = tk.Button(subject_frame, text="➕ Add Custom", 
@@ -1366,16 +1516,21 @@ def open_homework_gui(root):
                 
                 # Add to the current category
                 current_category = category_var.get()
-                if current_category in SUBJECTS_DATABASE:
-                    # Check if course already exists in this category
-                    if course_name in SUBJECTS_DATABASE[current_category]:
+                if current_category in catalog.categories:
+                    # Check if course already exists in the catalog
+                    existing_category = catalog.category_of(course_name)
+                    if existing_category:
                         messagebox.showwarning("Duplicate Course", 
-                            f"Course '{course_name}' already exists in {current_category}.\n\n"
+                            f"Course '{course_name}' already exists in {existing_category}.\n\n"
                             f"Please choose a different name or select the existing course from the dropdown.",
                             parent=custom_dlg)
                         return
                     
-                    SUBJECTS_DATABASE[current_category].append(course_name)
+                    try:
+                        catalog.add_course(current_category, course_name)
+                    except Exception as e:
+                        messagebox.showerror("Error", str(e), parent=custom_dlg)
+                        return
                     # Update the combobox
                     update_subjects()
                     # Set the new course as selected
@@ -1406,7 +1561,7 @@ def open_homework_gui(root):
         add_course_btn.config(command=add_custom_course)
 
         def update_subjects():
-            subjects = SUBJECTS_DATABASE.get(category_var.get(), [])
+            subjects = catalog.courses_in(category_var.get())
             subject_cb['values'] = subjects
             if subjects:
                 subject_var.set(subjects[0])
@@ -1457,23 +1612,52 @@ def open_homework_gui(root):
                                   state="readonly", font=("Arial", 11))
         priority_cb.pack(fill=tk.X, pady=(0, 15))
 
+        # Effort estimate used by the study plan (one pomodoro block when left empty)
+        effort_label = tk.Label(f, text="⏱ Effort (minutes, optional)", bg=COLORS["background"], 
+                               fg=COLORS["text_primary"], font=("Arial", 12, "bold"))
+        effort_label.pack(anchor=tk.W, pady=(0, 5))
+        effort_var = tk.StringVar()
+        effort_e = tk.Entry(f, textvariable=effort_var, bg=COLORS["border"], fg=COLORS["text_primary"], 
+                           insertbackground=COLORS["text_primary"], font=("Arial", 11))
+        effort_e.pack(fill=tk.X, pady=(0, 15))
+
+        # Repeat (new items only): occurrences are generated, not stored one by one
+        repeat_options = {"Does not repeat": 0, "Daily": 1, "Weekly": 7, "Every 2 weeks": 14}
+        repeat_var = tk.StringVar(value="Does not repeat")
+        until_var = tk.StringVar()
+        if initial is None:
+            repeat_label = tk.Label(f, text="🔁 Repeat (until YYYY-MM-DD, optional)", bg=COLORS["background"], 
+                                   fg=COLORS["text_primary"], font=("Arial", 12, "bold"))
+            repeat_label.pack(anchor=tk.W, pady=(0, 5))
+            repeat_frame = tk.Frame(f, bg=COLORS["background"])
+            repeat_frame.pack(fill=tk.X, pady=(0, 15))
+            repeat_cb = ttk.Combobox(repeat_frame, textvariable=repeat_var, values=list(repeat_options), 
+                                    state="readonly", font=("Arial", 11))
+            repeat_cb.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+            until_e = tk.Entry(repeat_frame, textvariable=until_var, width=14, bg=COLORS["border"], 
+                              fg=COLORS["text_primary"], insertbackground=COLORS["text_primary"], font=("Arial", 11))
+            until_e.pack(side=tk.RIGHT)
+
         if initial:
             title_e.insert(0, initial.get("title", ""))
             desc_e.insert("1.0", initial.get("description", ""))
             deadline_e.insert(0, initial.get("due", ""))
             priority_var.set(initial.get("priority", "Medium"))
+            if initial.get("effort_minutes"):
+                effort_var.set(str(initial["effort_minutes"]))
             # Find and set subject
-            for category, subjects in SUBJECTS_DATABASE.items():
-                if initial.get("subject") in subjects:
-                    category_var.set(category)
-                    subject_var.set(initial.get("subject"))
-                    break
+            category = catalog.category_of(initial.get("subject"))
+            if category:
+                category_var.set(category)
+                update_subjects()
+            subject_var.set(initial.get("subject", ""))
 
         # Button frame with better styling
         btn_frame = tk.Frame(f, bg=COLORS["background"], relief=tk.RAISED, bd=2)
         btn_frame.pack(pady=(20, 0), padx=10)
 
-        result = {"ok": False, "subject": "", "title": "", "description": "", "deadline": "", "priority": "Medium"}
+        result = {"ok": False, "subject": "", "title": "", "description": "", "deadline": "", "priority": "Medium",
+                  "every_days": 0, "until": "", "effort_minutes": 0}
 
         def ok():
             try:
@@ -1482,6 +1666,13 @@ def open_homework_gui(root):
                 result["description"] = desc_e.get("1.0", tk.END).strip()
                 result["deadline"] = deadline_e.get().strip()
                 result["priority"] = priority_var.get().strip()
+                result["every_days"] = repeat_options.get(repeat_var.get(), 0)
+                result["until"] = until_var.get().strip()
+                effort = effort_var.get().strip()
+                if effort and (not effort.isdigit() or int(effort) > 24 * 60 * 30):
+                    messagebox.showerror("Error", "Effort must be a whole number of minutes", parent=dlg)
+                    return
+                result["effort_minutes"] = int(effort or 0)
                 
                 # Validate required fields
                 if not result["subject"] or not result["subject"].strip():
@@ -1548,12 +1739,13 @@ def open_homework_gui(root):
         if not data["ok"]:
             return
         try:
-            planner.add(data["subject"], data["title"], data["deadline"], data["description"], data["priority"])
+            if data["every_days"]:
+                planner.add_recurring(data["subject"], data["title"], data["deadline"], every_days=data["every_days"],
+                                      until=data["until"], details=data["description"], priority=data["priority"])
+            else:
+                planner.add(data["subject"], data["title"], data["deadline"], data["description"], data["priority"],
+                            effort_minutes=data["effort_minutes"])
             refresh()
-            # Update stats
-            pending_count = sum(1 for item in planner.items if item.status == "Pending")
-            completed_count = sum(1 for item in planner.items if item.status == "Completed")
-            stats_label.config(text=f"📊 Quick Stats: {pending_count} pending, {completed_count} completed")
         except Exception as e:
             messagebox.showerror("Error", str(e), parent=w)
 
@@ -1569,22 +1761,23 @@ def open_homework_gui(root):
         if not sel:
             messagebox.showwarning("Warning", "Please select a homework item to edit", parent=w)
             return
-        idx = int(sel[0])
-        filtered_items = [item for item in planner.items if current_filter["value"] == "all" or 
-                         (current_filter["value"] == "pending" and item.status == "Pending") or
-                         (current_filter["value"] == "completed" and item.status == "Completed") or
-                         (current_filter["value"] == "overdue" and item.status == "Pending" and item.due < datetime.now().strftime("%Y-%m-%d"))]
-        if idx >= len(filtered_items):
+        if sel[0] not in planner:
             return
-        item = filtered_items[idx]
+        item = planner.get(sel[0])
+        recurring = isinstance(item, HomeworkOccurrence)
+        if recurring:
+            item = item.series  # Editing a repeating item edits its whole series
         data = homework_dialog({"subject": item.subject, "title": item.title, "due": item.due, 
-                               "description": getattr(item, 'details', ''), "priority": getattr(item, 'priority', 'Medium')})
+                               "description": getattr(item, 'details', ''), "priority": getattr(item, 'priority', 'Medium'),
+                               "effort_minutes": getattr(item, 'effort_minutes', 0)})
         if not data["ok"]:
             return
         try:
-            # Find original index
-            orig_idx = planner.items.index(item)
-            planner.update(orig_idx, subject=data["subject"], title=data["title"], due=data["deadline"], details=data["description"], priority=data["priority"])
+            fields = {"subject": data["subject"], "title": data["title"], "due": data["deadline"],
+                      "details": data["description"], "priority": data["priority"]}
+            if not recurring:
+                fields["effort_minutes"] = data["effort_minutes"]
+            planner.update_by_id(item.id, **fields)
             refresh()
         except Exception as e:
             messagebox.showerror("Error", str(e), parent=w)
@@ -1600,25 +1793,18 @@ def open_homework_gui(root):
         if not sel:
             messagebox.showwarning("Warning", "Please select a homework item", parent=w)
             return
-        idx = int(sel[0])
-        filtered_items = [item for item in planner.items if current_filter["value"] == "all" or 
-                         (current_filter["value"] == "pending" and item.status == "Pending") or
-                         (current_filter["value"] == "completed" and item.status == "Completed") or
-                         (current_filter["value"] == "overdue" and item.status == "Pending" and item.due < datetime.now().strftime("%Y-%m-%d"))]
-        if idx >= len(filtered_items):
+        selected = [planner.get(iid) for iid in sel if iid in planner]
+        if not selected:
             return
-        item = filtered_items[idx]
         try:
-            orig_idx = planner.items.index(item)
-            if item.status == "Pending":
-                planner.mark_complete(orig_idx)
-            else:
-                planner.update(orig_idx, status="Pending")
+            # Toggle every selected row with a single save
+            with planner.batch():
+                for item in selected:
+                    if item.status == "Pending":
+                        planner.mark_complete_by_id(item.id)
+                    else:
+                        planner.update_by_id(item.id, status="Pending")
             refresh()
-            # Update stats
-            pending_count = sum(1 for item in planner.items if item.status == "Pending")
-            completed_count = sum(1 for item in planner.items if item.status == "Completed")
-            stats_label.config(text=f"📊 Quick Stats: {pending_count} pending, {completed_count} completed")
         except Exception as e:
             messagebox.showerror("Error", str(e), parent=w)
 
@@ -1633,23 +1819,14 @@ def open_homework_gui(root):
         if not sel:
             messagebox.showwarning("Warning", "Please select a homework item to delete", parent=w)
             return
-        idx = int(sel[0])
-        filtered_items = [item for item in planner.items if current_filter["value"] == "all" or 
-                         (current_filter["value"] == "pending" and item.status == "Pending") or
-                         (current_filter["value"] == "completed" and item.status == "Completed") or
-                         (current_filter["value"] == "overdue" and item.status == "Pending" and item.due < datetime.now().strftime("%Y-%m-%d"))]
-        if idx >= len(filtered_items):
+        selected = [planner.get(iid) for iid in sel if iid in planner]
+        if not selected:
             return
-        item = filtered_items[idx]
-        if messagebox.askyesno("Confirm", f"Delete '{item.title}'?"):
+        prompt = f"Delete '{selected[0].title}'?" if len(selected) == 1 else f"Delete {len(selected)} homework items?"
+        if messagebox.askyesno("Confirm", prompt):
             try:
-                orig_idx = planner.items.index(item)
-                planner.remove(orig_idx)
+                planner.remove_many([item.id for item in selected])
                 refresh()
-                # Update stats
-                pending_count = sum(1 for item in planner.items if item.status == "Pending")
-                completed_count = sum(1 for item in planner.items if item.status == "Completed")
-                stats_label.config(text=f"📊 Quick Stats: {pending_count} pending, {completed_count} completed")
             except Exception as e:
                 messagebox.showerror("Error", str(e), parent=w)
 
@@ -1659,6 +1836,378 @@ def open_homework_gui(root):
                           command=delete_homework, cursor="hand2", height=2, width=10)
     delete_btn.pack(side=tk.LEFT, padx=5)
 
+    def undo_change(event=None):
+        try:
+            if not planner.undo():
+                messagebox.showinfo("Undo", "Nothing to undo.", parent=w)
+            refresh()
+        except Exception as e:
+            messagebox.showerror("Error", str(e), parent=w)
+
+    def redo_change(event=None):
+        try:
+            if not planner.redo():
+                messagebox.showinfo("Redo", "Nothing to redo.", parent=w)
+            refresh()
+        except Exception as e:
+            messagebox.showerror("Error", str(e), parent=w)
+
+    undo_btn = tk.Button(controls, text="↩️ Undo", 
+                        font=("Arial", 12, "bold"), fg="white", 
+                        bg=COLORS["secondary"], relief=tk.RAISED, bd=2,
+                        command=undo_change, cursor="hand2", height=2, width=8)
+    undo_btn.pack(side=tk.LEFT, padx=5)
+
+    redo_btn = tk.Button(controls, text="↪️ Redo", 
+                        font=("Arial", 12, "bold"), fg="white", 
+                        bg=COLORS["secondary"], relief=tk.RAISED, bd=2,
+                        command=redo_change, cursor="hand2", height=2, width=8)
+    redo_btn.pack(side=tk.LEFT, padx=5)
+    w.bind("<Control-z>", undo_change)
+    w.bind("<Control-y>", redo_change)
+
+    def edit_prerequisites():
+        """Choose which homework must be finished before the selected one"""
+        sel = tree.selection()
+        if not sel or sel[0] not in planner:
+            messagebox.showwarning("Warning", "Please select a homework item", parent=w)
+            return
+        item = planner.get(sel[0])
+        if isinstance(item, HomeworkOccurrence):
+            messagebox.showwarning("Warning", "Repeating homework cannot have prerequisites", parent=w)
+            return
+        candidates = [i for i in planner.get_priority_sorted() if i.id != item.id and (i.status != "Completed" or i.id in item.requires)]
+
+        pw = tk.Toplevel(w)
+        pw.title("🔗 Prerequisites")
+        pw.configure(bg=COLORS["background"])
+        pw.transient(w)
+        tk.Label(pw, text=f"Finish these before '{item.title}':", font=("Arial", 12, "bold"),
+                 fg=COLORS["text_primary"], bg=COLORS["background"]).pack(anchor=tk.W, padx=15, pady=(15, 5))
+        listbox = tk.Listbox(pw, selectmode=tk.MULTIPLE, font=("Arial", 11), width=70, height=15)
+        listbox.pack(fill=tk.BOTH, expand=True, padx=15, pady=5)
+        for index, candidate in enumerate(candidates):
+            listbox.insert(tk.END, f"{candidate.due}  {candidate.subject} — {candidate.title}")
+            if candidate.id in item.requires:
+                listbox.selection_set(index)
+
+        def save_prerequisites():
+            chosen = [candidates[index].id for index in listbox.curselection()]
+            # Links to archived items are not listed; keep them
+            listed = {candidate.id for candidate in candidates}
+            kept = [p for p in item.requires if p not in listed]
+            try:
+                planner.set_prerequisites(item.id, kept + chosen)
+                pw.destroy()
+                refresh()
+            except Exception as e:
+                messagebox.showerror("Error", str(e), parent=pw)
+
+        tk.Button(pw, text="✅ Save", font=("Arial", 12, "bold"), fg="white",
+                  bg=COLORS["primary"], relief=tk.RAISED, bd=2,
+                  command=save_prerequisites, cursor="hand2").pack(pady=(5, 15))
+
+    prereq_btn = tk.Button(controls, text="🔗 Prerequisites", 
+                          font=("Arial", 12, "bold"), fg="white", 
+                          bg=COLORS["secondary"], relief=tk.RAISED, bd=2,
+                          command=edit_prerequisites, cursor="hand2", height=2, width=15)
+    prereq_btn.pack(side=tk.LEFT, padx=5)
+
+    def show_workload():
+        """Heatmap of weighted homework load per day: 16 weeks, starting 4 weeks back"""
+        hw = tk.Toplevel(w)
+        hw.title("🗓 Workload Heatmap")
+        hw.configure(bg=COLORS["background"])
+        hw.transient(w)
+
+        today = datetime.date.today()
+        start = today - datetime.timedelta(days=today.weekday() + 28)  # Monday, 4 weeks ago
+        weeks = 16
+        end = start + datetime.timedelta(days=weeks * 7 - 1)
+        days = planner.get_daily_workload(start.isoformat(), end.isoformat())
+        peak = max((load for _, _, load in days), default=0) or 1
+
+        cell, pad, left, top = 28, 3, 40, 30
+        canvas = Canvas(hw, width=left + weeks * (cell + pad) + 10, height=top + 8 * (cell + pad) + 10,
+                        bg=COLORS["background"], highlightthickness=0)
+        canvas.pack(padx=15, pady=15)
+        for row, name in enumerate(("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")):
+            canvas.create_text(left - 6, top + row * (cell + pad) + cell // 2, text=name, anchor=tk.E,
+                               font=("Arial", 9), fill=COLORS["text_primary"])
+
+        details = {}
+        for index, (day, count, load) in enumerate(days):
+            column, row = divmod(index, 7)
+            # White (free) to red (heaviest day in view)
+            fade = int(255 * (1 - load / peak))
+            x, y = left + column * (cell + pad), top + row * (cell + pad)
+            rect = canvas.create_rectangle(x, y, x + cell, y + cell, fill=f"#ff{fade:02x}{fade:02x}",
+                                           outline="#1565C0" if day == today.isoformat() else COLORS["border"],
+                                           width=2 if day == today.isoformat() else 1)
+            details[rect] = f"{day}: {count} due, load {load}"
+            if row == 0:
+                canvas.create_text(x + cell // 2, top - 10, text=day[5:], font=("Arial", 8), fill=COLORS["text_secondary"])
+
+        # Weekly totals come from the calendar's prefix sums (O(1) per week)
+        for column in range(weeks):
+            first = start + datetime.timedelta(days=column * 7)
+            totals = planner.get_workload(first.isoformat(), (first + datetime.timedelta(days=6)).isoformat())
+            x = left + column * (cell + pad) + cell // 2
+            canvas.create_text(x, top + 7 * (cell + pad) + cell // 2, text=str(totals["load"]),
+                               font=("Arial", 9, "bold"), fill=COLORS["text_primary"])
+
+        info = tk.Label(hw, text="Hover a day for details · bottom row: weekly load (High=3, Medium=2, Low=1)",
+                        font=("Arial", 10), fg=COLORS["text_primary"], bg=COLORS["background"])
+        info.pack(pady=(0, 10))
+
+        def on_hover(event):
+            found = canvas.find_overlapping(event.x, event.y, event.x, event.y)
+            text = next((details[item] for item in found if item in details), None)
+            if text:
+                info.config(text=text)
+
+        canvas.bind("<Motion>", on_hover)
+
+    workload_btn = tk.Button(controls, text="🗓 Workload", 
+                            font=("Arial", 12, "bold"), fg="white", 
+                            bg=COLORS["accent"], relief=tk.RAISED, bd=2,
+                            command=show_workload, cursor="hand2", height=2, width=12)
+    workload_btn.pack(side=tk.LEFT, padx=5)
+
+    def show_study_plan():
+        """Pomodoro blocks for unfinished homework, day by day, earliest deadline first"""
+        try:
+            block_minutes = PomodoroEngine(storage).settings.work_minutes
+        except Exception:
+            block_minutes = 25
+        sw = tk.Toplevel(w)
+        sw.title("📅 Study Plan")
+        sw.configure(bg=COLORS["background"])
+        sw.transient(w)
+
+        top = tk.Frame(sw, bg=COLORS["background"])
+        top.pack(fill=tk.X, padx=15, pady=(15, 5))
+        tk.Label(top, text=f"🍅 {block_minutes}-minute blocks per day:", font=("Arial", 12, "bold"),
+                 fg=COLORS["text_primary"], bg=COLORS["background"]).pack(side=tk.LEFT)
+        capacity_var = tk.StringVar(value=str(STUDY_BLOCKS_PER_DAY))
+        info_label = tk.Label(sw, font=("Arial", 10), fg=COLORS["text_secondary"], bg=COLORS["background"])
+        info_label.pack(anchor=tk.W, padx=15)
+
+        plan_cols = ("Day", "Homework", "Blocks", "Due")
+        plan_tree = ttk.Treeview(sw, columns=plan_cols, show="headings", height=18)
+        for col, width in zip(plan_cols, (110, 380, 70, 100)):
+            plan_tree.heading(col, text=col)
+            plan_tree.column(col, width=width, anchor=tk.W if col == "Homework" else tk.CENTER)
+        plan_tree.pack(fill=tk.BOTH, expand=True, padx=15, pady=5)
+        late_label = tk.Label(sw, font=("Arial", 11, "bold"), fg="red", bg=COLORS["background"],
+                              justify=tk.LEFT, wraplength=640)
+        late_label.pack(anchor=tk.W, padx=15, pady=(0, 15))
+
+        def render():
+            try:
+                per_day = int(capacity_var.get())
+                plan = planner.plan_study(block_minutes, per_day, days=14)
+            except (ValueError, RuntimeError):
+                return
+            plan_tree.delete(*plan_tree.get_children())
+            for day, entries in plan["days"]:
+                if not entries:
+                    plan_tree.insert("", tk.END, values=(day, "— free —", "", ""))
+                for index, (item, blocks) in enumerate(entries):
+                    plan_tree.insert("", tk.END, values=(day if index == 0 else "", f"{item.subject[:30]} — {item.title}",
+                                                         blocks, item.due))
+            info_label.config(text=f"{plan['blocks']} block(s) to go · items without an estimate and "
+                                   f"recurring homework due in the next 14 days count as one block each")
+            late = plan["late"]
+            if late:
+                names = ", ".join(f"'{item.title}' ({item.due})" for item in late[:5])
+                more = f" and {len(late) - 5} more" if len(late) > 5 else ""
+                late_label.config(text=f"⚠️ Cannot be finished in time: {names}{more}")
+            else:
+                late_label.config(text="✅ Everything fits before its deadline")
+
+        capacity_spin = tk.Spinbox(top, from_=1, to=24, width=4, textvariable=capacity_var,
+                                   font=("Arial", 12), command=render)
+        capacity_spin.pack(side=tk.LEFT, padx=5)
+        capacity_spin.bind("<Return>", lambda event: render())
+        render()
+
+    plan_btn = tk.Button(controls, text="📅 Study Plan", 
+                        font=("Arial", 12, "bold"), fg="white", 
+                        bg=COLORS["secondary"], relief=tk.RAISED, bd=2,
+                        command=show_study_plan, cursor="hand2", height=2, width=12)
+    plan_btn.pack(side=tk.LEFT, padx=5)
+
+    def show_courses():
+        """Per-subject totals from the planner's rollups"""
+        try:
+            rollups = planner.get_subject_rollups()
+        except RuntimeError as e:
+            messagebox.showerror("Error", str(e), parent=w)
+            return
+        cw = tk.Toplevel(w)
+        cw.title("📚 Courses")
+        cw.configure(bg=COLORS["background"])
+        cw.transient(w)
+
+        course_cols = ("Subject", "Total", "Pending", "In Progress", "Completed", "Overdue", "Next Due")
+        course_tree = ttk.Treeview(cw, columns=course_cols, show="headings", height=14)
+        for col, width in zip(course_cols, (280, 60, 70, 90, 90, 70, 100)):
+            course_tree.heading(col, text=col)
+            course_tree.column(col, width=width, anchor=tk.W if col == "Subject" else tk.CENTER)
+        course_tree.pack(fill=tk.BOTH, expand=True, padx=15, pady=(15, 5))
+        for rollup in sorted(rollups, key=lambda r: (-r["overdue"], r["next_due"] or "9999", r["subject"])):
+            course_tree.insert("", tk.END, values=(rollup["subject"], rollup["total"], rollup["pending"],
+                                                   rollup["in_progress"], rollup["completed"],
+                                                   rollup["overdue"] or "", rollup["next_due"] or "—"))
+        if not rollups:
+            course_tree.insert("", tk.END, values=("No homework yet", "", "", "", "", "", ""))
+        tk.Label(cw, text=f"Recurring homework counts the occurrences within {RECURRENCE_HORIZON_DAYS} days of today",
+                 font=("Arial", 10), fg=COLORS["text_secondary"], bg=COLORS["background"]).pack(anchor=tk.W, padx=15, pady=(0, 15))
+
+    courses_btn = tk.Button(controls, text="📚 Courses",
+                           font=("Arial", 12, "bold"), fg="white",
+                           bg=COLORS["accent"], relief=tk.RAISED, bd=2,
+                           command=show_courses, cursor="hand2", height=2, width=12)
+    courses_btn.pack(side=tk.LEFT, padx=5)
+
+    def import_calendar():
+        try:
+            import tkinter.filedialog as fd
+            filenames = fd.askopenfilenames(
+                filetypes=[("iCalendar files", "*.ics"), ("All files", "*.*")],
+                title="Import Deadlines (.ics)", parent=w
+            )
+            if not filenames:
+                return
+            totals = {"added": 0, "duplicates": 0, "skipped": 0}
+            for filename in filenames:
+                # The file is streamed line by line, so large feeds stay small in memory
+                with open(filename, "r", encoding="utf-8", errors="replace") as f:
+                    for key, value in planner.import_ics(f).items():
+                        totals[key] += value
+            refresh()
+            messagebox.showinfo("Import Complete", f"✅ {totals['added']} added\n"
+                                                   f"🔁 {totals['duplicates']} already in your planner\n"
+                                                   f"⏭️ {totals['skipped']} skipped (no date or invalid)", parent=w)
+        except Exception as e:
+            messagebox.showerror("Import Error", f"Failed to import calendar:\n{str(e)}", parent=w)
+
+    def export_calendar():
+        try:
+            import tkinter.filedialog as fd
+            filename = fd.asksaveasfilename(
+                defaultextension=".ics",
+                filetypes=[("iCalendar files", "*.ics"), ("All files", "*.*")],
+                title="Export Homework (.ics)", parent=w
+            )
+            if filename:
+                with open(filename, "w", encoding="utf-8", newline="") as f:
+                    f.writelines(planner.export_ics())
+                messagebox.showinfo("Success", f"✅ Homework exported to:\n{filename}", parent=w)
+        except Exception as e:
+            messagebox.showerror("Export Error", f"Failed to export homework:\n{str(e)}", parent=w)
+
+    import_btn = tk.Button(controls, text="📥 Import .ics", 
+                          font=("Arial", 12, "bold"), fg="white", 
+                          bg=COLORS["primary"], relief=tk.RAISED, bd=2,
+                          command=import_calendar, cursor="hand2", height=2, width=12)
+    import_btn.pack(side=tk.LEFT, padx=5)
+
+    export_btn = tk.Button(controls, text="📤 Export .ics", 
+                          font=("Arial", 12, "bold"), fg="white", 
+                          bg=COLORS["primary"], relief=tk.RAISED, bd=2,
+                          command=export_calendar, cursor="hand2", height=2, width=12)
+    export_btn.pack(side=tk.LEFT, padx=5)
+
+    def show_archive():
+        """Search archived homework and restore selected items"""
+        aw = tk.Toplevel(w)
+        aw.title("🗄 Homework Archive")
+        aw.configure(bg=COLORS["background"])
+        aw.transient(w)
+
+        query_var = tk.StringVar()
+        top = tk.Frame(aw, bg=COLORS["background"])
+        top.pack(fill=tk.X, padx=15, pady=(15, 5))
+        tk.Label(top, text="🔍", font=("Arial", 12), bg=COLORS["background"]).pack(side=tk.LEFT)
+        query_entry = tk.Entry(top, textvariable=query_var, font=("Arial", 12), width=40)
+        query_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        count_label = tk.Label(aw, font=("Arial", 10), fg=COLORS["text_secondary"], bg=COLORS["background"])
+        count_label.pack(anchor=tk.W, padx=15)
+
+        archive_cols = ("Subject", "Title", "Due", "Priority")
+        archive_tree = ttk.Treeview(aw, columns=archive_cols, show="headings", height=15)
+        for col, width in zip(archive_cols, (220, 260, 100, 80)):
+            archive_tree.heading(col, text=col)
+            archive_tree.column(col, width=width)
+        archive_tree.pack(fill=tk.BOTH, expand=True, padx=15, pady=5)
+
+        def run_query(event=None):
+            # The archive index is built on the first query, not when the planner opens
+            results = planner.search_archive(query_var.get(), limit=200)
+            archive_tree.delete(*archive_tree.get_children())
+            for item in results:
+                archive_tree.insert("", tk.END, iid=item.id, values=(item.subject, item.title, item.due, item.priority))
+            count_label.config(text=f"{len(planner.archive)} archived · showing {len(results)} (newest first)")
+
+        def restore_selected():
+            selected = archive_tree.selection()
+            if not selected:
+                messagebox.showwarning("Warning", "Please select homework to restore.", parent=aw)
+                return
+            try:
+                restored = planner.restore_archived(selected)
+                refresh()
+                run_query()
+                messagebox.showinfo("Restored", f"✅ {len(restored)} item(s) moved back to your planner", parent=aw)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to restore homework:\n{str(e)}", parent=aw)
+
+        query_entry.bind("<Return>", run_query)
+        restore_btn = tk.Button(aw, text="♻️ Restore Selected",
+                               font=("Arial", 12, "bold"), fg="white",
+                               bg=COLORS["primary"], relief=tk.RAISED, bd=2,
+                               command=restore_selected, cursor="hand2")
+        restore_btn.pack(pady=(5, 15))
+        run_query()
+        query_entry.focus_set()
+
+    archive_btn = tk.Button(controls, text="🗄 Archive", 
+                           font=("Arial", 12, "bold"), fg="white", 
+                           bg=COLORS["accent"], relief=tk.RAISED, bd=2,
+                           command=show_archive, cursor="hand2", height=2, width=12)
+    archive_btn.pack(side=tk.LEFT, padx=5)
+
+    sync_state = {"engine": None, "folder": None}
+
+    def sync_homework():
+        """Merge edits with other devices through a shared folder (USB stick, cloud drive, network share)"""
+        try:
+            if sync_state["engine"] is None:
+                import tkinter.filedialog as fd
+                folder = fd.askdirectory(title="Choose the shared sync folder", parent=w)
+                if not folder:
+                    return
+                sync_state["folder"] = folder
+                sync_state["engine"] = HomeworkSync(planner, storage, JSONStorage(folder))
+            counts = sync_state["engine"].sync()
+            refresh()
+            message = (f"✅ Synced with {sync_state['folder']}\n\n"
+                       f"⬆️ {counts['pushed']} change(s) sent\n⬇️ {counts['pulled']} change(s) received\n"
+                       f"📝 {counts['updated']} updated, 🗑️ {counts['removed']} removed")
+            if counts["rejected"]:
+                message += f"\n⚠️ {counts['rejected']} invalid change(s) ignored"
+            messagebox.showinfo("Sync", message, parent=w)
+        except Exception as e:
+            messagebox.showerror("Sync Error", f"Failed to sync homework:\n{str(e)}", parent=w)
+
+    sync_btn = tk.Button(controls, text="🔄 Sync", 
+                        font=("Arial", 12, "bold"), fg="white", 
+                        bg=COLORS["primary"], relief=tk.RAISED, bd=2,
+                        command=sync_homework, cursor="hand2", height=2, width=10)
+    sync_btn.pack(side=tk.LEFT, padx=5)
+
     # Back to Home button
     def back_to_home():
         w.destroy()
@@ -1671,6 +2220,13 @@ def open_homework_gui(root):
 
     refresh()
 
+    if planner.load_errors:
+        # Entries that failed validation are left out rather than lost silently
+        lines = "\n".join(f"• entry {position + 1}: {reason}" for position, reason in planner.load_errors[:10])
+        more = len(planner.load_errors) - 10
+        messagebox.showwarning("Homework Data", f"{len(planner.load_errors)} saved item(s) could not be loaded:\n\n{lines}"
+                                                + (f"\n… and {more} more" if more > 0 else ""), parent=w)
+
 
 def open_pomodoro_gui(root):
     w = tk.Toplevel(root)
@@ -1718,8 +2274,16 @@ def open_pomodoro_gui(root):
         'date': ''
     }
     
-    # Session history storage
-    session_history = []
+    # Finished sessions (completed or abandoned) are appended to a log that outlives the window
+    session_log = SessionLog(JSONStorage(os.path.join(os.path.dirname(__file__), "data")))
+
+    def log_session(status):
+        session_details['status'] = status
+        session_details['end_time'] = datetime.datetime.now().strftime("%H:%M")
+        try:
+            session_log.append(session_details)
+        except (ValueError, RuntimeError) as e:
+            messagebox.showerror("Error", f"Could not save the session to history:\n{e}", parent=w)
 
     # Timer variables
     timer_running = False
@@ -1867,10 +2431,7 @@ def open_pomodoro_gui(root):
                 w.after(1000, countdown_timer)
             else:
                 # All rounds completed
-                session_details['status'] = "Completed"
-                session_details['end_time'] = datetime.datetime.now().strftime("%H:%M")
-                # Save to history
-                session_history.append(session_details.copy())
+                log_session("Completed")
                 status_label.config(text=f"🎉 All {session_details['rounds']} rounds completed! Good job!")
                 round_label.config(text="")
                 timer_running = False
@@ -1981,17 +2542,16 @@ def open_pomodoro_gui(root):
         nonlocal timer_running, time_left, current_round, current_mode
         if timer_running:
             timer_running = False
-            # Update session status with interrupt information
-            session_details['status'] = f"User Interrupt at round {current_round} ({datetime.datetime.now().strftime('%H:%M')})"
-            session_details['end_time'] = datetime.datetime.now().strftime("%H:%M")
-            # Save to history
-            session_history.append(session_details.copy())
+            # Save to history with interrupt information
+            log_session(f"User Interrupt at round {current_round} ({datetime.datetime.now().strftime('%H:%M')})")
             status_label.config(text="⏹️ Timer stopped by user")
             round_label.config(text=f"Interrupted at Round {current_round}/{session_details['rounds']}")
             w.bell()  # Beep sound
 
     def reset_timer():
         nonlocal timer_running, time_left, current_round, current_mode
+        if session_details['status'] == 'In Progress':
+            log_session(f"Abandoned at round {current_round} (reset)")
         timer_running = False
         time_left = 0
         current_round = 0
@@ -2003,7 +2563,12 @@ def open_pomodoro_gui(root):
         session_details['completed_work_sessions'] = 0
 
     def show_session_details():
-        if not session_history and not session_details['start_time']:
+        try:
+            totals = session_log.totals()
+        except RuntimeError as e:
+            messagebox.showerror("Error", str(e), parent=w)
+            return
+        if not totals['sessions'] and not session_details['start_time']:
             messagebox.showinfo("Session History", "⚠ No session data available yet.\n\nStart a Pomodoro session to begin tracking your productivity!", parent=w)
             return
         
@@ -2043,24 +2608,21 @@ def open_pomodoro_gui(root):
         history_text.config(state=tk.NORMAL)
         history_text.delete(1.0, tk.END)
         
-        if session_history:
-            history_text.insert(tk.END, "📈 Session History:\n")
-            history_text.insert(tk.END, "=" * 60 + "\n\n")
-            
-            for i, session in enumerate(reversed(session_history), 1):
-                history_text.insert(tk.END, f"Session #{len(session_history) - i + 1}:\n")
-                history_text.insert(tk.END, "-" * 30 + "\n")
-                history_text.insert(tk.END, f"📝 Work Title: {session.get('work_title', 'N/A')}\n")
-                history_text.insert(tk.END, f"📅 Date: {session.get('date', 'N/A')}\n")
-                history_text.insert(tk.END, f"⏰ Start Time: {session['start_time']}\n")
-                history_text.insert(tk.END, f"⏰ End Time: {session.get('end_time', 'N/A')}\n")
-                history_text.insert(tk.END, f"💼 Work Time: {session['work_time'][0]} min {session['work_time'][1]} sec\n")
-                history_text.insert(tk.END, f"☕ Break Time: {session['break_time'][0]} min {session['break_time'][1]} sec\n")
-                history_text.insert(tk.END, f"🔄 Rounds: {session['rounds']}\n")
-                history_text.insert(tk.END, f"✅ Completed Sessions: {session['completed_work_sessions']}\n")
-                history_text.insert(tk.END, f"📊 Status: {session['status']}\n")
-                history_text.insert(tk.END, "\n")
-        else:
+        # Statistics come from the log's running totals, so no session has to be read for them
+        if totals['sessions']:
+            work_hours, work_minutes = divmod(totals['work_seconds'] // 60, 60)
+            break_hours, break_minutes = divmod(totals['break_seconds'] // 60, 60)
+            history_text.insert(tk.END, "📈 Statistics:\n")
+            history_text.insert(tk.END, "-" * 20 + "\n")
+            history_text.insert(tk.END, f"🎯 Total Sessions: {totals['sessions']}\n")
+            history_text.insert(tk.END, f"✅ Completed Sessions: {totals['completed']}\n")
+            history_text.insert(tk.END, f"📊 Completion Rate: {(totals['completed']/totals['sessions'])*100:.1f}%\n")
+            history_text.insert(tk.END, f"💼 Total Work Sessions: {totals['work_sessions']}\n")
+            history_text.insert(tk.END, f"⏱️ Total Work Time: {work_hours} hours {work_minutes} minutes\n")
+            history_text.insert(tk.END, f"☕ Total Break Time: {break_hours} hours {break_minutes} minutes\n")
+            history_text.insert(tk.END, "\n" + "=" * 60 + "\n")
+        
+        if session_details['status'] == 'In Progress':
             history_text.insert(tk.END, "📊 Current Session:\n")
             history_text.insert(tk.END, "=" * 30 + "\n\n")
             history_text.insert(tk.END, f"📝 Work Title: {session_details.get('work_title', 'N/A')}\n")
@@ -2070,25 +2632,52 @@ def open_pomodoro_gui(root):
             history_text.insert(tk.END, f"☕ Break Time: {session_details['break_time'][0]} min {session_details['break_time'][1]} sec\n")
             history_text.insert(tk.END, f"🔄 Rounds: {session_details['rounds']}\n")
             history_text.insert(tk.END, f"✅ Completed Sessions: {session_details['completed_work_sessions']}\n")
-            history_text.insert(tk.END, f"📊 Status: {session_details['status']}\n")
-        
-        # Add statistics if we have history
-        if session_history:
-            total_sessions = len(session_history)
-            completed_sessions = sum(1 for s in session_history if s['status'] == 'Completed')
-            total_work_sessions = sum(s['completed_work_sessions'] for s in session_history)
-            total_work_time = sum(s['work_time'][0] * 60 + s['work_time'][1] for s in session_history)
-            total_break_time = sum(s['break_time'][0] * 60 + s['break_time'][1] for s in session_history)
-            
-            history_text.insert(tk.END, "\n" + "=" * 60 + "\n")
-            history_text.insert(tk.END, "📈 Statistics:\n")
-            history_text.insert(tk.END, "-" * 20 + "\n")
-            history_text.insert(tk.END, f"🎯 Total Sessions: {total_sessions}\n")
-            history_text.insert(tk.END, f"✅ Completed Sessions: {completed_sessions}\n")
-            history_text.insert(tk.END, f"📊 Completion Rate: {(completed_sessions/total_sessions)*100:.1f}%\n")
-            history_text.insert(tk.END, f"💼 Total Work Sessions: {total_work_sessions}\n")
-            history_text.insert(tk.END, f"⏱️ Total Work Time: {total_work_time//60} hours {total_work_time%60} minutes\n")
-            history_text.insert(tk.END, f"☕ Total Break Time: {total_break_time//60} hours {total_break_time%60} minutes\n")
+            history_text.insert(tk.END, f"📊 Status: {session_details['status']}\n\n")
+        
+        if totals['sessions']:
+            history_text.insert(tk.END, "📈 Session History:\n")
+            history_text.insert(tk.END, "=" * 60 + "\n\n")
+        
+        # Sessions are read from the end of the log one page at a time
+        page_state = {"cursor": None, "number": totals['sessions']}
+        
+        def load_older():
+            try:
+                sessions, page_state["cursor"] = session_log.page(page_state["cursor"], 20)
+            except RuntimeError as e:
+                messagebox.showerror("Error", str(e), parent=history_window)
+                return
+            history_text.config(state=tk.NORMAL)
+            for session in sessions:
+                number = session.get('totals', {}).get('sessions', page_state["number"])
+                page_state["number"] = number - 1
+                work_time = session.get('work_time', (0, 0))
+                break_time = session.get('break_time', (0, 0))
+                history_text.insert(tk.END, f"Session #{number}:\n")
+                history_text.insert(tk.END, "-" * 30 + "\n")
+                history_text.insert(tk.END, f"📝 Work Title: {session.get('work_title', 'N/A')}\n")
+                history_text.insert(tk.END, f"📅 Date: {session.get('date', 'N/A')}\n")
+                history_text.insert(tk.END, f"⏰ Start Time: {session.get('start_time', 'N/A')}\n")
+                history_text.insert(tk.END, f"⏰ End Time: {session.get('end_time', 'N/A')}\n")
+                history_text.insert(tk.END, f"💼 Work Time: {work_time[0]} min {work_time[1]} sec\n")
+                history_text.insert(tk.END, f"☕ Break Time: {break_time[0]} min {break_time[1]} sec\n")
+                history_text.insert(tk.END, f"🔄 Rounds: {session.get('rounds', 'N/A')}\n")
+                history_text.insert(tk.END, f"✅ Completed Sessions: {session.get('completed_work_sessions', 0)}\n")
+                history_text.insert(tk.END, f"📊 Status: {session.get('status', 'N/A')}\n")
+                history_text.insert(tk.END, "\n")
+            history_text.config(state=tk.DISABLED)
+            if page_state["cursor"] is None:
+                older_btn.config(state=tk.DISABLED, text="No older sessions")
+        
+        older_btn = tk.Button(content_frame, text="⬇️ Load Older Sessions",
+                             font=("Arial", 11, "bold"), fg="white",
+                             bg=COLORS["primary"], relief=tk.RAISED, bd=2,
+                             command=load_older, cursor="hand2")
+        older_btn.pack(pady=(10, 0))
+        if totals['sessions']:
+            load_older()
+        else:
+            older_btn.config(state=tk.DISABLED, text="No older sessions")
         
         history_text.config(state=tk.DISABLED)
         
@@ -2140,6 +2729,21 @@ def open_pomodoro_gui(root):
                              command=back_to_home, cursor="hand2", height=2, width=12)
     back_home_btn.pack(side=tk.LEFT, padx=10)
 
+    def on_window_destroy(event):
+        if event.widget is not w:
+            return
+        # A session still running (or paused) when the window closes is logged as abandoned
+        try:
+            if session_details['status'] == 'In Progress':
+                session_details['status'] = f"Abandoned at round {current_round} (window closed)"
+                session_details['end_time'] = datetime.datetime.now().strftime("%H:%M")
+                session_log.append(session_details)
+            session_log.flush()
+        except (ValueError, RuntimeError):
+            pass  # The window is already going away
+
+    w.bind("<Destroy>", on_window_destroy, add="+")
+
     # Initial display
     update_timer_display()
     
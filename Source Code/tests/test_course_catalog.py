@@ -0,0 +1,67 @@
+import re
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.catalog import CourseCatalog, DEFAULT_SUBJECTS
+from core.gpa import GPACalculator
+
+
+def scan_search(courses, prefix, limit):
+	query = prefix.strip().lower()
+	matches = []
+	for course in courses:
+		lowered = course.lower()
+		keys = [lowered[m.start():] for m in re.finditer(r"[0-9A-Za-z]+", lowered)]
+		hits = [key for key in keys if key.startswith(query)]
+		if hits:
+			matches.append((min(hits), course))
+	return tuple(course for _, course in sorted(matches)[:limit])
+
+
+class CourseCatalogTest(unittest.TestCase):
+	"""Prefix search against a scan, and persistence of custom courses"""
+
+	def setUp(self):
+		self.storage = JSONStorage(tempfile.mkdtemp())
+		self.catalog = CourseCatalog(self.storage)
+
+	def all_courses(self):
+		return [course for category in self.catalog.categories for course in self.catalog.courses_in(category)]
+
+	def test_search_matches_a_scan(self):
+		self.catalog.add_course("Electives", "AMCS2203 - DATA VISUALISATION (3 credits)")
+		self.catalog.import_courses("Electives", [f"ELEC{i:03d} - TOPIC {i} (2 credits)" for i in range(50)])
+		for prefix in ("data", "DaTa", "amcs10", "calc", "topic 1", "2 cred", "elec04", "zzz", "s"):
+			for limit in (1, 5, 100):
+				self.assertEqual(self.catalog.search(prefix, limit), scan_search(self.all_courses(), prefix, limit), prefix)
+		self.assertEqual(self.catalog.search("", 3), tuple(sorted(self.all_courses(), key=str.lower)[:3]))
+
+	def test_search_within_a_category(self):
+		results = self.catalog.search("a", 100, category="Mathematics Subjects")
+		self.assertTrue(results)
+		self.assertTrue(set(results) <= set(DEFAULT_SUBJECTS["Mathematics Subjects"]))
+
+	def test_custom_courses_persist_and_duplicates_are_rejected(self):
+		course = self.catalog.add_course("Electives", "  AMCS3003 - QUANTUM COMPUTING (4 credits) ")
+		with self.assertRaises(ValueError):
+			self.catalog.add_course("Other", course)
+		self.assertEqual(self.catalog.import_courses("Electives", [course, "NEW1 - NEW (2 credits)"]), 1)
+		reloaded = CourseCatalog(self.storage)
+		self.assertEqual(reloaded.category_of(course), "Electives")
+		self.assertEqual(reloaded.credits_of(course), 4.0)
+		self.assertIn("NEW1 - NEW (2 credits)", reloaded)
+		self.assertEqual(len(reloaded), len(self.catalog))
+		self.assertEqual(reloaded.search("quantum"), (course,))
+
+	def test_semester_setup_round_trip(self):
+		calc = GPACalculator(self.storage)
+		self.assertEqual(calc.semester_setup, {"total_credits": 0, "is_setup": False})
+		calc.save_semester_setup(18)
+		self.assertEqual(GPACalculator(self.storage).semester_setup, {"total_credits": 18, "is_setup": True})
+		with self.assertRaises(TypeError):
+			calc.save_semester_setup(18.0)
+
+
+if __name__ == "__main__":
+	unittest.main()
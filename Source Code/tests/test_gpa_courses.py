@@ -0,0 +1,80 @@
+import random
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.gpa import GPACalculator, CourseTable, Course, GRADE_POINTS
+
+
+class CourseTableTest(unittest.TestCase):
+	"""Columnar course storage and its per-grade totals against a row scan"""
+
+	def test_totals_follow_every_change(self):
+		rng = random.Random(28)
+		table = CourseTable()
+		rows = []
+		grades = list(GRADE_POINTS)
+		for step in range(400):
+			action = rng.random()
+			if rows and action < 0.25:
+				index = rng.randrange(len(rows))
+				self.assertEqual(table.pop(index), rows.pop(index))
+			elif rows and action < 0.5:
+				index = rng.randrange(len(rows))
+				rows[index] = (f"C{step}", rng.choice((2.0, 3.0, 4.0)), rng.choice(grades), rng.randint(1, 8))
+				table.set(index, *rows[index])
+			else:
+				rows.append((f"C{step}", rng.choice((2.0, 3.0, 4.0)), rng.choice(grades), rng.randint(1, 8)))
+				table.append(*rows[-1])
+			total_credits, weighted_points = table.totals()
+			self.assertEqual(len(table), len(rows))
+			self.assertAlmostEqual(total_credits, sum(row[1] for row in rows))
+			self.assertAlmostEqual(weighted_points, sum(row[1] * GRADE_POINTS[row[2]] for row in rows))
+		self.assertEqual([table.row(i) for i in range(len(table))], rows)
+		counts = {}
+		for row in rows:
+			counts[row[2]] = counts.get(row[2], 0) + 1
+		self.assertEqual(table.grade_counts(), counts)
+
+	def test_courses_are_slotted(self):
+		course = Course("Physics", 3, "A")
+		with self.assertRaises(AttributeError):
+			course.notes = "no per-instance dict"
+
+
+class GPACalculatorCoursesTest(unittest.TestCase):
+	"""Course views and aggregate accessors on GPACalculator"""
+
+	def setUp(self):
+		self.calc = GPACalculator(JSONStorage(tempfile.mkdtemp()))
+		self.calc.add_course("Math", 4, "A")
+		self.calc.add_course("History", 3, "B+")
+		self.calc.add_course("Art", 2, "C")
+
+	def test_aggregates_match_the_course_list(self):
+		calc = self.calc
+		self.assertEqual(calc.get_course_count(), len(calc.courses))
+		self.assertEqual(calc.get_total_credits(), sum(c.credits for c in calc.courses))
+		self.assertEqual(calc.get_course(1).to_dict(), calc.courses[1].to_dict())
+		with self.assertRaises(IndexError):
+			calc.get_course(3)
+
+	def test_courses_view_is_cached_until_a_change(self):
+		calc = self.calc
+		view = calc.courses
+		self.assertIs(calc.courses, view)
+		calc.update_course(0, "Calculus", 4, "A-")
+		self.assertIsNot(calc.courses, view)
+		self.assertEqual(calc.courses[0].name, "Calculus")
+		self.assertEqual(view[0].name, "Math")  # Old snapshots are left alone
+		calc.remove_course(2)
+		self.assertEqual([c.name for c in calc.courses], ["Calculus", "History"])
+		self.assertEqual(calc.get_total_credits(), 7.0)
+		calc.add_course("Music", 2, "A")
+		self.assertEqual(calc.courses[-1].name, "Music")
+		calc.clear_courses()
+		self.assertEqual((calc.courses, calc.get_total_credits(), calc.get_course_count()), ((), 0.0, 0))
+
+
+if __name__ == "__main__":
+	unittest.main()
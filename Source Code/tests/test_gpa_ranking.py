@@ -0,0 +1,84 @@
+import os
+import random
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.gpa import CohortRanking
+
+
+def scan_rank(gpas, gpa):
+	return sum(1 for other in gpas.values() if other > gpa) + 1
+
+
+def scan_percentile(gpas, gpa):
+	below = sum(1 for other in gpas.values() if other < gpa)
+	equal = sum(1 for other in gpas.values() if other == gpa)
+	return round((below + 0.5 * equal) / len(gpas) * 100, 2)
+
+
+class CohortRankingTest(unittest.TestCase):
+	"""Rank, percentile and top-k against a sorted scan of the cohort"""
+
+	def assert_matches_scan(self, ranking, gpas):
+		self.assertEqual(len(ranking), len(gpas))
+		for student_id, gpa in gpas.items():
+			self.assertEqual(ranking.get_gpa(student_id), gpa)
+			self.assertEqual(ranking.rank(student_id), scan_rank(gpas, gpa))
+			self.assertEqual(ranking.percentile(student_id), scan_percentile(gpas, gpa))
+		ordered = sorted(gpas.items(), key=lambda pair: (-pair[1], pair[0]))
+		for k in (0, 1, 5, len(gpas), len(gpas) + 3):
+			self.assertEqual(ranking.top(k), tuple(ordered[:k]))
+
+	def test_queries_follow_adds_updates_and_removes(self):
+		rng = random.Random(26)
+		gpas = {f"s{i:03d}": rng.randint(0, 400) / 100 for i in range(150)}
+		ranking = CohortRanking(gpas.items())
+		self.assert_matches_scan(ranking, gpas)
+		for step in range(300):
+			action = rng.random()
+			student_id = rng.choice(sorted(gpas))
+			if action < 0.3:
+				self.assertEqual(ranking.remove(student_id), gpas.pop(student_id))
+			elif action < 0.7:
+				gpas[student_id] = rng.randint(0, 400) / 100
+				ranking.update(student_id, gpas[student_id])
+			else:
+				gpas[f"n{step:03d}"] = rng.randint(0, 400) / 100
+				ranking.add(f"n{step:03d}", gpas[f"n{step:03d}"])
+		self.assert_matches_scan(ranking, gpas)
+
+	def test_unranked_gpa_queries(self):
+		ranking = CohortRanking([("a", 3.5), ("b", 3.5), ("c", 2.0)])
+		self.assertEqual(ranking.rank_of_gpa(4.0), 1)
+		self.assertEqual(ranking.rank_of_gpa(3.0), 3)
+		self.assertEqual(ranking.count_above(2.0), 2)
+		self.assertEqual(ranking.percentile_of_gpa(3.5), round((1 + 0.5 * 2) / 3 * 100, 2))
+		self.assertEqual(CohortRanking().percentile_of_gpa(3.0), 0.0)
+
+	def test_validation(self):
+		ranking = CohortRanking([("a", 3.0)])
+		with self.assertRaises(ValueError):
+			ranking.add("a", 2.0)
+		with self.assertRaises(ValueError):
+			ranking.add("b", 4.5)
+		with self.assertRaises(TypeError):
+			ranking.add("b", "3.0")
+		with self.assertRaises(KeyError):
+			ranking.update("missing", 2.0)
+		with self.assertRaises(ValueError):
+			CohortRanking([("a", 3.0), ("a", 2.0)])
+
+	def test_from_history_dir_uses_the_latest_gpa(self):
+		base_dir = tempfile.mkdtemp()
+		JSONStorage(os.path.join(base_dir, "alice")).save("gpa_history.json", [{"gpa": 2.5}, {"gpa": 3.75}])
+		JSONStorage(os.path.join(base_dir, "bob")).save("gpa_history.json", [{"gpa": 3.1}])
+		os.makedirs(os.path.join(base_dir, "carol"))  # No history yet
+		ranking = CohortRanking.from_history_dir(base_dir)
+		self.assertEqual(len(ranking), 2)
+		self.assertEqual(ranking.get_gpa("alice"), 3.75)
+		self.assertEqual(ranking.rank("bob"), 2)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,63 @@
+import random
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.gpa import GPACalculator, GRADE_POINTS
+
+
+def scan_gpa(courses, first, last):
+	chosen = [c for c in courses if first <= c.semester <= last]
+	credits = sum(c.credits for c in chosen)
+	points = sum(c.credits * GRADE_POINTS[c.grade] for c in chosen)
+	return round(points / credits, 2) if credits else 0.0
+
+
+class SemesterRollupTest(unittest.TestCase):
+	"""Range and cumulative GPA queries against a scan of the courses"""
+
+	def setUp(self):
+		self.calc = GPACalculator(JSONStorage(tempfile.mkdtemp()))
+
+	def test_range_gpa_follows_every_change(self):
+		rng = random.Random(27)
+		calc = self.calc
+		grades = list(GRADE_POINTS)
+		for step in range(200):
+			action = rng.random()
+			if calc.get_course_count() and action < 0.2:
+				calc.remove_course(rng.randrange(calc.get_course_count()))
+			elif calc.get_course_count() and action < 0.4:
+				calc.update_course(rng.randrange(calc.get_course_count()), f"C{step}", rng.choice((2, 3, 4)), rng.choice(grades), rng.randint(1, 40))
+			else:
+				calc.add_course(f"C{step}", rng.choice((2, 3, 4)), rng.choice(grades), rng.randint(1, 40))
+			first = rng.randint(1, 40)
+			last = rng.randint(first, 40)
+			self.assertEqual(calc.get_range_gpa(first, last)["gpa"], scan_gpa(calc.courses, first, last))
+		self.assertEqual(calc.semesters, tuple(sorted({c.semester for c in calc.courses})))
+		self.assertEqual(
+			calc.get_cumulative_gpa_trend(),
+			tuple((semester, scan_gpa(calc.courses, 1, semester)) for semester in calc.semesters),
+		)
+
+	def test_update_keeps_semester_unless_given(self):
+		calc = self.calc
+		calc.add_course("Math", 4, "A", semester=2)
+		calc.add_course("Art", 2, "C", semester=3)
+		calc.update_course(0, "Math", 4, "B")
+		self.assertEqual(calc.get_course(0).semester, 2)
+		self.assertEqual(calc.get_semester_gpa(2)["gpa"], GRADE_POINTS["B"])
+		calc.update_course(0, "Math", 4, "B", semester=3)
+		self.assertEqual(calc.get_semester_gpa(2), {"gpa": 0.0, "total_credits": 0.0, "weighted_points": 0.0})
+		self.assertEqual(calc.semesters, (3,))
+		self.assertEqual(calc.get_cumulative_gpa(3)["gpa"], calc.calculate()["gpa"])
+
+	def test_validation(self):
+		with self.assertRaises(ValueError):
+			self.calc.get_range_gpa(0, 2)
+		with self.assertRaises(ValueError):
+			self.calc.get_range_gpa(3, 2)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,77 @@
+import datetime
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.homework import HomeworkPlanner
+
+
+def days_from_today(days: int) -> str:
+	return (datetime.date.today() + datetime.timedelta(days=days)).isoformat()
+
+
+class HomeworkArchiveTest(unittest.TestCase):
+	"""Archiving by completion day, and restoring archived items"""
+	
+	def setUp(self):
+		self.storage = JSONStorage(tempfile.mkdtemp())
+		self.planner = HomeworkPlanner(self.storage)
+	
+	def test_completion_day_is_recorded_and_cleared(self):
+		planner = self.planner
+		item = planner.add("Math", "Problem set", days_from_today(-200))
+		planner.mark_complete_by_id(item.id)
+		self.assertEqual(item.completed_on, days_from_today(0))
+		planner.update_by_id(item.id, status="Pending")
+		self.assertEqual(item.completed_on, "")
+		planner.update_by_id(item.id, status="Completed")
+		self.assertEqual(item.completed_on, days_from_today(0))
+		planner.undo()
+		self.assertEqual((item.status, item.completed_on), ("Pending", ""))
+		planner.redo()
+		self.assertEqual((item.status, item.completed_on), ("Completed", days_from_today(0)))
+		self.assertEqual(HomeworkPlanner(self.storage).get(item.id).completed_on, days_from_today(0))
+	
+	def test_archive_goes_by_completion_day_not_due_date(self):
+		planner = self.planner
+		finished_late = planner.add("Math", "Late essay", days_from_today(-200))
+		planner.mark_complete_by_id(finished_late.id)  # Finished today, so it stays
+		finished_early = planner.add("Math", "Early lab", days_from_today(30))
+		planner.update_by_id(finished_early.id, status="Completed", completed_on=days_from_today(-120))
+		legacy = planner.add("Math", "Old quiz", days_from_today(-150))
+		planner.update_by_id(legacy.id, status="Completed", completed_on="")  # No completion day: goes by due date
+		pending = planner.add("Math", "Open task", days_from_today(-300))
+		moved = planner.archive_completed(90)
+		self.assertEqual({item.id for item in moved}, {finished_early.id, legacy.id})
+		self.assertIn(finished_late.id, planner)
+		self.assertIn(pending.id, planner)
+		self.assertEqual(len(planner.archive), 2)
+	
+	def test_archive_then_restore_round_trip(self):
+		planner = self.planner
+		items = [planner.add("Physics", f"Report {n}", days_from_today(-100 - n), details="lab") for n in range(5)]
+		for item in items:
+			planner.update_by_id(item.id, status="Completed", completed_on=item.due)
+		before = {item.id: item.to_dict() for item in items}
+		moved = planner.archive_completed(90)
+		self.assertEqual(len(moved), 5)
+		self.assertEqual(len(planner), 0)
+		reopened = HomeworkPlanner(self.storage)
+		self.assertEqual(len(reopened), 0)
+		found = reopened.search_archive("report", subject="Physics", limit=None)
+		self.assertEqual([item.due for item in found], sorted(before[item.id]["due"] for item in items)[::-1])
+		restored = reopened.restore_archived([items[1].id, items[3].id])
+		self.assertEqual([item.to_dict() for item in restored], [before[items[1].id], before[items[3].id]])
+		self.assertEqual(len(reopened.archive), 3)
+		again = HomeworkPlanner(self.storage)
+		self.assertEqual({item.id for item in again.items}, {items[1].id, items[3].id})
+		self.assertEqual(len(again.archive), 3)
+		self.assertEqual(again.restore_archived("unknown"), ())
+	
+	def test_archive_age_must_be_valid(self):
+		with self.assertRaises(ValueError):
+			self.planner.archive_completed(-1)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,86 @@
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.homework import HomeworkPlanner
+
+
+class CountingStorage(JSONStorage):
+	"""JSONStorage that counts save calls"""
+
+	def __init__(self, base_dir):
+		super().__init__(base_dir)
+		self.saves = 0
+
+	def save(self, name, data):
+		self.saves += 1
+		return super().save(name, data)
+
+
+class HomeworkBatchTest(unittest.TestCase):
+	"""Batched changes save once and roll back completely on failure"""
+
+	def setUp(self):
+		self.storage = CountingStorage(tempfile.mkdtemp())
+		self.planner = HomeworkPlanner(self.storage)
+		self.first = self.planner.add("Math", "Problem set", "2030-01-10", priority="High")
+		self.second = self.planner.add("Physics", "Lab report", "2030-01-12")
+		self.third = self.planner.add("History", "Essay draft", "2030-01-15", priority="Low")
+
+	def state(self, planner):
+		return (
+			[item.to_dict() for item in planner.items],
+			planner.get_quick_stats(),
+			[item.id for item in planner.get_priority_sorted()],
+			[item.id for item in planner.search("lab")],
+			planner.subjects,
+		)
+
+	def test_batch_saves_once(self):
+		saves = self.storage.saves
+		with self.planner.batch():
+			self.planner.add("Math", "Quiz", "2030-01-11")
+			self.planner.update_by_id(self.first.id, status="In Progress")
+			self.planner.remove_by_id(self.third.id)
+			with self.planner.batch():  # Joins the outer batch
+				self.planner.mark_complete_by_id(self.second.id)
+			self.assertEqual(self.storage.saves, saves)
+		self.assertEqual(self.storage.saves - saves, 2)  # The homework file and its marker
+		self.assertEqual(self.state(HomeworkPlanner(self.storage))[0], self.state(self.planner)[0])
+
+	def test_empty_batch_does_not_save(self):
+		saves = self.storage.saves
+		with self.planner.batch():
+			pass
+		self.assertEqual(self.storage.saves, saves)
+
+	def test_failed_batch_rolls_back_every_change(self):
+		before = self.state(self.planner)
+		saves = self.storage.saves
+		with self.assertRaises(ValueError):
+			with self.planner.batch():
+				self.planner.remove_by_id(self.first.id)
+				self.planner.update_by_id(self.second.id, title="Renamed report", priority="Low")
+				self.planner.add("Chemistry", "Lab safety quiz", "2030-01-09")
+				self.planner.update_by_id(self.third.id, due="not a date")
+		self.assertEqual(self.state(self.planner), before)
+		self.assertEqual(self.storage.saves, saves)
+		self.assertIs(self.planner.get(self.first.id), self.first)
+		self.assertTrue(self.planner.undo())  # The rolled-back batch left no undo step: this undoes the third add
+		self.assertNotIn(self.third.id, self.planner)
+
+	def test_many_helpers_are_all_or_nothing(self):
+		before = self.state(self.planner)
+		with self.assertRaises(ValueError):
+			self.planner.update_many({self.first.id: {"status": "Completed"}, self.second.id: {"priority": "Urgent"}})
+		self.assertEqual(self.state(self.planner), before)
+		added = self.planner.add_many([{"subject": "Art", "title": "Sketch", "due": "2030-02-01"}, {"subject": "Art", "title": "Paint", "due": "2030-02-02"}])
+		self.assertEqual([item.title for item in self.planner.filter_by_subject("Art")], ["Sketch", "Paint"])
+		self.planner.mark_complete_many(item.id for item in added)
+		self.assertEqual(self.planner.get_quick_stats()["completed"], 2)
+		self.planner.remove_many([self.first.id, self.second.id])
+		self.assertEqual([item.id for item in self.planner.items], [self.third.id] + [item.id for item in added])
+
+
+if __name__ == "__main__":
+	unittest.main()
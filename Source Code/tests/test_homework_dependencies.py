@@ -0,0 +1,97 @@
+import datetime
+import random
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.homework import HomeworkPlanner
+
+
+def days_from_today(days: int) -> str:
+	return (datetime.date.today() + datetime.timedelta(days=days)).isoformat()
+
+
+class HomeworkDependencyTest(unittest.TestCase):
+	"""Prerequisite links, cycle checks and the study order"""
+
+	def setUp(self):
+		self.storage = JSONStorage(tempfile.mkdtemp())
+		self.planner = HomeworkPlanner(self.storage)
+		self.rng = random.Random(45)
+
+	def assert_order_respects_links(self):
+		planner = self.planner
+		order = [item.id for item in planner.get_study_order()]
+		self.assertEqual(sorted(order), sorted(item.id for item in planner.items if item.status != "Completed"))
+		position = {item_id: index for index, item_id in enumerate(order)}
+		for item in planner.items:
+			for prerequisite in planner.prerequisites_of(item.id):
+				if item.id in position and prerequisite.id in position:
+					self.assertLess(position[prerequisite.id], position[item.id])
+
+	def reaches(self, start_id, target_id):
+		"""Scan: does start_id (transitively) wait for target_id?"""
+		stack, seen = [start_id], {start_id}
+		while stack:
+			item = self.planner.get(stack.pop())
+			for prerequisite_id in item.requires:
+				if prerequisite_id == target_id:
+					return True
+				if prerequisite_id in self.planner and prerequisite_id not in seen:
+					seen.add(prerequisite_id)
+					stack.append(prerequisite_id)
+		return False
+
+	def test_random_links_keep_a_valid_order(self):
+		planner, rng = self.planner, self.rng
+		for step in range(60):
+			planner.add("Math", f"Task {step}", days_from_today(rng.randint(-5, 30)))
+		for step in range(200):
+			ids = [item.id for item in planner.items]
+			item_id, prerequisite_id = rng.sample(ids, 2)
+			operation = rng.random()
+			if operation < 0.6:
+				try:
+					planner.add_prerequisite(item_id, prerequisite_id)
+				except ValueError:
+					# Refused only when the prerequisite already waits for the item
+					self.assertTrue(self.reaches(prerequisite_id, item_id))
+			elif operation < 0.75:
+				planner.remove_prerequisite(item_id, rng.choice(planner.get(item_id).requires or (prerequisite_id,)))
+			elif operation < 0.9:
+				planner.mark_complete_by_id(item_id)
+			else:
+				planner.remove_by_id(item_id)
+				planner.add("Math", f"Extra {step}", days_from_today(rng.randint(-5, 30)))
+			self.assert_order_respects_links()
+		for item in planner.items:
+			blocked = any(p.status != "Completed" for p in planner.prerequisites_of(item.id))
+			self.assertEqual(planner.is_blocked(item.id), blocked)
+		reloaded = HomeworkPlanner(self.storage)
+		self.assertEqual([item.requires for item in reloaded.items], [item.requires for item in planner.items])
+
+	def test_prerequisite_is_pulled_forward(self):
+		planner = self.planner
+		reading = planner.add("Math", "Reading", days_from_today(10))
+		essay = planner.add("Math", "Essay", days_from_today(1))
+		quiz = planner.add("Math", "Quiz", days_from_today(3))
+		planner.set_prerequisites(essay.id, [reading.id])
+		self.assertEqual(planner.get_study_order(), (reading, essay, quiz))
+		self.assertTrue(planner.is_blocked(essay.id))
+		self.assertEqual(planner.dependents_of(reading.id), (essay,))
+		with self.assertRaises(ValueError):
+			planner.add_prerequisite(reading.id, essay.id)
+		with self.assertRaises(ValueError):
+			planner.add_prerequisite(reading.id, reading.id)
+		with self.assertRaises(ValueError):
+			planner.add_prerequisite(reading.id, "missing")
+		planner.mark_complete_by_id(reading.id)
+		self.assertFalse(planner.is_blocked(essay.id))
+		self.assertEqual(planner.get_study_order(), (essay, quiz))
+		planner.remove_by_id(reading.id)
+		self.assertEqual(essay.requires, (reading.id,))  # Kept by id; a missing prerequisite counts as done
+		self.assertFalse(planner.is_blocked(essay.id))
+
+
+if __name__ == "__main__":
+	unittest.main()
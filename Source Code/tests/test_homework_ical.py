@@ -0,0 +1,93 @@
+import io
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.homework import HomeworkPlanner
+from core.ical import fold, unfold, parse_rrule
+
+
+FEED = """BEGIN:VCALENDAR\r
+VERSION:2.0\r
+BEGIN:VEVENT\r
+UID:portal-1@lms.example\r
+DTSTART:20300310T235900Z\r
+SUMMARY:Essay\\, part 1\r
+CATEGORIES:AMIS1012 - ETHICS\\, LAW,Extra\r
+DESCRIPTION:Read chapter 3\\nThen write 500 words\r
+PRIORITY:2\r
+BEGIN:VALARM\r
+SUMMARY:Ignored alarm text\r
+END:VALARM\r
+END:VEVENT\r
+BEGIN:VTODO\r
+UID:portal-2@lms.example\r
+DUE;VALUE=DATE:20300302\r
+SUMMARY:Fortnightly lab\r
+RRULE:FREQ=WEEKLY;INTERVAL=2;COUNT=5\r
+END:VTODO\r
+BEGIN:VTODO\r
+UID:portal-3@lms.example\r
+DUE:20300305\r
+SUMMARY:Weekday reading\r
+RRULE:FREQ=WEEKLY;BYDAY=MO,WE\r
+STATUS:COMPLETED\r
+END:VTODO\r
+BEGIN:VTODO\r
+UID:portal-4@lms.example\r
+SUMMARY:No due date\r
+END:VTODO\r
+END:VCALENDAR\r
+"""
+
+
+class HomeworkICalTest(unittest.TestCase):
+	"""iCalendar import, export and RRULE round trips"""
+
+	def setUp(self):
+		self.planner = HomeworkPlanner(JSONStorage(tempfile.mkdtemp()))
+
+	def test_import_feed(self):
+		counts = self.planner.import_ics(io.StringIO(FEED), default_subject="Portal")
+		self.assertEqual(counts, {"added": 3, "duplicates": 0, "skipped": 1})
+		essay = self.planner.search("essay")[0]
+		self.assertEqual((essay.title, essay.subject, essay.due, essay.priority), ("Essay, part 1", "AMIS1012 - ETHICS, LAW", "2030-03-10", "High"))
+		self.assertEqual(essay.details, "Read chapter 3\nThen write 500 words")
+		reading = self.planner.search("weekday")[0]
+		self.assertEqual((reading.status, reading.subject), ("Completed", "Portal"))  # Unsupported rule: imported once
+		series, = self.planner.series
+		self.assertEqual(series.to_dict()["recurrence"], {"every_days": 14, "until": "", "count": 5})
+		self.assertEqual([o.due for o in self.planner.occurrences_between("2030-03-01", "2030-06-30")],
+			["2030-03-02", "2030-03-16", "2030-03-30", "2030-04-13", "2030-04-27"])
+		self.assertEqual(self.planner.import_ics(io.StringIO(FEED)), {"added": 0, "duplicates": 3, "skipped": 1})
+
+	def test_export_then_import_round_trip(self):
+		self.planner.add("Math", "Problem set; with, punctuation", "2030-01-10", details="Line one\nLine two \\ done", priority="Low")
+		self.planner.add("日本語 - LANGUAGE", "宿題 " * 40, "2030-01-11", priority="High")
+		self.planner.update_by_id(self.planner.items[1].id, status="In Progress")
+		self.planner.add_recurring("Physics", "Weekly lab", "2030-01-07", every_days=7, until="2030-03-01")
+		self.planner.add_recurring("Physics", "Daily reading", "2030-01-07", every_days=3, count=4)
+		lines = list(self.planner.export_ics())
+		self.assertTrue(all(len(line.rstrip("\r\n").encode("utf-8")) <= 75 for line in lines))
+		copy = HomeworkPlanner(JSONStorage(tempfile.mkdtemp()))
+		self.assertEqual(copy.import_ics(lines), {"added": 4, "duplicates": 0, "skipped": 0})
+		self.assertEqual([item.to_dict() for item in copy.items], [item.to_dict() for item in self.planner.items])
+		self.assertEqual(sorted(s.to_dict()["id"] for s in copy.series), sorted(s.to_dict()["id"] for s in self.planner.series))
+		for series in self.planner.series:
+			self.assertEqual(copy.get(series.id).to_dict()["recurrence"], series.to_dict()["recurrence"])
+		self.assertEqual(copy.import_ics(self.planner.export_ics())["duplicates"], 4)
+
+	def test_fold_and_unfold(self):
+		line = "DESCRIPTION:" + "é" * 100
+		folded = list(fold(line))
+		self.assertGreater(len(folded), 1)
+		self.assertEqual(list(unfold(folded)), [line])
+
+	def test_parse_rrule(self):
+		self.assertEqual(parse_rrule("FREQ=DAILY;UNTIL=20300131T000000Z"), {"every_days": 1, "until": "2030-01-31", "count": 0})
+		self.assertIsNone(parse_rrule("FREQ=MONTHLY"))
+		self.assertIsNone(parse_rrule("FREQ=DAILY;INTERVAL=x"))
+
+
+if __name__ == "__main__":
+	unittest.main()
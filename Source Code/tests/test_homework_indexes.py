@@ -0,0 +1,223 @@
+import datetime
+import random
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.homework import HomeworkPlanner, RECURRENCE_HORIZON_DAYS, STATUSES, PRIORITIES, today_ordinal
+
+
+SUBJECTS = ("AMCS1034 - SOFTWARE DEVELOPMENT", "AMCS1013 - DISCRETE MATHEMATICS", "AMCS1233 - DIGITAL LOGIC")
+BAD_FIELDS = ({"due": "2030-13-45"}, {"priority": "Urgent"}, {"status": "Done"}, {"title": "Renamed", "due": "soon"})
+
+
+class HomeworkIndexTest(unittest.TestCase):
+	"""Random add/update/remove/status operations checked against a full scan after every step"""
+	
+	def setUp(self):
+		self.storage = JSONStorage(tempfile.mkdtemp())
+		self.planner = HomeworkPlanner(self.storage)
+		self.rng = random.Random(30)
+	
+	def random_due(self) -> str:
+		return (datetime.date.today() + datetime.timedelta(days=self.rng.randint(-30, 30))).isoformat()
+	
+	def assert_indexes_match_scan(self):
+		items = self.planner.items
+		indexes = self.planner._indexes
+		today = today_ordinal()
+		for status in STATUSES:
+			self.assertEqual(set(indexes.by_status.get(status, {})), {item for item in items if item.status == status})
+		for priority in PRIORITIES:
+			self.assertEqual(set(indexes.by_priority.get(priority, {})), {item for item in items if item.priority == priority})
+		self.assertEqual({subject for subject, members in indexes.by_subject.items() if members}, {item.subject for item in items})
+		for subject, members in indexes.by_subject.items():
+			self.assertEqual(set(members), {item for item in items if item.subject == subject})
+		self.assertEqual([entry[2] for entry in indexes.by_due], sorted(items, key=lambda item: (item.due_key, indexes._seq[item])))
+		for (status, priority), entries in indexes.by_status_priority.items():
+			expected = sorted((item for item in items if item.status == status and item.priority == priority),
+				key=lambda item: (item.due_key, indexes._seq[item]))
+			self.assertEqual([entry[2] for entry in entries], expected)
+		self.assertEqual(indexes.overdue, sum(1 for item in items if item.is_overdue(today)))
+	
+	def test_random_operations_keep_indexes_in_step(self):
+		planner, rng = self.planner, self.rng
+		for step in range(400):
+			ids = [item.id for item in planner.items]
+			operation = rng.random()
+			if operation < 0.35 or not ids:
+				planner.add(rng.choice(SUBJECTS), f"Task {step}", self.random_due(), priority=rng.choice(PRIORITIES))
+			elif operation < 0.55:
+				planner.update_by_id(rng.choice(ids), subject=rng.choice(SUBJECTS), due=self.random_due(),
+					priority=rng.choice(PRIORITIES))
+			elif operation < 0.7:
+				planner.update_by_id(rng.choice(ids), status=rng.choice(STATUSES))
+			elif operation < 0.8:
+				planner.mark_complete_by_id(rng.choice(ids))
+			elif operation < 0.9:
+				planner.remove_by_id(rng.choice(ids))
+			else:
+				with self.assertRaises(ValueError):
+					planner.update_by_id(rng.choice(ids), **rng.choice(BAD_FIELDS))
+			self.assert_indexes_match_scan()
+	
+	def test_failed_update_leaves_item_unchanged(self):
+		planner = self.planner
+		item = planner.add(SUBJECTS[0], "Lab 1", "2030-01-15", priority="High")
+		other = planner.add(SUBJECTS[1], "Quiz 1", "2030-01-20")
+		before = item.to_dict()
+		for fields in BAD_FIELDS:
+			with self.assertRaises(ValueError):
+				planner.update_by_id(item.id, **fields)
+			self.assertEqual(item.to_dict(), before)
+			self.assert_indexes_match_scan()
+		self.assertEqual(planner.search("renamed"), ())
+		self.assertEqual(planner.get_priority_sorted("Pending"), (item, other))
+	
+	def test_quick_stats_overdue_matches_overdue_items(self):
+		planner, rng = self.planner, self.rng
+		for step in range(60):
+			operation = rng.random()
+			if operation < 0.3:
+				planner.add(rng.choice(SUBJECTS), f"Task {step}", self.random_due())
+			elif operation < 0.5:
+				planner.add_recurring(rng.choice(SUBJECTS), f"Weekly {step}", self.random_due(), every_days=rng.choice((1, 3, 7)),
+					count=rng.choice((0, 2, 5)))
+			else:
+				overdue = planner.get_overdue_items()
+				if overdue:
+					target = rng.choice(overdue)
+					if rng.random() < 0.5:
+						planner.mark_complete_by_id(target.id)
+					else:
+						planner.remove_by_id(target.id)
+			self.assertEqual(planner.get_quick_stats()["overdue"], len(planner.get_overdue_items()))
+	
+	def test_study_plan_and_order_include_recurring_occurrences(self):
+		planner = self.planner
+		today = datetime.date.today()
+		task = planner.add(SUBJECTS[0], "Essay", (today + datetime.timedelta(days=2)).isoformat())
+		series = planner.add_recurring(SUBJECTS[1], "Daily quiz", today.isoformat(), every_days=1)
+		occurrences = planner.occurrences_between(today.isoformat(), (today + datetime.timedelta(days=3)).isoformat())
+		planner.mark_complete_by_id(occurrences[1].id)
+		open_ids = {task.id} | {occurrence.id for occurrence in occurrences if occurrence.status != "Completed"}
+		plan = planner.plan_study(days=3)
+		self.assertEqual(plan["blocks"], len(open_ids))
+		self.assertEqual({item.id for _, entries in plan["days"] for item, _ in entries}, open_ids)
+		order = [item.id for item in planner.get_study_order()]
+		self.assertTrue(open_ids <= set(order))
+		self.assertNotIn(occurrences[1].id, order)
+		self.assertTrue(all(item_id.startswith(series.id) for item_id in order if item_id != task.id))
+	
+	def test_subject_rollups_match_a_scan_including_recurring_occurrences(self):
+		planner, rng = self.planner, self.rng
+		today = today_ordinal()
+		for step in range(80):
+			operation = rng.random()
+			if operation < 0.3:
+				planner.add(rng.choice(SUBJECTS), f"Task {step}", self.random_due())
+			elif operation < 0.45:
+				planner.add_recurring(rng.choice(SUBJECTS), f"Weekly {step}", self.random_due(), every_days=rng.choice((1, 3, 7)),
+					count=rng.choice((0, 2, 5)))
+			else:
+				listed = planner.get_priority_sorted()
+				if listed:
+					planner.update_by_id(rng.choice(listed).id, status=rng.choice(STATUSES))
+			listed = planner.get_priority_sorted()
+			overdue = planner.get_overdue_items()
+			expected = {}
+			for item in listed:
+				row = expected.setdefault(item.subject, {"total": 0, "pending": 0, "in_progress": 0, "completed": 0, "overdue": 0, "next_due": ""})
+				row["total"] += 1
+				row[item.status.lower().replace(" ", "_")] += 1
+				if item.status != "Completed" and item.due_key >= today and (not row["next_due"] or item.due < row["next_due"]):
+					row["next_due"] = item.due
+			for item in overdue:
+				expected[item.subject]["overdue"] += 1
+			got = {rollup["subject"]: {key: value for key, value in rollup.items() if key not in ("id", "subject")}
+				for rollup in planner.get_subject_rollups()}
+			self.assertEqual(got, expected)
+			for subject, row in expected.items():
+				self.assertEqual(planner.get_subject_rollup(subject)["total"], row["total"])
+	
+	def test_failed_update_cannot_make_trusted_and_validated_loads_differ(self):
+		planner = self.planner
+		item = planner.add(SUBJECTS[0], "Lab 1", "2030-01-15", priority="High")
+		other = planner.add(SUBJECTS[1], "Quiz 1", "2030-01-20")
+		before = item.to_dict()
+		for fields in BAD_FIELDS:
+			with self.assertRaises(ValueError):
+				planner.update_by_id(item.id, **fields)
+		planner.update_by_id(other.id, title="Quiz 1 (moved)")  # Saves the whole list
+		trusted = HomeworkPlanner(self.storage, trust_saved=True)
+		validated = HomeworkPlanner(self.storage, trust_saved=False)
+		self.assertEqual(validated.load_errors, ())
+		self.assertEqual(trusted.load_errors, ())
+		self.assertEqual([i.to_dict() for i in trusted.items], [i.to_dict() for i in validated.items])
+		self.assertEqual(validated.get(item.id).to_dict(), before)
+	
+	def test_validated_load_does_not_rewrite_the_file(self):
+		entries = [
+			{"subject": SUBJECTS[0], "title": "No id", "due": "2030-01-15", "status": "Pending", "details": "", "priority": "Low"},
+			{"id": "abc", "subject": SUBJECTS[0], "title": "Bad date", "due": "2030-13-45", "status": "Pending", "details": "", "priority": "Low"},
+		]
+		self.storage.save("homework.json", entries)
+		first = HomeworkPlanner(self.storage)
+		self.assertEqual(len(first.load_errors), 1)
+		self.assertEqual(self.storage.load("homework.json", default=None), entries)
+		second = HomeworkPlanner(self.storage)
+		self.assertEqual([i.id for i in first.items], [i.id for i in second.items])  # Derived ids are stable
+	
+	def test_failed_update_is_not_an_undo_step(self):
+		planner = self.planner
+		item = planner.add(SUBJECTS[0], "Lab 1", "2030-01-15")
+		planner.update_by_id(item.id, title="Lab 1 (draft)")
+		with self.assertRaises(ValueError):
+			planner.update_by_id(item.id, due="2030-13-45")
+		planner.undo()
+		self.assertEqual(item.title, "Lab 1")
+		planner.undo()
+		self.assertNotIn(item.id, planner)
+		self.assertFalse(planner.can_undo)
+	
+	def test_overdue_views_of_an_old_series_stay_within_the_horizon(self):
+		planner = self.planner
+		start = datetime.date.today() - datetime.timedelta(days=3000)
+		planner.add_recurring(SUBJECTS[0], "Daily reading", start.isoformat(), every_days=1)
+		overdue = planner.get_overdue_items()
+		self.assertEqual(len(overdue), RECURRENCE_HORIZON_DAYS)
+		self.assertEqual(planner.get_priority_sorted(overdue_only=True), tuple(sorted(overdue, key=lambda item: item.due_key)))
+		planner.mark_complete_by_id(overdue[0].id)
+		self.assertEqual(planner.get_quick_stats()["overdue"], len(planner.get_overdue_items()))
+		self.assertEqual(planner.get_subject_rollup(SUBJECTS[0])["overdue"], RECURRENCE_HORIZON_DAYS - 1)
+	
+	def test_indexed_queries_match_a_scan(self):
+		planner, rng = self.planner, self.rng
+		for step in range(150):
+			planner.add(rng.choice(SUBJECTS), f"Task {step}", self.random_due(), priority=rng.choice(PRIORITIES))
+		ids = [item.id for item in planner.items]
+		for item_id in rng.sample(ids, 60):
+			planner.update_by_id(item_id, status=rng.choice(STATUSES), due=self.random_due())
+		for item_id in rng.sample(ids, 20):
+			planner.remove_by_id(item_id)
+		items = planner.items
+		today = datetime.date.today()
+		rank = {priority: position for position, priority in enumerate(PRIORITIES)}
+		for status in STATUSES:
+			self.assertEqual(planner.filter_by_status(status), tuple(item for item in items if item.status == status))
+			self.assertEqual(planner.get_priority_sorted(status),
+				tuple(sorted((item for item in items if item.status == status), key=lambda item: (rank[item.priority], item.due_key))))
+		for priority in PRIORITIES:
+			self.assertEqual(planner.filter_by_priority(priority), tuple(item for item in items if item.priority == priority))
+		for subject in SUBJECTS:
+			self.assertEqual(planner.filter_by_subject(subject), tuple(item for item in items if item.subject == subject))
+		first, last = (today - datetime.timedelta(days=5)).isoformat(), (today + datetime.timedelta(days=10)).isoformat()
+		self.assertEqual(planner.get_items_due_between(first, last),
+			tuple(sorted((item for item in items if first <= item.due <= last), key=lambda item: item.due_key)))
+		overdue = tuple(item for item in items if item.status != "Completed" and item.due < today.isoformat())
+		self.assertEqual(planner.get_overdue_items(), overdue)
+		self.assertEqual(planner.get_priority_sorted(overdue_only=True), tuple(sorted(overdue, key=lambda item: (rank[item.priority], item.due_key))))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,85 @@
+import datetime
+import random
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.homework import HomeworkPlanner, today_ordinal
+from core.reminders import ReminderScheduler, REMINDER_LEAD_HOURS, deadline_timestamp
+
+
+LEAD = REMINDER_LEAD_HOURS * 3600
+
+
+def days_from_today(days: int) -> str:
+	return (datetime.date.today() + datetime.timedelta(days=days)).isoformat()
+
+
+class ReminderSchedulerTest(unittest.TestCase):
+	"""Reminder heap against a dictionary of live deadlines"""
+
+	def test_random_schedule_and_cancel(self):
+		rng = random.Random(40)
+		scheduler = ReminderScheduler(lead_hours=1)
+		live = {}
+		now = 1000.0
+		for step in range(500):
+			key = f"k{rng.randrange(40)}"
+			if rng.random() < 0.7:
+				deadline = now + rng.uniform(-3600, 50000)
+				scheduler.schedule(key, deadline, now=now)
+				if deadline > now:
+					live[key] = deadline - 3600
+				else:
+					live.pop(key, None)
+			else:
+				scheduler.cancel(key)
+				live.pop(key, None)
+			self.assertEqual(len(scheduler), len(live))
+			self.assertEqual(scheduler.next_fire_time(), min(live.values()) if live else None)
+			if step % 50 == 49:
+				now += 10000
+				fired = scheduler.pop_due(now)
+				expected = sorted((fire, key) for key, fire in live.items() if fire <= now)
+				self.assertEqual([key for key, _ in fired], [key for _, key in expected])
+				live = {key: fire for key, fire in live.items() if fire > now}
+
+	def test_validation(self):
+		with self.assertRaises(ValueError):
+			ReminderScheduler(lead_hours=-1)
+
+
+class PlannerRemindersTest(unittest.TestCase):
+	"""Planner reminders follow item and series changes"""
+
+	def setUp(self):
+		self.planner = HomeworkPlanner(JSONStorage(tempfile.mkdtemp()))
+
+	def test_item_reminders(self):
+		planner = self.planner
+		soon = planner.add("Math", "Soon", days_from_today(2))
+		later = planner.add("Math", "Later", days_from_today(5))
+		done = planner.add("Math", "Done", days_from_today(1))
+		planner.mark_complete_by_id(done.id)
+		planner.add("Math", "Past", days_from_today(-1))
+		self.assertEqual(planner.next_reminder_time(), deadline_timestamp(soon.due_ordinal) - LEAD)
+		planner.update_by_id(soon.id, due=days_from_today(9))
+		self.assertEqual(planner.next_reminder_time(), deadline_timestamp(later.due_ordinal) - LEAD)
+		self.assertEqual(planner.due_reminders(deadline_timestamp(later.due_ordinal) - LEAD), (later,))
+		self.assertEqual(planner.due_reminders(deadline_timestamp(later.due_ordinal)), ())
+		planner.remove_by_id(soon.id)
+		self.assertIsNone(planner.next_reminder_time())
+
+	def test_series_reminds_one_occurrence_at_a_time(self):
+		planner = self.planner
+		series = planner.add_recurring("Physics", "Lab", days_from_today(1), every_days=7, count=3)
+		due_days = [today_ordinal() + 1 + 7 * n for n in range(3)]
+		fired = []
+		while planner.next_reminder_time() is not None:
+			fired.extend(planner.due_reminders(planner.next_reminder_time()))
+		self.assertEqual([o.due_ordinal for o in fired], due_days)
+		self.assertTrue(all(o.series is series for o in fired))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,90 @@
+import datetime
+import random
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.homework import HomeworkPlanner
+from core.search import SEARCH_FIELD_WEIGHTS, tokenize
+
+
+WORDS = ("essay", "essays", "lab", "labs", "report", "calculus", "chapter", "review", "read", "reading", "quiz", "draft")
+SUBJECTS = ("AMCS1034 - SOFTWARE DEVELOPMENT", "AMAT1013 - CALCULUS I", "AMIS1012 - ETHICS IN COMPUTING")
+
+
+def scan_scores(items, query):
+	"""Score every item the way the index documents it, by reading the fields directly"""
+	words = set(tokenize(query))
+	scores = {}
+	for item in items:
+		terms = {}
+		for (_, weight), text in zip(SEARCH_FIELD_WEIGHTS, (item.title, item.subject, item.details)):
+			for token in tokenize(text):
+				terms[token] = terms.get(token, 0) + weight
+		total = 0
+		for word in words:
+			word_score = sum(weight * (2 if token == word else 1) for token, weight in terms.items() if token.startswith(word))
+			if not word_score:
+				break
+			total += word_score
+		else:
+			if words:
+				scores[item.id] = total
+	return scores
+
+
+class HomeworkSearchTest(unittest.TestCase):
+	"""Full-text search against a scan of every item's fields"""
+
+	def setUp(self):
+		self.storage = JSONStorage(tempfile.mkdtemp())
+		self.planner = HomeworkPlanner(self.storage)
+		self.rng = random.Random(35)
+
+	def random_text(self, count):
+		return " ".join(self.rng.choice(WORDS) for _ in range(count))
+
+	def random_due(self):
+		return (datetime.date.today() + datetime.timedelta(days=self.rng.randint(-20, 20))).isoformat()
+
+	def assert_search_matches_scan(self, planner, query, limit):
+		scores = scan_scores(planner.items, query)
+		expected = sorted((-score, planner.get(item_id).due_key) for item_id, score in scores.items())
+		results = planner.search(query, limit)
+		self.assertEqual([(-scores[item.id], item.due_key) for item in results], expected[:limit])
+		if limit is None:
+			self.assertEqual({item.id for item in results}, set(scores))
+
+	def test_search_follows_random_changes(self):
+		planner, rng = self.planner, self.rng
+		queries = ("essay", "ess", "lab report", "r", "calc", "chapter read", "software", "zzz", "", "Quiz!")
+		for step in range(200):
+			ids = [item.id for item in planner.items]
+			operation = rng.random()
+			if operation < 0.5 or not ids:
+				planner.add(rng.choice(SUBJECTS), self.random_text(3), self.random_due(), details=self.random_text(5))
+			elif operation < 0.8:
+				planner.update_by_id(rng.choice(ids), title=self.random_text(2), due=self.random_due())
+			else:
+				planner.remove_by_id(rng.choice(ids))
+			if step % 20 == 0:
+				for query in queries:
+					self.assert_search_matches_scan(planner, query, None)
+					self.assert_search_matches_scan(planner, query, 3)
+
+	def test_deferred_index_after_reload(self):
+		for step in range(40):
+			self.planner.add(self.rng.choice(SUBJECTS), self.random_text(3), self.random_due(), details=self.random_text(4))
+		reloaded = HomeworkPlanner(self.storage)
+		for query in ("lab", "review draft", "ethics"):
+			self.assert_search_matches_scan(reloaded, query, None)
+
+	def test_validation(self):
+		with self.assertRaises(ValueError):
+			self.planner.search(None)
+		with self.assertRaises(ValueError):
+			self.planner.search("lab", limit=-1)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,117 @@
+import json
+import os
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.homework import HomeworkPlanner
+from core.sync import HomeworkSync, LOG_SUFFIX
+
+
+class HomeworkSyncTest(unittest.TestCase):
+	"""Two devices syncing a planner through a shared directory"""
+	
+	def setUp(self):
+		self.remote = JSONStorage(tempfile.mkdtemp())
+		self.devices = [self.device() for _ in range(2)]
+	
+	def device(self):
+		storage = JSONStorage(tempfile.mkdtemp())
+		planner = HomeworkPlanner(storage)
+		return planner, HomeworkSync(planner, storage, self.remote)
+	
+	def records(self, planner):
+		return sorted(json.dumps(record, sort_keys=True) for record in [i.to_dict() for i in planner.items] + [s.to_dict() for s in planner.series])
+	
+	def sync_all(self):
+		for _ in range(2):
+			for _, sync in self.devices:
+				sync.sync()
+	
+	def test_edits_merge_and_converge(self):
+		(a, _), (b, _) = self.devices
+		item = a.add("Math", "Problem set", "2030-01-10")
+		a.add_recurring("Physics", "Weekly lab", "2030-01-07", count=4)
+		self.sync_all()
+		self.assertEqual(self.records(a), self.records(b))
+		a.update_by_id(item.id, title="Problem set 1")
+		b.update_by_id(item.id, priority="High")  # Different fields of the same item both survive
+		self.sync_all()
+		self.assertEqual(self.records(a), self.records(b))
+		merged = b.get(item.id)
+		self.assertEqual((merged.title, merged.priority), ("Problem set 1", "High"))
+	
+	def test_conflicting_edits_pick_the_same_winner(self):
+		(a, _), (b, _) = self.devices
+		item = a.add("Math", "Essay", "2030-01-10")
+		self.sync_all()
+		a.update_by_id(item.id, title="Essay (A)")
+		b.update_by_id(item.id, title="Essay (B)")
+		self.sync_all()
+		self.assertEqual(a.get(item.id).title, b.get(item.id).title)
+		self.assertIn(a.get(item.id).title, ("Essay (A)", "Essay (B)"))
+		b.remove_by_id(item.id)
+		self.sync_all()
+		self.assertNotIn(item.id, a)
+		self.assertEqual(self.records(a), self.records(b))
+	
+	def test_only_changed_records_are_pushed(self):
+		(a, sync), _ = self.devices
+		items = [a.add("Math", f"Task {n}", "2030-01-10") for n in range(20)]
+		a.add_recurring("Physics", "Weekly lab", "2030-01-07")
+		self.assertEqual(sync.sync()["pushed"], 21)
+		a.update_by_id(items[3].id, details="Chapter 2")
+		self.assertEqual(a.changed_since(a.revision - 1), (items[3].id,))
+		self.assertEqual(sync.sync()["pushed"], 1)
+		self.assertEqual(sync.sync()["pushed"], 0)
+	
+	def test_partly_written_record_is_read_once_complete(self):
+		(a, sync_a), (b, sync_b) = self.devices
+		a.add("Math", "First", "2030-01-10")
+		sync_a.sync()
+		log = os.path.join(self.remote.base_dir, sync_a.device_id + LOG_SUFFIX)
+		late = a.add("Math", "Second", "2030-01-11")
+		sync_a.sync()
+		with open(log, "rb") as f:
+			content = f.read()
+		cut = content.rindex(b"\n", 0, len(content) - 1) + 1 + 10
+		with open(log, "wb") as f:
+			f.write(content[:cut])  # The second record is only partly on disk
+		sync_b.sync()
+		self.assertNotIn(late.id, b)
+		with open(log, "wb") as f:
+			f.write(content)
+		sync_b.sync()
+		self.assertIn(late.id, b)
+	
+	def test_remote_edit_does_not_resurrect_an_archived_item(self):
+		(a, _), (b, _) = self.devices
+		item = a.add("Math", "Old quiz", "2020-01-10")
+		a.update_by_id(item.id, status="Completed", completed_on="2020-01-10")
+		self.sync_all()
+		b.update_by_id(item.id, details="Graded")
+		a.archive_completed(90)
+		self.sync_all()
+		self.assertNotIn(item.id, a)
+		self.assertEqual(len(a.archive), 1)
+		self.assertIn(item.id, b)  # Archived on a only: b keeps its copy
+	
+	def test_links_that_would_close_a_cycle_are_not_kept(self):
+		(a, _), (b, _) = self.devices
+		first = a.add("Math", "Part 1", "2030-01-10")
+		second = a.add("Math", "Part 2", "2030-01-11")
+		self.sync_all()
+		a.add_prerequisite(second.id, first.id)
+		b.add_prerequisite(first.id, second.id)
+		self.sync_all()
+		for planner in (a, b):
+			for item in planner.items:
+				for prerequisite_id in item.requires:
+					self.assertIn(item.id, [d.id for d in planner.dependents_of(prerequisite_id)])
+			self.assertFalse(planner.get(first.id).requires and planner.get(second.id).requires)
+		self.sync_all()
+		self.assertEqual(self.records(a), self.records(b))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,66 @@
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.homework import HomeworkPlanner, SKIPPED
+
+
+class HomeworkUndoTest(unittest.TestCase):
+	"""Undo and redo of single changes, batches and recurring occurrences"""
+	
+	def setUp(self):
+		self.storage = JSONStorage(tempfile.mkdtemp())
+		self.planner = HomeworkPlanner(self.storage)
+		self.items = [self.planner.add("Math", f"Task {n}", f"2030-01-{n + 10}") for n in range(6)]
+	
+	def ids(self, planner=None):
+		return [item.id for item in (planner or self.planner).items]
+	
+	def test_undone_removal_goes_back_to_its_place(self):
+		planner = self.planner
+		order = self.ids()
+		planner.remove_by_id(self.items[1].id)
+		planner.remove_by_id(self.items[4].id)
+		planner.undo()
+		planner.undo()
+		self.assertEqual(self.ids(), order)
+		self.assertEqual(planner.mark_complete(4).id, self.items[4].id)
+		self.assertEqual(self.ids(HomeworkPlanner(self.storage)), order)
+		planner.add("Math", "Task new", "2030-02-01")
+		self.assertEqual(self.ids()[:-1], order)
+	
+	def test_batch_undo_and_redo_are_one_step(self):
+		planner = self.planner
+		before = [item.to_dict() for item in planner.items]
+		with planner.batch():
+			planner.remove_by_id(self.items[0].id)
+			planner.update_by_id(self.items[2].id, title="Renamed", priority="High")
+			planner.mark_complete_by_id(self.items[3].id)
+		after = [item.to_dict() for item in planner.items]
+		self.assertTrue(planner.undo())
+		self.assertEqual([item.to_dict() for item in planner.items], before)
+		self.assertTrue(planner.redo())
+		self.assertEqual([item.to_dict() for item in planner.items], after)
+		self.assertFalse(planner.redo())
+		self.assertEqual([item.to_dict() for item in HomeworkPlanner(self.storage).items], after)
+	
+	def test_occurrence_status_is_validated_before_it_is_recorded(self):
+		planner = self.planner
+		series = planner.add_recurring("Physics", "Weekly lab", "2030-01-07")
+		occurrence = planner.occurrences_between("2030-01-14", "2030-01-14")[0]
+		steps = len(planner._history._undo)
+		for status in (SKIPPED, "Done"):
+			with self.assertRaises(ValueError):
+				planner.update_by_id(occurrence.id, status=status)
+		planner.update_by_id(occurrence.id, status="Pending")  # Unchanged: not a step
+		planner.update_by_id(series.id, title="Weekly lab")
+		self.assertEqual(len(planner._history._undo), steps)
+		planner.update_by_id(occurrence.id, status="Completed")
+		self.assertEqual(occurrence.status, "Completed")
+		planner.undo()
+		self.assertEqual(planner.get(occurrence.id).status, "Pending")
+		self.assertEqual(len(planner.occurrences_between("2030-01-14", "2030-01-14")), 1)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,77 @@
+import datetime
+import random
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.homework import HomeworkPlanner, STATUSES, PRIORITIES, today_ordinal
+from core.urgency import UrgencyQueue, default_urgency
+
+
+def days_from_today(days: int) -> str:
+	return (datetime.date.today() + datetime.timedelta(days=days)).isoformat()
+
+
+class UrgencyQueueTest(unittest.TestCase):
+	"""What's-next ordering against a full sort by urgency score"""
+
+	def setUp(self):
+		self.planner = HomeworkPlanner(JSONStorage(tempfile.mkdtemp()))
+		self.rng = random.Random(33)
+
+	def expected_keys(self, score, count):
+		today = today_ordinal()
+		unfinished = [item for item in self.planner.items if item.status != "Completed"]
+		keys = sorted(((-score(item, today), item.due_key) for item in unfinished))
+		return keys[:count]
+
+	def actual_keys(self, score, items):
+		today = today_ordinal()
+		return [(-score(item, today), item.due_key) for item in items]
+
+	def test_next_tasks_follow_random_changes(self):
+		planner, rng = self.planner, self.rng
+		for step in range(300):
+			ids = [item.id for item in planner.items]
+			operation = rng.random()
+			if operation < 0.4 or not ids:
+				planner.add("Math", f"Task {step}", days_from_today(rng.randint(-10, 30)), priority=rng.choice(PRIORITIES))
+			elif operation < 0.7:
+				planner.update_by_id(rng.choice(ids), due=days_from_today(rng.randint(-10, 30)), priority=rng.choice(PRIORITIES))
+			elif operation < 0.85:
+				planner.update_by_id(rng.choice(ids), status=rng.choice(STATUSES))
+			else:
+				planner.remove_by_id(rng.choice(ids))
+			count = rng.randint(0, 8)
+			self.assertEqual(self.actual_keys(default_urgency, planner.get_next_tasks(count)), self.expected_keys(default_urgency, count))
+
+	def test_custom_score(self):
+		planner = self.planner
+		for days in (5, -2, 12, 0):
+			planner.add("Math", f"Due in {days}", days_from_today(days))
+		latest_first = lambda item, today: item.due_key
+		planner.set_urgency_score(latest_first)
+		self.assertEqual([item.title for item in planner.get_next_tasks(2)], ["Due in 12", "Due in 5"])
+		with self.assertRaises(ValueError):
+			planner.set_urgency_score("not callable")
+
+	def test_pop_next_drains_in_order_and_skips_stale_entries(self):
+		items = [self.planner.add("Math", f"Task {i}", days_from_today(i % 20), priority=PRIORITIES[i % 3]) for i in range(200)]
+		queue = UrgencyQueue(items)
+		for item in items[:150]:
+			item.due = days_from_today(-5)
+			queue.update(item)
+		for item in items[150:170]:
+			queue.discard(item.id)
+		self.assertEqual(len(queue), 180)
+		drained = []
+		while queue.peek() is not None:
+			drained.append(queue.pop_next())
+		self.assertEqual(len(drained), 180)
+		self.assertEqual(len({item.id for item in drained}), 180)
+		keys = self.actual_keys(default_urgency, drained)
+		self.assertEqual(keys, sorted(keys))
+
+
+if __name__ == "__main__":
+	unittest.main()
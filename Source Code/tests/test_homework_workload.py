@@ -0,0 +1,62 @@
+import datetime
+import random
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.homework import HomeworkPlanner, STATUSES, PRIORITIES
+
+
+def day(offset: int) -> str:
+	return (datetime.date(2030, 3, 1) + datetime.timedelta(days=offset)).isoformat()
+
+
+class WorkloadCalendarTest(unittest.TestCase):
+	"""Range and daily workload against a scan of the unfinished items"""
+
+	def setUp(self):
+		self.planner = HomeworkPlanner(JSONStorage(tempfile.mkdtemp()))
+		self.rng = random.Random(38)
+
+	def scan(self, first_day, last_day):
+		items = [item for item in self.planner.items if item.status != "Completed" and first_day <= item.due <= last_day]
+		items += [o for o in self.planner.occurrences_between(first_day, last_day) if o.status != "Completed"]
+		return {"count": len(items), "load": sum(item.get_priority_weight() for item in items)}
+
+	def test_workload_follows_random_changes(self):
+		planner, rng = self.planner, self.rng
+		planner.add_recurring("Math", "Weekly quiz", day(3), every_days=7, count=10, priority="High")
+		for step in range(300):
+			ids = [item.id for item in planner.items]
+			operation = rng.random()
+			if operation < 0.4 or not ids:
+				planner.add("Math", f"Task {step}", day(rng.randint(-40, 120)), priority=rng.choice(PRIORITIES))
+			elif operation < 0.65:
+				planner.update_by_id(rng.choice(ids), due=day(rng.randint(-40, 120)), priority=rng.choice(PRIORITIES))
+			elif operation < 0.85:
+				planner.update_by_id(rng.choice(ids), status=rng.choice(STATUSES))
+			else:
+				planner.remove_by_id(rng.choice(ids))
+			first = rng.randint(-60, 130)
+			last = rng.randint(first, 140)
+			self.assertEqual(planner.get_workload(day(first), day(last)), self.scan(day(first), day(last)))
+		daily = planner.get_daily_workload(day(0), day(30))
+		self.assertEqual([entry[0] for entry in daily], [day(offset) for offset in range(31)])
+		for date_text, count, load in daily:
+			self.assertEqual({"count": count, "load": load}, self.scan(date_text, date_text))
+
+	def test_far_future_dates_are_counted(self):
+		self.planner.add("Math", "Typo date", "9999-01-01", priority="Low")
+		self.planner.add("Math", "Normal", day(0))
+		self.assertEqual(self.planner.get_workload(day(0), "9999-12-31"), {"count": 2, "load": 3})
+		self.assertEqual(self.planner.get_workload("9999-01-01", "9999-01-01"), {"count": 1, "load": 1})
+
+	def test_validation(self):
+		with self.assertRaises(ValueError):
+			self.planner.get_workload(day(5), day(1))
+		with self.assertRaises(ValueError):
+			self.planner.get_daily_workload("soon", day(1))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,98 @@
+import random
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.pomodoro import PomodoroEngine
+
+
+SETTINGS = {"work_minutes": 2, "short_break": 1, "long_break": 3, "cycles_before_long": 3}
+
+
+class FakeClock:
+	"""Manually advanced clock standing in for time.monotonic and time.time"""
+
+	def __init__(self, now: float = 1000.0):
+		self.now = now
+
+	def __call__(self) -> float:
+		return self.now
+
+
+def snapshot(engine):
+	state = engine.state
+	return (state.mode, state.seconds_left, state.cycles_completed, state.completed_sessions)
+
+
+class PomodoroEngineTest(unittest.TestCase):
+	"""Closed-form advance(n) against n single ticks, and the clock-driven timer"""
+
+	def make_engine(self, clock=None, base_dir=None):
+		storage = JSONStorage(base_dir or tempfile.mkdtemp())
+		if not storage.load("pomodoro.json", default={}):
+			storage.save("pomodoro.json", {"settings": SETTINGS})
+		clock = clock or FakeClock()
+		return PomodoroEngine(storage, clock=clock, wall_clock=clock)
+
+	def test_advance_matches_single_ticks(self):
+		rng = random.Random(49)
+		for _ in range(6):
+			jumped, stepped = self.make_engine(), self.make_engine()
+			for engine in (jumped, stepped):
+				engine.start()
+				engine.pause()
+			for _ in range(3):
+				n = rng.randint(0, 1200)
+				jumped.advance(n)
+				for _ in range(n):
+					stepped.tick()
+				self.assertEqual(snapshot(jumped), snapshot(stepped))
+
+	def test_running_timer_follows_the_clock(self):
+		rng = random.Random(149)
+		clock = FakeClock()
+		running = self.make_engine(clock)
+		paused = self.make_engine()
+		running.start()
+		paused.start()
+		paused.pause()
+		for _ in range(50):
+			n = rng.randint(0, 900)
+			clock.now += n
+			paused.advance(n)
+			self.assertEqual(snapshot(running), snapshot(paused))
+			self.assertEqual(running.seconds_to_next_phase(), running.state.seconds_left)
+
+	def test_restart_catches_up_on_time_the_app_was_closed(self):
+		base_dir = tempfile.mkdtemp()
+		clock = FakeClock()
+		engine = self.make_engine(clock, base_dir)
+		engine.start()
+		clock.now += 100
+		engine.state  # Read once mid-phase; nothing is saved until the phase changes
+		clock.now += 1000
+		reopened = self.make_engine(clock, base_dir)
+		expected = self.make_engine()
+		expected.start()
+		expected.pause()
+		expected.advance(1100)
+		self.assertEqual(snapshot(reopened), snapshot(expected))
+		self.assertTrue(reopened.running)
+
+	def test_pause_keeps_the_seconds_left(self):
+		clock = FakeClock()
+		engine = self.make_engine(clock)
+		engine.start()
+		clock.now += 30
+		engine.pause()
+		clock.now += 500
+		self.assertEqual(snapshot(engine), ("Work", 90, 0, 0))
+		engine.start()
+		clock.now += 90
+		self.assertEqual(snapshot(engine), ("Short Break", 60, 1, 1))
+		with self.assertRaises(ValueError):
+			engine.advance(-1)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+
+from core.storage import JSONStorage
+from core.pomodoro import SessionLog, SESSION_SYNC_EVERY
+
+
+class SyncCountingStorage(JSONStorage):
+	"""JSONStorage that counts fsync calls"""
+
+	def __init__(self, base_dir):
+		super().__init__(base_dir)
+		self.syncs = 0
+
+	def sync(self, name):
+		self.syncs += 1
+		return super().sync(name)
+
+
+def session(number: int) -> dict:
+	return {
+		"status": "Completed" if number % 3 else "Stopped",
+		"work_time": (number % 25, number % 60),
+		"break_time": (number % 5, 0),
+		"completed_work_sessions": number % 4,
+		"note": f"Session {number} ✓",
+	}
+
+
+class SessionLogTest(unittest.TestCase):
+	"""Paging backwards through the session log and its running totals"""
+
+	def setUp(self):
+		self.storage = SyncCountingStorage(tempfile.mkdtemp())
+		self.log = SessionLog(self.storage)
+
+	def read_all_pages(self, log, size):
+		sessions, cursor, pages = [], None, 0
+		while True:
+			page, cursor = log.page(cursor, size)
+			sessions.extend(page)
+			pages += 1
+			if cursor is None:
+				return sessions, pages
+
+	def test_pages_return_every_session_newest_first(self):
+		for number in range(57):
+			self.log.append(session(number))
+		expected = [session(number)["note"] for number in reversed(range(57))]
+		for size in (1, 10, 57, 100):
+			sessions, pages = self.read_all_pages(SessionLog(self.storage), size)
+			self.assertEqual([record["note"] for record in sessions], expected)
+			self.assertEqual(pages, max(1, -(-57 // size)))
+		self.assertEqual(SessionLog(JSONStorage(tempfile.mkdtemp())).page(), ([], None))
+
+	def test_reversed_reading_across_chunk_boundaries(self):
+		for number in range(40):
+			self.log.append(session(number))
+		expected = list(reversed(list(self.storage.iter_lines("pomodoro_sessions.jsonl"))))
+		for chunk_size in (1, 7, 64, 4096):
+			self.assertEqual(list(self.storage.iter_lines_reversed("pomodoro_sessions.jsonl", chunk_size=chunk_size)), expected)
+
+	def test_totals_match_a_scan_and_survive_reopening(self):
+		for number in range(30):
+			self.log.append(session(number))
+		sessions = [session(number) for number in range(30)]
+		expected = {
+			"sessions": 30,
+			"completed": sum(s["status"] == "Completed" for s in sessions),
+			"work_sessions": sum(s["completed_work_sessions"] for s in sessions),
+			"work_seconds": sum(s["work_time"][0] * 60 + s["work_time"][1] for s in sessions),
+			"break_seconds": sum(s["break_time"][0] * 60 for s in sessions),
+		}
+		self.assertEqual(self.log.totals(), expected)
+		self.assertEqual(SessionLog(self.storage).totals(), expected)
+
+	def test_torn_last_line_is_skipped(self):
+		for number in range(5):
+			self.log.append(session(number))
+		with open(os.path.join(self.storage.base_dir, "pomodoro_sessions.jsonl"), "ab") as f:
+			f.write(b'{"status": "Compl')  # Crash in the middle of an append
+		sessions, _ = self.read_all_pages(SessionLog(self.storage), 2)
+		self.assertEqual([record["note"] for record in sessions], [session(number)["note"] for number in reversed(range(5))])
+		self.assertEqual(SessionLog(self.storage).totals()["sessions"], 5)
+
+	def test_fsync_is_batched(self):
+		for number in range(SESSION_SYNC_EVERY * 2 + 1):
+			self.log.append(session(number))
+		self.assertEqual(self.storage.syncs, 2)
+		self.log.flush()
+		self.assertEqual(self.storage.syncs, 3)
+		self.log.flush()  # Nothing new to sync
+		self.assertEqual(self.storage.syncs, 3)
+
+	def test_validation(self):
+		with self.assertRaises(ValueError):
+			self.log.append({"status": ""})
+		with self.assertRaises(ValueError):
+			self.log.page(size=0)
+
+
+if __name__ == "__main__":
+	unittest.main()